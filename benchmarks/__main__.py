@@ -0,0 +1,61 @@
+''' Benchmark suite of the graph builders.
+
+    $ python -m benchmarks run -o before.json
+    $ python -m benchmarks run -o after.json
+    $ python -m benchmarks compare before.json after.json --threshold 0.2
+
+`compare` exits with status 1 if any benchmark regressed.
+'''
+import argparse
+import sys
+from typing import List, Optional
+from tabulate import tabulate
+from benchmarks.runner import QUICK_SUITE, SUITE, TARGETS, compare, load, regressions, run, save
+
+
+def _ms(value: Optional[float]) -> str:
+    return '-' if value is None else f'{value * 1000:.2f}'
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_cmd = commands.add_parser('run', help='run the suite and store results as JSON')
+    run_cmd.add_argument('-o', '--output', help='JSON file to write, stdout table only if omitted')
+    run_cmd.add_argument('--repeat', type=int, default=5)
+    run_cmd.add_argument('--quick', action='store_true', help='only the smallest size of every generator')
+    run_cmd.add_argument('--targets', nargs='+', choices=list(TARGETS), default=None)
+    run_cmd.add_argument('--generators', nargs='+', choices=list(SUITE), default=None)
+
+    cmp_cmd = commands.add_parser('compare', help='compare two JSON results')
+    cmp_cmd.add_argument('baseline')
+    cmp_cmd.add_argument('current')
+    cmp_cmd.add_argument('--threshold', type=float, default=0.2, help='relative slowdown to flag, 0.2 = 20%%')
+    cmp_cmd.add_argument('--min-delta', type=float, default=0.0005, help='absolute slowdown to flag, seconds')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        suite = QUICK_SUITE if args.quick else SUITE
+        if args.generators is not None:
+            suite = {name: suite[name] for name in args.generators}
+        results = run(suite, args.targets, args.repeat)
+        rows = [[r['target'], r['generator'], r['size'], _ms(r['min']), _ms(r['median'])] for r in results['results']]
+        print(tabulate(rows, headers=['target', 'generator', 'size', 'min, ms', 'median, ms']))
+        if args.output is not None:
+            save(results, args.output)
+        return 0
+
+    report = compare(load(args.baseline), load(args.current), args.threshold, args.min_delta)
+    rows = [
+        [r['target'], r['generator'], r['size'], _ms(r['baseline']), _ms(r['current']),
+         '-' if r['ratio'] is None else f"{r['ratio']:.2f}", r['status']]
+        for r in report
+    ]
+    print(tabulate(rows, headers=['target', 'generator', 'size', 'baseline, ms', 'current, ms', 'ratio', 'status']))
+    return 1 if len(regressions(report)) > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+''' Methods per second out of source archives: extracted to disk against `program_graphs.archives.parse_archive`.
+
+    extract: the archive is extracted to a temporary directory and every file goes to `parse_file`.
+    stream: `parse_archive` reads the entries out of the archive and parses them in memory.
+    read only: `source_entries` without parsing, the cost of getting the bytes out of the archive.
+    The archives hold `files` generated classes of a few small methods each.
+
+    $ python -m benchmarks.bench_archives
+'''
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+from tabulate import tabulate
+from program_graphs.archives import parse_archive, source_entries
+from program_graphs.files import parse_file
+from benchmarks.generators import java_class, loops, nested_ifs, sequential_branches
+
+
+def sources(files: int) -> Dict[str, bytes]:
+    return {
+        f'src/main/java/p{i % 50}/C{i}.java': java_class(
+            [nested_ifs(1 + i % 4), loops(1 + i % 3), sequential_branches(2 + i % 5)], name=f'C{i}'
+        ).encode()
+        for i in range(files)
+    }
+
+
+def write_zip(path: str, files: Dict[str, bytes]) -> None:
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+
+
+def write_tar_gz(path: str, files: Dict[str, bytes]) -> None:
+    with tarfile.open(path, 'w:gz') as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+def extract(path: str) -> int:
+    directory = tempfile.mkdtemp()
+    try:
+        shutil.unpack_archive(path, directory, 'zip' if path.endswith('.zip') else 'gztar')
+        methods = 0
+        for root, _, names in os.walk(directory):
+            for name in names:
+                methods += sum(1 for _ in parse_file(os.path.join(root, name), syntax_tokens=False))
+        return methods
+    finally:
+        shutil.rmtree(directory)
+
+
+def stream(path: str) -> int:
+    return sum(1 for _ in parse_archive(path, syntax_tokens=False))
+
+
+def read_only(path: str) -> int:
+    return sum(1 for _ in source_entries(path))
+
+
+def run(sizes: List[int] = [1000, 5000]) -> List[List[Any]]:
+    rows = []
+    formats: List[Tuple[str, Callable[[str, Dict[str, bytes]], None]]] = [
+        ('zip', write_zip), ('tar.gz', write_tar_gz)
+    ]
+    modes: List[Tuple[str, Callable[[str], int]]] = [('extract', extract), ('stream', stream), ('read only', read_only)]
+    with tempfile.TemporaryDirectory() as directory:
+        for files in sizes:
+            generated = sources(files)
+            for suffix, write in formats:
+                path = os.path.join(directory, f'sources{files}.{suffix}')
+                write(path, generated)
+                for mode, ingest in modes:
+                    start = perf_counter()
+                    count = ingest(path)
+                    seconds = perf_counter() - start
+                    rows.append([suffix, files, os.path.getsize(path) / 1024 ** 2, mode, seconds,
+                                 files / seconds, count / seconds if mode != 'read only' else None])
+    return rows
+
+
+if __name__ == '__main__':
+    headers = ['archive', 'files', 'MiB', 'mode', 'time, s', 'files/s', 'methods/s']
+    print(tabulate(run(), headers=headers, floatfmt='.2f'))
@@ -0,0 +1,38 @@
+''' CFG, FCFG, DDG and ADG of a method: one parse for all of them against a parse per graph.
+
+    separate: `cfg.parse_java` + `mk_ddg` (FCFG included) and `adg.parse_java`, each one parsing the source.
+    bundle: `program_graphs.bundle.parse_java`, one tree and one read/write index for every graph.
+
+    $ python -m benchmarks.bench_bundle
+'''
+from typing import Any, Callable, List, Tuple
+from timeit import timeit
+from tabulate import tabulate
+from program_graphs.bundle import parse_java
+from program_graphs.cfg.parser.java.parser import parse as parse_cfg
+from program_graphs.ddg.ddg import mk_ddg
+from program_graphs.adg.parser.java.parser import parse as parse_adg
+from benchmarks.generators import nested_ifs, sequential_branches, variables_dense
+
+
+def separate(code: str) -> None:
+    mk_ddg(parse_cfg(code), code)
+    parse_adg(code)
+
+
+def run(sizes: List[int] = [4, 8], repeat: int = 5) -> List[List[Any]]:
+    rows = []
+    generators: List[Tuple[str, Callable[[int], str]]] = [
+        ('nested_ifs', nested_ifs), ('sequential_branches', sequential_branches), ('variables_dense', variables_dense)
+    ]
+    for name, generator in generators:
+        for n in sizes:
+            code = generator(n)
+            apart = timeit(lambda: separate(code), number=repeat) / repeat
+            together = timeit(lambda: parse_java(code), number=repeat) / repeat
+            rows.append([name, n, apart * 1e3, together * 1e3, apart / together])
+    return rows
+
+
+if __name__ == '__main__':
+    print(tabulate(run(), headers=['method', 'size', 'separate, ms', 'bundle, ms', 'speedup'], floatfmt='.2f'))
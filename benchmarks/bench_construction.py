@@ -0,0 +1,56 @@
+''' ADG construction (`mk_adg`) on large files: time and Python allocations.
+
+    Every repeat parses the source again, tree-sitter node wrappers are created lazily
+    and cached, so a reused tree would hide the cost of reaching the nodes.
+    class: a class of `size` methods, the ADG is built for the first one.
+    method: a single method of `size` statements.
+    tokens: whether punctuation, keywords and comments are added as nodes (`syntax_tokens`).
+    blocks: memory blocks allocated during construction and still alive at its end, as seen by tracemalloc.
+
+    $ python -m benchmarks.bench_construction
+'''
+import tracemalloc
+from timeit import default_timer
+from typing import Any, Callable, List, Tuple
+from tabulate import tabulate
+from program_graphs.adg.adg import mk_empty_adg
+from program_graphs.adg.parser.java.parser import mk_adg, parse_ast_tree_sitter
+from benchmarks.generators import indent, loops, sequential_branches
+
+
+def class_of_methods(methods: int, statements: int = 20) -> str:
+    ''' A class of `methods` methods, each one with `statements` if/else statements '''
+    body = [sequential_branches(statements).replace('bench(', f'bench{i}(') for i in range(methods)]
+    return '\n'.join(['class Bench {'] + indent('\n\n'.join(body).split('\n')) + ['}'])
+
+
+def measure(code: str, repeat: int, syntax_tokens: bool = True) -> Tuple[float, int, int]:
+    source = code.encode()
+    timings = []
+    for _ in range(repeat):
+        ast = parse_ast_tree_sitter(code)
+        start = default_timer()
+        mk_adg(ast, mk_empty_adg(syntax_tokens), source=source)
+        timings.append(default_timer() - start)
+    ast = parse_ast_tree_sitter(code)
+    tracemalloc.start()
+    adg = mk_empty_adg(syntax_tokens)
+    mk_adg(ast, adg, source=source)
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    return min(timings), blocks, len(adg)
+
+
+def run(sizes: List[int] = [10, 100, 300], repeat: int = 5) -> List[List[Any]]:
+    rows = []
+    inputs: List[Tuple[str, Callable[[int], str]]] = [('class', class_of_methods), ('method', loops)]
+    for name, generator in inputs:
+        for n in sizes:
+            for syntax_tokens in (True, False):
+                seconds, blocks, nodes = measure(generator(n), repeat, syntax_tokens)
+                rows.append([name, n, syntax_tokens, nodes, seconds * 1e3, blocks])
+    return rows
+
+
+if __name__ == '__main__':
+    print(tabulate(run(), headers=['input', 'size', 'tokens', 'nodes', 'time, ms', 'blocks'], floatfmt='.2f'))
@@ -0,0 +1,44 @@
+''' DDG construction: `ddg.parser.java.parser.parse` against the two-step route.
+
+    two-step: `cfg.parse_java` then `mk_ddg(cfg, code)`, enumerating control flow paths from every write.
+    parse: one tree-sitter parse, the source kept as bytes, reaching definitions solved on bit vectors.
+    The two-step route is skipped (empty cell) above `max_two_step` branches or loops, its paths grow exponentially.
+    Deep nesting is left out: the CFG builder both routes share recurses once per level.
+
+    $ python -m benchmarks.bench_ddg
+'''
+from typing import Any, Callable, List, Optional, Tuple
+from timeit import timeit
+from tabulate import tabulate
+from program_graphs.cfg.parser.java.parser import parse as parse_cfg
+from program_graphs.ddg.ddg import mk_ddg
+from program_graphs.ddg.parser.java.parser import parse
+from benchmarks.generators import loops, sequential_branches, variables_dense
+
+
+def two_step(code: str) -> None:
+    mk_ddg(parse_cfg(code), code)
+
+
+def run(sizes: List[int] = [5, 10, 50, 100], repeat: int = 3, max_two_step: int = 10) -> List[List[Any]]:
+    rows = []
+    generators: List[Tuple[str, Callable[[int], str]]] = [
+        ('sequential_branches', sequential_branches), ('loops', loops), ('variables_dense', variables_dense)
+    ]
+    for name, generator in generators:
+        for n in sizes:
+            code = generator(n)
+            edges = parse(code).number_of_edges()
+            one = timeit(lambda: parse(code), number=repeat) / repeat
+            two: Optional[float] = None
+            if n <= max_two_step:
+                two = timeit(lambda: two_step(code), number=repeat) / repeat
+            rows.append([
+                name, n, edges, None if two is None else two * 1e3, one * 1e3, None if two is None else two / one
+            ])
+    return rows
+
+
+if __name__ == '__main__':
+    headers = ['method', 'size', 'edges', 'two-step, ms', 'parse, ms', 'speedup']
+    print(tabulate(run(), headers=headers, floatfmt='.2f'))
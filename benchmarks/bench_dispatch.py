@@ -0,0 +1,77 @@
+''' Dispatch overhead of `mk_cfg` on statement-dense code.
+
+    $ python -m benchmarks.bench_dispatch
+'''
+from typing import Any, Callable, List
+from timeit import timeit
+from tabulate import tabulate
+from program_graphs.adg.parser.java.parser import parse_ast_tree_sitter
+from program_graphs.cfg.parser.java import parser as cfg_parser
+from program_graphs.cfg.parser.java.parser import CFG_BUILDERS, mk_cfg
+from program_graphs.utils.graph import filter_nodes
+
+# straight-line statements: branching code makes path enumeration in `mk_cfg` dominate the timing
+STATEMENTS = [
+    'a = a + 1;',
+    'int b{i} = a;',
+    'foo(a, b{i});',
+    '{{ a += {i}; }}',
+    'synchronized (lock) {{ a--; }}',
+]
+
+
+def statement_dense_code(n: int) -> str:
+    return '\n'.join(STATEMENTS[i % len(STATEMENTS)].format(i=i) for i in range(n))
+
+
+def legacy_lookup(node_type: str) -> Callable[..., Any]:  # noqa: C901
+    ''' The sequential `node.type` tests `mk_cfg` used before the dispatch table '''
+    if node_type == 'for_statement':
+        return cfg_parser.mk_cfg_for
+    if node_type == 'while_statement':
+        return cfg_parser.mk_cfg_while
+    if node_type == 'do_statement':
+        return cfg_parser.mk_cfg_do_while
+    if node_type == 'block':
+        return cfg_parser.mk_cfg_block
+    if node_type == 'program':
+        return cfg_parser.mk_cfg_block
+    if node_type == 'if_statement':
+        return cfg_parser.mk_cfg_if
+    if node_type == 'continue_statement':
+        return cfg_parser.mk_cfg_continue
+    if node_type == 'break_statement':
+        return cfg_parser.mk_cfg_break
+    if node_type == 'return_statement':
+        return cfg_parser.mk_cfg_return
+    if node_type == 'switch_expression':
+        return cfg_parser.mk_cfg_switch
+    if node_type == 'labeled_statement':
+        return cfg_parser.mk_cfg_labeled_statement
+    if node_type == 'method_declaration':
+        return cfg_parser.mk_cfg_method_declaration
+    if node_type == 'try_statement':
+        return cfg_parser.mk_cfg_try_catch
+    if node_type == 'try_with_resources_statement':
+        return cfg_parser.mk_cfg_try_with_resources
+    if node_type == 'synchronized_statement':
+        return cfg_parser.mk_cfg_synchronized
+    return cfg_parser.mk_cfg_statement
+
+
+def run(sizes: List[int] = [50, 200], repeat: int = 5) -> List[List[Any]]:
+    rows = []
+    for n in sizes:
+        code = statement_dense_code(n)
+        ast = parse_ast_tree_sitter(code)
+        node_types = [node.type for node in filter_nodes(ast, list(CFG_BUILDERS) + ['expression_statement'])]
+        legacy = timeit(lambda: [legacy_lookup(t) for t in node_types], number=repeat * 100) / (repeat * 100)
+        table = timeit(lambda: [CFG_BUILDERS.lookup(t) for t in node_types], number=repeat * 100) / (repeat * 100)
+        build = timeit(lambda: mk_cfg(ast, source=code.encode()), number=repeat) / repeat
+        rows.append([n, len(node_types), legacy * 1e6, table * 1e6, legacy / table, build * 1e3])
+    return rows
+
+
+if __name__ == '__main__':
+    headers = ['statements', 'dispatches', 'if-chain, us', 'table, us', 'speedup', 'mk_cfg, ms']
+    print(tabulate(run(), headers=headers, floatfmt='.2f'))
@@ -0,0 +1,43 @@
+''' Dominator analyses of the ADG control flow view against networkx.
+
+    networkx: `nx.immediate_dominators` on an `ADG.to_cfg()` copy, as done by callers so far.
+    first call: `ADG.dominator_tree()` on a fresh graph, cached: the repeated call.
+
+    $ python -m benchmarks.bench_dominators
+'''
+from typing import Any, List
+from timeit import timeit
+from tabulate import tabulate
+import networkx as nx  # type: ignore
+from program_graphs.adg.parser.java.parser import parse
+from benchmarks.generators import loops, nested_ifs, switch_fanout
+
+
+def networkx_dominators(adg: Any) -> Any:
+    cfg = adg.to_cfg()
+    idom = nx.immediate_dominators(cfg, adg.get_entry_node())
+    ipdom = nx.immediate_dominators(cfg.reverse(copy=False), adg.get_exit_node())
+    return idom, ipdom
+
+
+def own_dominators(adg: Any) -> Any:
+    adg.invalidate_analyses()
+    return adg.dominator_tree(), adg.post_dominator_tree()
+
+
+def run(sizes: List[int] = [20, 80, 200], repeat: int = 5) -> List[List[Any]]:
+    rows = []
+    for name, generator in [('loops', loops), ('nested_ifs', nested_ifs), ('switch_fanout', switch_fanout)]:
+        for n in sizes:
+            adg = parse(generator(n))
+            reference = timeit(lambda: networkx_dominators(adg), number=repeat) / repeat
+            first = timeit(lambda: own_dominators(adg), number=repeat) / repeat
+            adg.dominator_tree()
+            cached = timeit(lambda: adg.dominator_tree(), number=repeat) / repeat
+            rows.append([name, n, len(adg), reference * 1e3, first * 1e3, reference / first, cached * 1e6])
+    return rows
+
+
+if __name__ == '__main__':
+    headers = ['method', 'size', 'nodes', 'networkx, ms', 'first call, ms', 'speedup', 'cached, us']
+    print(tabulate(run(), headers=headers, floatfmt='.2f'))
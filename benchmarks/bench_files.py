@@ -0,0 +1,66 @@
+''' Peak memory of large files: `adg.parse_java` of the whole file against `program_graphs.files.parse_file`.
+
+    whole: the file is read into a `str`, encoded and parsed into one tree; the ADG is built for
+    its first method only, a graph per method from one tree costs a symbol table of the file each.
+    parse_file: the file is memory-mapped, each class member is parsed on its own and the ADG
+    of every method is built and dropped before the next one.
+    Peak RSS is measured in a fresh interpreter for every run.
+
+    $ python -m benchmarks.bench_files
+'''
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, List
+from tabulate import tabulate
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.files import parse_file
+from benchmarks.generators import java_class, variables_dense
+
+CHILD = '''
+import resource, sys, time
+from benchmarks.bench_files import MODES
+start = time.perf_counter()
+MODES[sys.argv[1]](sys.argv[2])
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def whole(path: str) -> None:
+    with open(path, encoding='utf-8') as f:
+        parse(f.read(), syntax_tokens=False)
+
+
+def per_member(path: str) -> None:
+    for _ in parse_file(path, syntax_tokens=False):
+        pass
+
+
+MODES = {'whole': whole, 'parse_file': per_member}
+
+
+def measure(mode: str, path: str) -> List[float]:
+    result = subprocess.run(
+        [sys.executable, '-W', 'ignore', '-c', CHILD, mode, path],
+        capture_output=True, check=True, text=True, cwd=os.getcwd()
+    )
+    seconds, max_rss_kib = result.stdout.split()
+    return [float(seconds), float(max_rss_kib) / 1024]  # ru_maxrss is in KiB on Linux
+
+
+def run(sizes: List[int] = [100, 1000, 3000]) -> List[List[Any]]:
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            path = os.path.join(directory, f'Bench{n}.java')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(java_class([variables_dense(20) for _ in range(n)]))
+            for mode in MODES:
+                seconds, rss = measure(mode, path)
+                rows.append([n, os.path.getsize(path) / 1024 ** 2, mode, seconds, rss])
+    return rows
+
+
+if __name__ == '__main__':
+    print(tabulate(run(), headers=['methods', 'file, MiB', 'mode', 'time, s', 'peak RSS, MiB'], floatfmt='.2f'))
@@ -0,0 +1,33 @@
+''' `parse_java` at every granularity: what a coarser or finer graph costs end to end.
+
+    nodes: nodes of the ADG, ddeps: data dependency edges.
+
+    $ python -m benchmarks.bench_granularity
+'''
+from typing import Any, Callable, List, Tuple
+from timeit import timeit
+from tabulate import tabulate
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.adg.parser.java.granularity import GRANULARITIES
+from benchmarks.generators import loops, sequential_branches, variables_dense
+
+
+def run(sizes: List[int] = [20, 100, 200], repeat: int = 3) -> List[List[Any]]:
+    rows = []
+    generators: List[Tuple[str, Callable[[int], str]]] = [
+        ('loops', loops), ('sequential_branches', sequential_branches), ('variables_dense', variables_dense)
+    ]
+    for name, generator in generators:
+        for n in sizes:
+            code = generator(n)
+            for granularity in GRANULARITIES:
+                adg = parse(code, granularity=granularity)
+                ddeps = sum(1 for _, _, ddep in adg.edges(data='ddep') if ddep is True)
+                seconds = timeit(lambda: parse(code, granularity=granularity), number=repeat) / repeat
+                rows.append([name, n, granularity, len(adg), ddeps, seconds * 1e3])
+    return rows
+
+
+if __name__ == '__main__':
+    headers = ['method', 'size', 'granularity', 'nodes', 'ddeps', 'time, ms']
+    print(tabulate(run(), headers=headers, floatfmt='.2f'))
@@ -0,0 +1,51 @@
+''' Read and written identifiers of every statement: one query over the method against a walk per statement.
+
+    walk: `write_read_identifiers` on every statement node of the ADG.
+    query: `ReadWriteIndex` built over the syntax tree, then queried for every statement node.
+
+    $ python -m benchmarks.bench_queries
+'''
+from typing import Any, Callable, List, Tuple
+from timeit import timeit
+from tabulate import tabulate
+from program_graphs.types import ASTNode
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.adg.parser.java.data_dependency import root_ast_node
+from program_graphs.ddg.parser.java.utils import write_read_identifiers
+from program_graphs.ddg.parser.java.queries import ReadWriteIndex
+from benchmarks.generators import loops, sequential_branches, variables_dense
+
+
+def query_all(index: ReadWriteIndex, statements: List[ASTNode]) -> None:
+    for statement in statements:
+        index.write_read_identifiers(statement)
+
+
+def run(sizes: List[int] = [20, 100, 300], repeat: int = 5) -> List[List[Any]]:
+    rows = []
+    generators: List[Tuple[str, Callable[[int], str]]] = [
+        ('loops', loops), ('sequential_branches', sequential_branches), ('variables_dense', variables_dense)
+    ]
+    for name, generator in generators:
+        for n in sizes:
+            code = generator(n)
+            source_code = code.encode()
+            adg = parse(code)
+            root = root_ast_node(adg)
+            assert root is not None
+            statements = [
+                ast_node for node, ast_node in adg.nodes(data='ast_node')
+                if ast_node is not None and not any(syntax for _, _, syntax in adg.out_edges(node, data='syntax'))
+            ]
+            walk = timeit(lambda: [write_read_identifiers(s, source_code) for s in statements], number=repeat)
+            build = timeit(lambda: ReadWriteIndex(root, source_code), number=repeat)
+            query = timeit(lambda: query_all(ReadWriteIndex(root, source_code), statements), number=repeat)
+            rows.append([
+                name, n, len(statements), walk / repeat * 1e3, build / repeat * 1e3, query / repeat * 1e3, walk / query
+            ])
+    return rows
+
+
+if __name__ == '__main__':
+    headers = ['method', 'size', 'statements', 'walk, ms', 'build, ms', 'query, ms', 'speedup']
+    print(tabulate(run(), headers=headers, floatfmt='.2f'))
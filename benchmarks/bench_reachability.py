@@ -0,0 +1,44 @@
+''' Reachability index of ADG dependencies against a traversal per query.
+
+    bfs: `DependenceIndex.forward_slice` per query, the cost without an index.
+    build: time to build the index from the dependence index, memory: size of its labels.
+    query: mean time of a single query over random node pairs.
+
+    $ python -m benchmarks.bench_reachability
+'''
+from typing import Any, Callable, List, Tuple
+from random import Random
+from timeit import timeit
+from tabulate import tabulate
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.adg.reachability import ReachabilityIndex, BITSET, INTERVAL
+from benchmarks.generators import loops, variables_dense, nested_ifs
+
+
+def run(sizes: List[int] = [20, 100, 300], queries: int = 2000) -> List[List[Any]]:
+    rows = []
+    generators: List[Tuple[str, Callable[[int], str]]] = [
+        ('loops', loops), ('nested_ifs', nested_ifs), ('variables_dense', variables_dense)
+    ]
+    for name, generator in generators:
+        for n in sizes:
+            adg = parse(generator(n))
+            index = adg.dependence_index()
+            nodes = list(adg.nodes())
+            rnd = Random(0)
+            pairs = [(rnd.choice(nodes), rnd.choice(nodes)) for _ in range(queries)]
+            bfs = timeit(lambda: [b in index.forward_slice(a) for a, b in pairs[:100]], number=1) / 100
+            for method in (BITSET, INTERVAL):
+                build = timeit(lambda: ReachabilityIndex(index, method=method), number=1)
+                reach = ReachabilityIndex(index, method=method)
+                query = timeit(lambda: [reach.reaches(a, b) for a, b in pairs], number=1) / queries
+                rows.append([
+                    name, n, len(adg), method, build * 1e3, reach.memory() / 1024,
+                    query * 1e6, bfs * 1e6, bfs / query
+                ])
+    return rows
+
+
+if __name__ == '__main__':
+    headers = ['method', 'size', 'nodes', 'index', 'build, ms', 'memory, KB', 'query, us', 'bfs, us', 'speedup']
+    print(tabulate(run(), headers=headers, floatfmt='.2f'))
@@ -0,0 +1,43 @@
+''' Backward slices of every node of an ADG.
+
+    networkx: `nx.ancestors` on a dependence graph copy, as done by callers so far.
+    one by one: `ADG.backward_slice` per node on the cached dependence index.
+    batched: a single `ADG.backward_slices` call for all nodes.
+
+    $ python -m benchmarks.bench_slicing
+'''
+from typing import Any, Callable, List, Tuple
+from timeit import timeit
+from tabulate import tabulate
+import networkx as nx  # type: ignore
+from program_graphs.adg.parser.java.parser import parse
+from benchmarks.generators import loops, variables_dense, nested_ifs
+
+
+def networkx_slices(adg: Any) -> Any:
+    g = nx.DiGraph()
+    g.add_nodes_from(adg.nodes())
+    g.add_edges_from((u, v) for u, v, data in adg.edges(data=True) if data.get('cdep') or data.get('ddep'))
+    return {node: nx.ancestors(g, node) | {node} for node in g}
+
+
+def run(sizes: List[int] = [10, 40, 100], repeat: int = 3) -> List[List[Any]]:
+    rows = []
+    generators: List[Tuple[str, Callable[[int], str]]] = [
+        ('loops', loops), ('nested_ifs', nested_ifs), ('variables_dense', variables_dense)
+    ]
+    for name, generator in generators:
+        for n in sizes:
+            adg = parse(generator(n))
+            nodes = list(adg.nodes())
+            adg.dependence_index()
+            reference = timeit(lambda: networkx_slices(adg), number=repeat) / repeat
+            single = timeit(lambda: [adg.backward_slice(node) for node in nodes], number=repeat) / repeat
+            batched = timeit(lambda: adg.backward_slices(nodes), number=repeat) / repeat
+            rows.append([name, n, len(adg), reference * 1e3, single * 1e3, batched * 1e3, reference / batched])
+    return rows
+
+
+if __name__ == '__main__':
+    headers = ['method', 'size', 'nodes', 'networkx, ms', 'one by one, ms', 'batched, ms', 'speedup']
+    print(tabulate(run(), headers=headers, floatfmt='.2f'))
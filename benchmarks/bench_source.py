@@ -0,0 +1,55 @@
+''' ADG of a whole file read as a `str` against the same file memory-mapped.
+
+    str: the file is read and decoded, the parser encodes it again for tree-sitter.
+    mmap: the mapped bytes are handed to tree-sitter and read in place, only names are decoded.
+    Peak is the largest amount of memory traced by `tracemalloc` during the parse, file reading included.
+
+    $ python -m benchmarks.bench_source
+'''
+import mmap
+import os
+import tempfile
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+from timeit import timeit
+from tabulate import tabulate
+from program_graphs.adg.parser.java.parser import parse
+from benchmarks.generators import java_class, variables_dense
+
+
+def from_str(path: str) -> None:
+    with open(path, encoding='utf-8') as f:
+        parse(f.read(), syntax_tokens=False)
+
+
+def from_mmap(path: str) -> None:
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        parse(m, syntax_tokens=False)
+
+
+def peak(fn: Callable[[], None]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes: List[int] = [10, 50, 200], repeat: int = 3) -> List[List[Any]]:
+    rows = []
+    readers: List[Tuple[str, Callable[[str], None]]] = [('str', from_str), ('mmap', from_mmap)]
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            path = os.path.join(directory, f'Bench{n}.java')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(java_class([variables_dense(20) for _ in range(n)]))
+            for name, reader in readers:
+                seconds = timeit(lambda: reader(path), number=repeat) / repeat
+                memory = peak(lambda: reader(path))
+                rows.append([n, os.path.getsize(path) / 1024, name, seconds * 1e3, memory / 1024 ** 2])
+    return rows
+
+
+if __name__ == '__main__':
+    print(tabulate(run(), headers=['methods', 'file, KiB', 'source', 'time, ms', 'peak, MiB'], floatfmt='.2f'))
@@ -0,0 +1,53 @@
+''' Taint analysis throughput in methods per second.
+
+    Every generated method passes its first parameter to `exec` before returning.
+    ad hoc: `nx.descendants` on an `ADG.to_ddg()` copy from each parameter node, as done by callers so far.
+    engine: `TaintEngine.analyze` with one compiled spec for the whole batch.
+
+    $ python -m benchmarks.bench_taint
+'''
+from typing import Any, Callable, List, Tuple
+from timeit import timeit
+from tabulate import tabulate
+import networkx as nx  # type: ignore
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.adg.taint import TaintEngine, TaintSpec, MethodSpec
+from benchmarks.generators import loops, nested_ifs, sequential_branches, variables_dense
+
+SPEC = TaintSpec(sources=[MethodSpec('bench', (0,))], sinks=['exec'], sanitizers=['escape'])
+
+
+def with_sink(code: str) -> str:
+    return code.replace('return v0;', 'exec(v0);\n    return v0;')
+
+
+def ad_hoc(adg: Any) -> int:
+    ddg = adg.to_ddg()
+    parameters = [n for n, ast in adg.nodes(data='ast_node') if ast is not None and ast.type == 'formal_parameter']
+    sinks = {n for n, ast in adg.nodes(data='ast_node') if ast is not None and ast.text.startswith(b'exec(')}
+    return sum(len(nx.descendants(ddg, p) & sinks) for p in parameters if p in ddg)
+
+
+def run(sizes: List[int] = [5, 20], batch: int = 50) -> List[List[Any]]:
+    rows = []
+    generators: List[Tuple[str, Callable[[int], str]]] = [
+        ('loops', loops), ('nested_ifs', nested_ifs),
+        ('sequential_branches', sequential_branches), ('variables_dense', variables_dense)
+    ]
+    engine = TaintEngine(SPEC)
+    for name, generator in generators:
+        for n in sizes:
+            code = with_sink(generator(n))
+            methods = [code] * batch
+            graphs = [(parse(c), c.encode()) for c in methods]
+            reference = timeit(lambda: [ad_hoc(g) for g, _ in graphs], number=1)
+            report = engine.analyze_batch(graphs)
+            rows.append([
+                name, n, batch / reference, report.methods_per_second(), sum(len(f) for f in report.findings) // batch
+            ])
+    return rows
+
+
+if __name__ == '__main__':
+    headers = ['method', 'size', 'ad hoc methods/s', 'engine methods/s', 'findings']
+    print(tabulate(run(), headers=headers, floatfmt='.1f'))
@@ -0,0 +1,92 @@
+''' Synthetic Java methods whose shape is controlled by a few knobs.
+
+    Every generator returns the source of a single method declaration, so the
+    output can be fed to any of the parsers (`program_graphs.adg.parse_java`,
+    `program_graphs.cfg.parser.java.parse`) as is.
+'''
+from typing import Callable, Dict, List
+
+
+def indent(lines: List[str], level: int = 1) -> List[str]:
+    return ['    ' * level + line for line in lines]
+
+
+def method(body: List[str], variables: int = 1, name: str = 'bench') -> str:
+    params = ', '.join(f'int v{i}' for i in range(max(variables, 1)))
+    return '\n'.join([f'public int {name}({params}) {{'] + indent(body) + ['}'])
+
+
+def nested_ifs(depth: int, variables: int = 1) -> str:
+    ''' `depth` nested if statements, each one updating a variable '''
+    body: List[str] = []
+    for level in range(depth):
+        var = f'v{level % max(variables, 1)}'
+        body += indent([f'if ({var} > {level}) {{', f'    {var} = {var} - 1;'], level)
+    body += ['    ' * level + '}' for level in reversed(range(depth))]
+    return method(body + ['return v0;'], variables)
+
+
+def sequential_branches(branches: int, variables: int = 1) -> str:
+    ''' `branches` if/else statements one after another '''
+    body: List[str] = []
+    for i in range(branches):
+        var = f'v{i % max(variables, 1)}'
+        body += [
+            f'if ({var} % 2 == {i % 2}) {{',
+            f'    {var} = {var} + {i};',
+            '} else {',
+            f'    {var} = {var} - {i};',
+            '}',
+        ]
+    return method(body + ['return v0;'], variables)
+
+
+def loops(count: int, variables: int = 1) -> str:
+    ''' `count` sequential while loops with break and continue '''
+    body: List[str] = []
+    for i in range(count):
+        var = f'v{i % max(variables, 1)}'
+        body += [
+            f'while ({var} < {i + 10}) {{',
+            f'    if ({var} == {i}) continue;',
+            f'    if ({var} == {i + 5}) break;',
+            f'    {var}++;',
+            '}',
+        ]
+    return method(body + ['return v0;'], variables)
+
+
+def variables_dense(variables: int) -> str:
+    ''' Straight-line code that declares, reads and writes `variables` variables '''
+    body = [f'int x{i} = v0 + {i};' for i in range(variables)]
+    body += [f'x{i} = x{i} + x{i - 1};' for i in range(1, variables)]
+    body.append(' + '.join(['return 0'] + [f'x{i}' for i in range(variables)]) + ';')
+    return method(body)
+
+
+def switch_fanout(cases: int, variables: int = 1) -> str:
+    ''' A switch with `cases` case groups and a default group '''
+    body = ['switch (v0) {']
+    for i in range(cases):
+        var = f'v{i % max(variables, 1)}'
+        body += indent([f'case {i}:', f'    {var} = {var} + {i};', '    break;'])
+    body += indent(['default:', '    v0 = 0;'])
+    body += ['}', 'return v0;']
+    return method(body, variables)
+
+
+def java_class(methods: List[str], name: str = 'Bench') -> str:
+    ''' A compilation unit declaring `methods` in one class '''
+    lines: List[str] = []
+    for source in methods:
+        lines += indent(source.split('\n'))
+    return '\n'.join([f'public class {name} {{'] + lines + ['}'])
+
+
+GENERATORS: Dict[str, Callable[..., str]] = {
+    'nested_ifs': nested_ifs,
+    'sequential_branches': sequential_branches,
+    'loops': loops,
+    'variables': variables_dense,
+    'switch_fanout': switch_fanout,
+}
@@ -0,0 +1,141 @@
+''' Time the graph builders on synthetic methods and compare two runs.
+
+    A run is a JSON document with one record per (target, generator, size).
+    `compare` matches records of two runs by this key and flags the ones whose
+    median time grew by more than a relative threshold.
+'''
+import json
+import platform
+import time
+from statistics import median
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from program_graphs.adg.parser.java.parser import parse as parse_adg
+from program_graphs.cfg.parser.java.parser import parse as parse_cfg
+from program_graphs.cfg.edge_contraction import edge_contraction_all
+from program_graphs.cfg.fcfg import mk_fcfg_from_cfg
+from program_graphs.ddg.ddg import mk_ddg
+from benchmarks.generators import GENERATORS
+
+
+class Target(NamedTuple):
+    ''' `setup` prepares an input from the source code outside of the timed region '''
+    setup: Callable[[str], Any]
+    run: Callable[[Any], Any]
+
+
+TARGETS: Dict[str, Target] = {
+    'adg.parse': Target(lambda code: code, parse_adg),
+    'cfg.parse': Target(lambda code: code, parse_cfg),
+    'edge_contraction_all': Target(parse_cfg, edge_contraction_all),
+    'mk_fcfg_from_cfg': Target(parse_cfg, mk_fcfg_from_cfg),
+    'mk_ddg': Target(lambda code: (parse_cfg(code), code), lambda args: mk_ddg(*args)),
+}
+
+# sizes are kept moderate: sequential branches make CFG path enumeration grow exponentially
+SUITE: Dict[str, List[int]] = {
+    'nested_ifs': [4, 8, 16],
+    'sequential_branches': [4, 8, 12],
+    'loops': [4, 8, 16],
+    'variables': [8, 32, 64],
+    'switch_fanout': [4, 16, 32],
+}
+
+QUICK_SUITE: Dict[str, List[int]] = {name: sizes[:1] for name, sizes in SUITE.items()}
+
+Key = Tuple[str, str, int]
+
+
+def measure(target: Target, code: str, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        arg = target.setup(code)
+        start = time.perf_counter()
+        target.run(arg)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(
+    suite: Mapping[str, Sequence[int]] = SUITE,
+    targets: Optional[Iterable[str]] = None,
+    repeat: int = 5,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    records = []
+    for target_name in (targets or TARGETS):
+        target = TARGETS[target_name]
+        for generator, sizes in suite.items():
+            for size in sizes:
+                timings = measure(target, GENERATORS[generator](size), repeat)
+                record = {
+                    'target': target_name,
+                    'generator': generator,
+                    'size': size,
+                    'min': min(timings),
+                    'median': median(timings),
+                    'mean': sum(timings) / len(timings),
+                }
+                records.append(record)
+                if progress is not None:
+                    progress(record)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': repeat,
+        },
+        'results': records
+    }
+
+
+def save(results: Dict[str, Any], path: str) -> None:
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)  # type: ignore
+
+
+def _index(results: Mapping[str, Any]) -> Dict[Key, Mapping[str, Any]]:
+    return {(r['target'], r['generator'], r['size']): r for r in results['results']}
+
+
+def compare(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    threshold: float = 0.2,
+    min_delta: float = 0.0005,
+    metric: str = 'median'
+) -> List[Dict[str, Any]]:
+    ''' Status of every benchmark present in either run.
+
+        A benchmark is a 'regression' when its time grew by more than `threshold`
+        (relative) and by more than `min_delta` seconds, which keeps sub-millisecond
+        jitter from being reported. Symmetrically for an 'improvement'.
+    '''
+    base, curr = _index(baseline), _index(current)
+    rows = []
+    for key in sorted(set(base) | set(curr)):
+        row: Dict[str, Any] = {'target': key[0], 'generator': key[1], 'size': key[2]}
+        if key not in curr:
+            row.update(baseline=base[key][metric], current=None, ratio=None, status='missing')
+        elif key not in base:
+            row.update(baseline=None, current=curr[key][metric], ratio=None, status='new')
+        else:
+            old, new = base[key][metric], curr[key][metric]
+            ratio = new / old if old > 0 else float('inf')
+            status = 'ok'
+            if ratio > 1 + threshold and new - old > min_delta:
+                status = 'regression'
+            elif ratio < 1 - threshold and old - new > min_delta:
+                status = 'improvement'
+            row.update(baseline=old, current=new, ratio=ratio, status=status)
+        rows.append(row)
+    return rows
+
+
+def regressions(rows: Iterable[Mapping[str, Any]]) -> List[Mapping[str, Any]]:
+    return [row for row in rows if row['status'] == 'regression']
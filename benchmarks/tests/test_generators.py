@@ -0,0 +1,33 @@
+from unittest import TestCase, main
+from program_graphs.adg.parser.java.parser import parse_ast_tree_sitter
+from program_graphs.utils.graph import filter_nodes
+from benchmarks.generators import GENERATORS, nested_ifs, switch_fanout, loops, java_class
+
+
+class TestGenerators(TestCase):
+
+    def test_generated_code_is_valid_java(self) -> None:
+        for name, generator in GENERATORS.items():
+            for size in [1, 3]:
+                ast = parse_ast_tree_sitter(generator(size))
+                self.assertFalse(ast.has_error, f'{name}({size})')
+                self.assertEqual(len(filter_nodes(ast, ['method_declaration'])), 1)
+
+    def test_knobs_control_shape(self) -> None:
+        ast = parse_ast_tree_sitter(nested_ifs(5, variables=3))
+        self.assertEqual(len(filter_nodes(ast, ['if_statement'])), 5)
+        self.assertEqual(len(filter_nodes(ast, ['formal_parameter'])), 3)
+        ast = parse_ast_tree_sitter(switch_fanout(7))
+        self.assertEqual(len(filter_nodes(ast, ['switch_block_statement_group'])), 8)
+        ast = parse_ast_tree_sitter(loops(4))
+        self.assertEqual(len(filter_nodes(ast, ['while_statement'])), 4)
+
+    def test_java_class(self) -> None:
+        ast = parse_ast_tree_sitter(java_class([loops(2), nested_ifs(3)]))
+        self.assertFalse(ast.has_error)
+        self.assertEqual(len(filter_nodes(ast, ['class_declaration'])), 1)
+        self.assertEqual(len(filter_nodes(ast, ['method_declaration'])), 2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+import json
+from typing import Any, Dict, List
+from unittest import TestCase, main
+from benchmarks.runner import compare, regressions, run
+
+
+def mk_results(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {'meta': {}, 'results': records}
+
+
+def mk_record(target: str, median: float, size: int = 1) -> Dict[str, Any]:
+    return {'target': target, 'generator': 'loops', 'size': size, 'min': median, 'median': median, 'mean': median}
+
+
+class TestRunner(TestCase):
+
+    def test_run_is_json_serializable(self) -> None:
+        results = run({'variables': [2]}, targets=['adg.parse', 'mk_ddg'], repeat=1)
+        self.assertEqual(len(results['results']), 2)
+        self.assertEqual(json.loads(json.dumps(results)), results)
+
+    def test_compare_flags_regressions(self) -> None:
+        baseline = mk_results([mk_record(t, 0.010) for t in 'abcd'])
+        current = mk_results([mk_record('a', 0.015), mk_record('b', 0.011), mk_record('c', 0.005), mk_record('e', .01)])
+        status = {row['target']: row['status'] for row in compare(baseline, current, threshold=0.2)}
+        self.assertEqual(status, {'a': 'regression', 'b': 'ok', 'c': 'improvement', 'd': 'missing', 'e': 'new'})
+
+    def test_compare_ignores_jitter(self) -> None:
+        baseline = mk_results([mk_record('a', 0.0001)])
+        current = mk_results([mk_record('a', 0.0003)])
+        self.assertEqual(regressions(compare(baseline, current, threshold=0.2, min_delta=0.0005)), [])
+        self.assertEqual(len(regressions(compare(baseline, current, threshold=0.2, min_delta=0))), 1)
+
+
+if __name__ == '__main__':
+    main()
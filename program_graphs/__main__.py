@@ -1,7 +1,11 @@
 import sys
 from program_graphs.adg.parser.java.parser import parse
+from program_graphs.utils.profiling import ParseStats
 
 if __name__ == '__main__':
-    input = sys.stdin.read()
-    adg = parse(input)
+    input = sys.stdin.buffer.read()
+    stats = ParseStats() if '--stats' in sys.argv[1:] else None
+    adg = parse(input, stats, syntax_tokens='--no-syntax-tokens' not in sys.argv[1:])
     print(adg)
+    if stats is not None:
+        print(stats, file=sys.stderr)
@@ -1,2 +1,5 @@
 from program_graphs.adg.adg import ADG, mk_empty_adg  # noqa
-from program_graphs.adg.parser.java.parser import parse as parse_java  # noqa
\ No newline at end of file
+from program_graphs.adg.parser.java.parser import parse as parse_java  # noqa
+from program_graphs.utils.profiling import ParseStats  # noqa
+from program_graphs.utils.budget import Budget, BudgetExceeded, is_truncated  # noqa
+from program_graphs.adg.parser.java.layers import add_layer  # noqa
@@ -1,16 +1,24 @@
-from typing import List, Mapping, Optional, Tuple, Any, Dict
+from typing import Iterable, List, Mapping, Optional, Set, Tuple, Any, Dict
 import networkx as nx  # type: ignore
 from tabulate import tabulate
 from program_graphs.types import NodeID, ASTNode
+from program_graphs.utils.dominance import ControlFlowAnalyses
+from program_graphs.adg.slicing import DependenceIndex, Criteria, ALL_DEPENDENCIES, DDEP
+from program_graphs.adg.reachability import ReachabilityIndex, AUTO
+from program_graphs.adg.chains import DefUseChains, def_use_chains
+from program_graphs.adg.ssa import SSA, mk_ssa
+from program_graphs.adg.parser.java.symbols import SymbolTable
+from program_graphs.utils.liveness import Liveness, LivenessProblem, solve
 
 Label = str
 
 
-class ADG(nx.DiGraph):
+class ADG(ControlFlowAnalyses):
     'Any Dependency Graph'
 
-    def __init__(self) -> None:
+    def __init__(self, syntax_tokens: bool = True) -> None:
         super().__init__()
+        self.syntax_tokens = syntax_tokens  # whether construction adds punctuation, keywords and comments as nodes
         self._continue_nodes: Dict[NodeID, Optional[Label]] = {}
         self._break_nodes: Dict[NodeID, Optional[Label]] = {}
         self._return_nodes: List[NodeID] = []
@@ -82,6 +90,14 @@ class ADG(nx.DiGraph):
         [exit] = [n for (_, n, is_exit) in self.out_edges(entry, data='exit') if is_exit]
         return exit  # type: ignore
 
+    flow_edge_attr = 'cflow'
+
+    def flow_entry(self) -> NodeID:
+        return self.get_entry_node()
+
+    def flow_exit(self) -> NodeID:
+        return self.get_exit_node()
+
     def wire_return_nodes(self) -> None:
         if len(self._return_nodes) == 0:
             return
@@ -91,6 +107,76 @@ class ADG(nx.DiGraph):
             self.remove_edges_from([(a, b) for (a, b, cflow) in self.out_edges(return_node, data='cflow') if cflow is True])
             self.add_edge(return_node, exit_node, cflow=True, program_return=True)
 
+    def copy(self, as_view: bool = False) -> 'ADG':
+        ''' Copies own their def-use chains: `to_cfg()` or `to_ddg()` views do not share them '''
+        copy = super().copy(as_view)
+        if not as_view and 'def_use' in copy.graph:
+            copy.graph['def_use'] = copy.graph['def_use'].copy()
+        return copy  # type: ignore
+
+    def def_use_chains(self) -> DefUseChains:
+        ''' Def-use and use-def chains found by the data dependency layer '''
+        return def_use_chains(self)
+
+    def symbols(self) -> SymbolTable:
+        ''' Declarations and the declaration of every identifier, found by the data dependency layer '''
+        return self.graph.get('symbols') or SymbolTable()
+
+    def ssa(self) -> SSA:
+        ''' Static single assignment overlay of the control flow, needs the data dependency layer '''
+        return self.cached_analysis('ssa', lambda: mk_ssa(self))
+
+    def liveness_problem(self) -> LivenessProblem:
+        ''' Liveness equations of the control flow, needs the data dependency layer '''
+        flow = self.flow_view()
+        return LivenessProblem(
+            self.nodes(), self.get_entry_node() if len(self) > 0 else None, flow.successors,
+            lambda node: [name for name, _ in self.nodes[node].get('read_vars') or []],
+            lambda node: [name for name, _ in self.nodes[node].get('write_vars') or []]
+        )
+
+    def liveness(self) -> Liveness:
+        ''' Live variables before and after every node '''
+        return self.cached_analysis('liveness', lambda: solve(self.liveness_problem()))
+
+    def dependence_index(self) -> DependenceIndex:
+        return self.cached_analysis('dependence_index', lambda: DependenceIndex(self))
+
+    def backward_slice(self, criteria: Criteria, data_only: bool = False) -> Set[NodeID]:
+        ''' Nodes the criteria depend on via control and data dependencies '''
+        return self.dependence_index().backward_slice(criteria, DDEP if data_only else ALL_DEPENDENCIES)
+
+    def forward_slice(self, criteria: Criteria, data_only: bool = False) -> Set[NodeID]:
+        ''' Nodes depending on the criteria via control and data dependencies '''
+        return self.dependence_index().forward_slice(criteria, DDEP if data_only else ALL_DEPENDENCIES)
+
+    def thin_slice(self, criteria: Criteria) -> Set[NodeID]:
+        ''' Backward slice over data dependencies only: the statements producing the values of the criteria '''
+        return self.backward_slice(criteria, data_only=True)
+
+    def chop(self, source: Criteria, sink: Criteria, data_only: bool = False) -> Set[NodeID]:
+        ''' Nodes through which `source` influences `sink` '''
+        return self.dependence_index().chop(source, sink, DDEP if data_only else ALL_DEPENDENCIES)
+
+    def backward_slices(self, criteria: Iterable[NodeID], data_only: bool = False) -> Dict[NodeID, Set[NodeID]]:
+        ''' Backward slice of each criterion, cheaper than slicing them one by one '''
+        return self.dependence_index().backward_slices(criteria, DDEP if data_only else ALL_DEPENDENCIES)
+
+    def forward_slices(self, criteria: Iterable[NodeID], data_only: bool = False) -> Dict[NodeID, Set[NodeID]]:
+        ''' Forward slice of each criterion, cheaper than slicing them one by one '''
+        return self.dependence_index().forward_slices(criteria, DDEP if data_only else ALL_DEPENDENCIES)
+
+    def reachability_index(self, data_only: bool = False, method: str = AUTO) -> ReachabilityIndex:
+        ''' Index of transitive dependencies, worth building when many pairs are queried '''
+        kinds = DDEP if data_only else ALL_DEPENDENCIES
+        return self.cached_analysis(f'reachability_{kinds}_{method}', lambda: ReachabilityIndex(
+            self.dependence_index(), kinds, method
+        ))
+
+    def depends_on(self, a: NodeID, b: NodeID, data_only: bool = False) -> bool:
+        ''' `a` transitively depends on `b`, answered by the reachability index '''
+        return self.reachability_index(data_only).depends_on(a, b)
+
     def to_cfg(self) -> nx.DiGraph:
         copy = self.copy()
         copy.remove_edges_from([(a, b) for (a, b, cflow) in self.edges(data='cflow') if cflow is not True])
@@ -148,5 +234,5 @@ class ADG(nx.DiGraph):
         )
 
 
-def mk_empty_adg() -> ADG:
-    return ADG()
+def mk_empty_adg(syntax_tokens: bool = True) -> ADG:
+    return ADG(syntax_tokens)
@@ -0,0 +1,127 @@
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple, Union
+import networkx as nx  # type: ignore
+from program_graphs.types import NodeID
+from program_graphs.adg.parser.java.symbols import Symbol
+
+VarName = str
+Var = Union[VarName, Symbol]  # a name stands for every variable declared with it
+Chain = Dict[NodeID, Dict[Symbol, List[NodeID]]]
+
+
+class DefUseChains:
+    ''' Def-use and use-def chains of a graph, filled by the data dependency layer.
+
+        `uses(node, var)` are the nodes reading the value of `var` written at `node`,
+        `definitions(node, var)` the nodes whose writes of `var` may reach `node`.
+        Chains are kept by symbol (see `SymbolTable`), so two variables sharing a name
+        are told apart when queried by symbol and merged when queried by name.
+        Every lookup is a dictionary access; without `var` all variables are merged.
+    '''
+
+    def __init__(self) -> None:
+        self._def_use: Chain = {}
+        self._use_def: Chain = {}
+        self._writes: Dict[Symbol, List[NodeID]] = {}
+        self._reads: Dict[Symbol, List[NodeID]] = {}
+        self._names: Dict[Symbol, VarName] = {}
+        self._symbols: Dict[VarName, List[Symbol]] = {}
+        self._node_writes: Dict[NodeID, List[Symbol]] = {}
+        self._node_reads: Dict[NodeID, List[Symbol]] = {}
+
+    def _name(self, symbol: Symbol, name: VarName) -> None:
+        if symbol not in self._names:
+            self._names[symbol] = name
+            self._symbols.setdefault(name, []).append(symbol)
+
+    def add_write(self, node: NodeID, symbol: Symbol, name: VarName) -> None:
+        self._name(symbol, name)
+        self._writes.setdefault(symbol, []).append(node)
+        self._node_writes.setdefault(node, []).append(symbol)
+
+    def add_read(self, node: NodeID, symbol: Symbol, name: VarName) -> None:
+        self._name(symbol, name)
+        self._reads.setdefault(symbol, []).append(node)
+        self._node_reads.setdefault(node, []).append(symbol)
+
+    def add(self, def_node: NodeID, use_node: NodeID, symbol: Symbol, name: VarName) -> None:
+        self._name(symbol, name)
+        self._def_use.setdefault(def_node, {}).setdefault(symbol, []).append(use_node)
+        self._use_def.setdefault(use_node, {}).setdefault(symbol, []).append(def_node)
+
+    def symbols(self, var: Var) -> Sequence[Symbol]:
+        ''' Symbols of the variables named `var`, or `var` itself if it is a symbol '''
+        if isinstance(var, str):
+            return self._symbols.get(var, ())
+        return (var,)
+
+    def name(self, symbol: Symbol) -> Optional[VarName]:
+        return self._names.get(symbol)
+
+    def written_symbols(self, node: NodeID) -> Tuple[Symbol, ...]:
+        return tuple(self._node_writes.get(node, ()))
+
+    def read_symbols(self, node: NodeID) -> Tuple[Symbol, ...]:
+        return tuple(self._node_reads.get(node, ()))
+
+    def uses(self, def_node: NodeID, var: Optional[Var] = None) -> FrozenSet[NodeID]:
+        return self._lookup(self._def_use, def_node, var)
+
+    def definitions(self, use_node: NodeID, var: Optional[Var] = None) -> FrozenSet[NodeID]:
+        return self._lookup(self._use_def, use_node, var)
+
+    def variables(self) -> FrozenSet[VarName]:
+        return frozenset(self._symbols)
+
+    def writes(self, var: Var) -> Tuple[NodeID, ...]:
+        ''' Nodes writing `var`, including the definitions nobody reads '''
+        return _merge(self._writes, self.symbols(var))
+
+    def reads(self, var: Var) -> Tuple[NodeID, ...]:
+        ''' Nodes reading `var`, including the ones no definition reaches '''
+        return _merge(self._reads, self.symbols(var))
+
+    def chains(self, var: Var) -> Iterator[Tuple[NodeID, NodeID]]:
+        ''' (definition, use) pairs of `var` '''
+        for symbol in self.symbols(var):
+            for def_node in self._writes.get(symbol, []):
+                for use_node in self._def_use.get(def_node, {}).get(symbol, []):
+                    yield def_node, use_node
+
+    def copy(self) -> 'DefUseChains':
+        copy = DefUseChains()
+        copy._def_use = _copy_chain(self._def_use)
+        copy._use_def = _copy_chain(self._use_def)
+        copy._writes = {symbol: list(nodes) for symbol, nodes in self._writes.items()}
+        copy._reads = {symbol: list(nodes) for symbol, nodes in self._reads.items()}
+        copy._names = dict(self._names)
+        copy._symbols = {name: list(symbols) for name, symbols in self._symbols.items()}
+        copy._node_writes = {node: list(symbols) for node, symbols in self._node_writes.items()}
+        copy._node_reads = {node: list(symbols) for node, symbols in self._node_reads.items()}
+        return copy
+
+    def _lookup(self, chain: Chain, node: NodeID, var: Optional[Var]) -> FrozenSet[NodeID]:
+        by_symbol = chain.get(node)
+        if by_symbol is None:
+            return frozenset()
+        if var is not None:
+            return frozenset(n for symbol in self.symbols(var) for n in by_symbol.get(symbol, []))
+        return frozenset(n for nodes in by_symbol.values() for n in nodes)
+
+    def __len__(self) -> int:
+        ''' Number of (definition, use, variable) links '''
+        return sum(len(uses) for by_symbol in self._def_use.values() for uses in by_symbol.values())
+
+
+def _merge(nodes: Dict[Symbol, List[NodeID]], symbols: Sequence[Symbol]) -> Tuple[NodeID, ...]:
+    if len(symbols) == 1:
+        return tuple(nodes.get(symbols[0], []))
+    return tuple(dict.fromkeys(n for symbol in symbols for n in nodes.get(symbol, [])))
+
+
+def _copy_chain(chain: Chain) -> Chain:
+    return {node: {symbol: list(nodes) for symbol, nodes in by_symbol.items()} for node, by_symbol in chain.items()}
+
+
+def def_use_chains(g: nx.DiGraph) -> DefUseChains:
+    ''' Chains stored by the data dependency layer, empty if it has not run '''
+    return g.graph.get('def_use', DefUseChains())  # type: ignore
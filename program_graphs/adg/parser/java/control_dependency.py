@@ -0,0 +1,46 @@
+from typing import Dict, List, Set
+from program_graphs.types import NodeID, Edge
+from program_graphs.adg.adg import ADG
+from program_graphs.utils.dominance import FlowView, dominance_frontiers, immediate_post_dominators
+
+CDEP_SYNTAX = 'syntax'
+CDEP_POST_DOMINANCE = 'post-dominance'
+CDEP_MODES = [CDEP_SYNTAX, CDEP_POST_DOMINANCE]
+
+
+def control_dependencies(g: ADG) -> Dict[NodeID, Set[NodeID]]:
+    ''' Nodes every control flow node depends on: the post dominance frontier of the node.
+
+        As in Ferrante et al. the entry is connected to the exit, so the nodes executed
+        unconditionally depend on the entry. Nodes which can't reach the exit
+        (infinite loops) depend on nothing. '''
+    entry, exit = g.get_entry_node(), g.get_exit_node()
+    flow = FlowView(g, 'cflow')
+    if exit not in flow.successors(entry):
+        flow.add_edge(entry, exit)
+    ipdom = immediate_post_dominators(flow, exit)
+    return dominance_frontiers(flow, ipdom, post=True)
+
+
+def remove_syntactic_control_dependencies(g: ADG) -> None:
+    ''' Drop the `cdep` marks put by the ADG builders, edges carrying nothing else are removed '''
+    edges_to_remove: List[Edge] = []
+    for u, v, data in g.edges(data=True):
+        if data.get('cdep') is not True:
+            continue
+        del data['cdep']
+        if len(data) == 0:
+            edges_to_remove.append((u, v))
+    g.remove_edges_from(edges_to_remove)
+
+
+def add_control_dependency_layer(g: ADG) -> None:
+    ''' Replace the syntactic control dependencies by the ones derived from post dominance '''
+    remove_syntactic_control_dependencies(g)
+    for node, frontier in control_dependencies(g).items():
+        for branch in frontier:
+            if g.has_edge(branch, node):
+                g.edges[branch, node]['cdep'] = True
+            else:
+                g.add_edge(branch, node, cdep=True)
+    g.invalidate_analyses()  # marks set on existing edges are not seen by the cache
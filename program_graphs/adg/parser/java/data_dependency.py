@@ -1,47 +1,197 @@
 from collections import defaultdict
-from typing import Iterable, Tuple, Mapping, Set, Optional, Dict
+from typing import Iterable, Tuple, Mapping, Set, Optional, Dict, List, TypeVar
 import networkx as nx  # type: ignore
-from program_graphs.types import NodeID
-from program_graphs.ddg.parser.java.utils import VarName, VarType, Variable, read_write_variables_with_types
+from program_graphs.types import NodeID, ASTNode
+from program_graphs.ddg.parser.java.utils import VarName, VarType, identifier_to_string, write_read_identifiers
+from program_graphs.ddg.parser.java.queries import ReadWriteIndex
 from program_graphs.adg.adg import ADG
-from sys import setrecursionlimit
+from program_graphs.adg.chains import DefUseChains
+from program_graphs.adg.parser.java.granularity import statements
+from program_graphs.adg.parser.java.symbols import Symbol, SymbolTable, mk_symbol_table
+from program_graphs.utils.profiling import ParseStats, phase
+from program_graphs.utils.budget import Budget, BudgetExceeded, budget_scope
+from program_graphs.utils.source import Buffer
+NodeSymbols = Mapping[NodeID, Mapping[Symbol, VarName]]
+BoundVariable = Tuple[VarName, Optional[VarType]]  # only declarations give written variables a type
+Key = TypeVar('Key', VarName, Symbol)
+VarTable = Dict[Key, Set[NodeID]]  # Mapping from variable to list of nodes that wrote this variable recently
 
-setrecursionlimit(100000)
 
-VarTable = Dict[VarName, Set[NodeID]]  # Mapping from variable name to list of nodes that wrote this variable recently
+def root_ast_node(g: ADG) -> Optional[ASTNode]:
+    ast_node = g.nodes[g.get_entry_node()].get('ast_node') if g.get_entry_node() in g else None
+    while ast_node is not None and ast_node.parent is not None:
+        ast_node = ast_node.parent
+    return ast_node
 
 
-def bind_variables(g: ADG, source_code: bytes) -> Tuple[Mapping[NodeID, Set[Variable]], Mapping[NodeID, Set[Variable]]]:
-    node2read_vars: Mapping[NodeID, Set[Variable]] = defaultdict(set)
-    node2write_vars: Mapping[NodeID, Set[Variable]] = defaultdict(set)
+def bind_variables(
+    g: ADG,
+    source_code: Buffer,
+    symbols: SymbolTable,
+    index: Optional[ReadWriteIndex] = None
+) -> Tuple[Mapping[NodeID, Set[BoundVariable]], Mapping[NodeID, Set[BoundVariable]], NodeSymbols, NodeSymbols]:
+    ''' Set `read_vars` and `write_vars` of every statement node; a written variable has a type
+        where it is declared. Also returns the symbols each node reads and writes, with their names.
+        An `index` over the syntax tree finds the identifiers without walking each statement '''
+    node2read_vars: Mapping[NodeID, Set[BoundVariable]] = defaultdict(set)
+    node2write_vars: Mapping[NodeID, Set[BoundVariable]] = defaultdict(set)
+    node2read_symbols: Dict[NodeID, Dict[Symbol, VarName]] = {}
+    node2write_symbols: Dict[NodeID, Dict[Symbol, VarName]] = {}
     for node, ast_node in g.nodes(data='ast_node'):
         if ast_node is None:
             continue
-        if len([1 for (_, _, syntax) in g.out_edges(node, data='syntax') if syntax is True]) > 0:
+        identifiers = node_identifiers(g, node, source_code, symbols, index)
+        if identifiers is None:
             continue
-        read_vars, write_vars = read_write_variables_with_types(ast_node, source_code)
+        write_identifiers, read_identifiers = identifiers
+        read_symbols = {
+            symbols.symbol(s, source_code): identifier_to_string(s, source_code) for s in read_identifiers
+        }
+        write_symbols = {
+            symbols.symbol(s, source_code): identifier_to_string(s, source_code) for s in write_identifiers
+        }
+        read_vars = {(name, None) for name in read_symbols.values()}
+        write_vars = {(identifier_to_string(s, source_code), symbols.declaration_type(s)) for s in write_identifiers}
         node2read_vars[node].update(read_vars)
         node2write_vars[node].update(write_vars)
+        node2read_symbols[node] = read_symbols
+        node2write_symbols[node] = write_symbols
         nx.set_node_attributes(g, {node: {'read_vars': read_vars, 'write_vars': write_vars}})
-    return node2read_vars, node2write_vars
+    return node2read_vars, node2write_vars, node2read_symbols, node2write_symbols
+
+
+def node_identifiers(
+    g: ADG,
+    node: NodeID,
+    source_code: Buffer,
+    symbols: SymbolTable,
+    index: Optional[ReadWriteIndex] = None
+) -> Optional[Tuple[List[ASTNode], List[ASTNode]]]:
+    ''' Identifiers written and read by a node, None for nodes with statements inside.
+        Sub-expressions with a node of their own keep their identifiers, and a basic block
+        only reads the values it does not write before '''
+    children = [v for _, v, syntax in g.out_edges(node, data='syntax') if syntax is True]
+    if any(g.nodes[v].get('expression') is not True for v in children):
+        return None
+    inner = [(g.nodes[v]['ast_node'].start_byte, g.nodes[v]['ast_node'].end_byte) for v in children]
+    write: List[ASTNode] = []
+    read: List[ASTNode] = []
+    written: Set[Symbol] = set()
+    for statement in statements(g, node):
+        if index is not None:
+            w, r = index.write_read_identifiers(statement)
+        else:
+            w, r = write_read_identifiers(statement, source_code)
+        if len(inner) > 0:
+            w = [s for s in w if not any(start <= s.start_byte < end for start, end in inner)]
+            r = [s for s in r if not any(start <= s.start_byte < end for start, end in inner)]
+        read += [s for s in r if symbols.symbol(s, source_code) not in written]
+        write += w
+        written.update(symbols.symbol(s, source_code) for s in w)
+    return write, read
+
+
+def node_scopes(g: ADG, symbols: SymbolTable) -> Dict[NodeID, int]:
+    ''' Innermost scope of every node; exit nodes follow the construct they close '''
+    scopes: Dict[NodeID, Optional[int]] = {}
+    for node_from, node_to, data in g.edges(data=True):
+        ast_node = g.nodes[node_from].get('ast_node')
+        if data.get('exit') is True and ast_node is not None and g.nodes[node_to].get('ast_node') is None:
+            scopes[node_to] = symbols.scope_after(ast_node)
+    for node, ast_node in g.nodes(data='ast_node'):
+        if ast_node is not None:
+            scopes[node] = symbols.scope_of(ast_node)
+    return {node: scope for node, scope in scopes.items() if scope is not None}
+
 
+def scope_exits(g: ADG, symbols: SymbolTable) -> Dict[NodeID, Set[Symbol]]:
+    ''' Declarations going out of scope on the way into each node. A local is read only after
+        a write in the same entry to its scope, so older writes of it can be forgotten there '''
+    scopes = node_scopes(g, symbols)
+    exits: Dict[NodeID, Set[Symbol]] = {}
+    for node_from, node_to, cflow in g.edges(data='cflow'):
+        if cflow is not True or node_from not in scopes or node_to not in scopes:
+            continue
+        for scope in symbols.exited_scopes(scopes[node_from], scopes[node_to]):
+            exits.setdefault(node_to, set()).update(symbols.scopes.get(scope, ()))
+    return exits
 
-def _fst(ss: Iterable[Tuple[VarName, VarType]]) -> Iterable[VarName]:
+
+def _fst(ss: Iterable[BoundVariable]) -> Iterable[VarName]:
     return [fst for fst, _ in ss]
 
 
-def add_data_dependency_layer(g: ADG, source_code: bytes) -> None:
-    ''' Figure out and add Data Dependency relations to ADG graph '''
-    node2read_var, _ = bind_variables(g, source_code)
-    data_dependencies: Dict[NodeID, VarTable] = defaultdict(lambda: defaultdict(set))
-    kuzma_blud(g.to_cfg(), g.get_entry_node(), global_state=data_dependencies)
+def add_data_dependency_layer(
+    g: ADG,
+    source_code: Buffer,
+    stats: Optional[ParseStats] = None,
+    budget: Optional[Budget] = None,
+    index: Optional[ReadWriteIndex] = None
+) -> None:
+    ''' Figure out and add Data Dependency relations to ADG graph.
+        Variables are told apart by declaration, see `SymbolTable` in `g.graph['symbols']`,
+        so a shadowing local does not depend on the writes of the variable it hides.
+        The same relations are indexed by variable in `g.graph['def_use']`, see `DefUseChains`.
+        If the budget runs out, only the dependencies found so far are added.
+        An `index` built over the same syntax tree by another graph is reused '''
+    node2read_symbols: NodeSymbols = {}
+    node2write_symbols: NodeSymbols = {}
+    symbols = SymbolTable()
+    chains = DefUseChains()
+    data_dependencies: Dict[NodeID, VarTable[Symbol]] = defaultdict(dict)
+    iterations = 0
+    with budget_scope(budget):
+        try:
+            if budget is not None:
+                budget.check_nodes(len(g))
+            with phase(stats, 'symbols'):
+                root = root_ast_node(g)
+                symbols = mk_symbol_table(root, source_code) if root is not None else symbols
+            with phase(stats, 'bind_variables'):
+                if index is None and root is not None:
+                    index = ReadWriteIndex(root, source_code)
+                _, _, node2read_symbols, node2write_symbols = bind_variables(g, source_code, symbols, index)
+            with phase(stats, 'to_cfg'):
+                cfg = g.to_cfg()
+            with phase(stats, 'kuzma_blud'):
+                iterations = kuzma_blud(
+                    cfg, g.get_entry_node(), node2write_symbols, scope_exits(g, symbols),
+                    global_state=data_dependencies, budget=budget
+                )
+        except BudgetExceeded as error:
+            assert budget is not None
+            budget.stop(error)
+
+    with phase(stats, 'ddep_edges'):
+        for node, var_table in data_dependencies.items():
+            read_symbols = node2read_symbols.get(node, {})
+            for symbol, write_nodes in var_table.items():
+                var_name = read_symbols.get(symbol)
+                if var_name is None:
+                    continue
+                for write_node in write_nodes:
+                    create_or_update_data_depependency_link(g, write_node, node, var_name)
+                    chains.add(write_node, node, symbol, var_name)
+    with phase(stats, 'def_use'):
+        index_variables(chains, node2read_symbols, node2write_symbols)
+    g.graph['def_use'] = chains
+    g.graph['symbols'] = symbols
+    g.invalidate_analyses()  # variables and dependencies are attributes, the cache does not see them
+    if stats is not None:
+        stats.count('dataflow_iterations', iterations)
 
-    for node, var_table in data_dependencies.items():
-        for var_name, write_nodes in var_table.items():
-            if var_name not in _fst(node2read_var[node]):
-                continue
-            for write_node in write_nodes:
-                create_or_update_data_depependency_link(g, write_node, node, var_name)
+
+def index_variables(
+    chains: DefUseChains,
+    node2read_symbols: NodeSymbols,
+    node2write_symbols: NodeSymbols
+) -> None:
+    for node, write_symbols in node2write_symbols.items():
+        for symbol, var_name in write_symbols.items():
+            chains.add_write(node, symbol, var_name)
+    for node, read_symbols in node2read_symbols.items():
+        for symbol, var_name in read_symbols.items():
+            chains.add_read(node, symbol, var_name)
 
 
 def create_or_update_data_depependency_link(g: nx.DiGraph, node_from: NodeID, node_to: NodeID, var: VarName) -> None:
@@ -61,7 +211,7 @@ def set_diff(s1: Set[int], s2: Set[int]) -> Optional[Set[int]]:
     return union
 
 
-def merge_var_table_if_requried(t1: VarTable, t2: VarTable) -> Optional[VarTable]:
+def merge_var_table_if_requried(t1: VarTable[Key], t2: VarTable[Key]) -> Optional[VarTable[Key]]:
     ''' Merge tables difference to t1 (update in place). If t2 has no new information then return None'''
     new_information = False
     for k, v in t2.items():
@@ -80,31 +230,45 @@ def merge_var_table_if_requried(t1: VarTable, t2: VarTable) -> Optional[VarTable
     return t1
 
 
-def update_var_table(tb: VarTable, var_name: VarName, nodes: Set[NodeID]) -> None:
-    tb[var_name] = nodes
+def update_var_table(tb: VarTable[Key], var: Key, nodes: Set[NodeID]) -> None:
+    tb[var] = nodes
 
 
-def copy_and_update_var_table(tb: VarTable, g: ADG, node: NodeID) -> VarTable:
-    new_table: VarTable = tb.copy()
-    write_vars = g.nodes[node].get('write_vars')
-    for (var_name, _) in (write_vars or []):
-        update_var_table(new_table, var_name, set([node]))
+def copy_and_update_var_table(tb: VarTable[Symbol], node: NodeID, writes: NodeSymbols) -> VarTable[Symbol]:
+    new_table = tb.copy()
+    for symbol in writes.get(node, ()):
+        update_var_table(new_table, symbol, set([node]))
     return new_table
 
 
 def kuzma_blud(
     g: ADG,
     node: NodeID,
-    global_state: Dict[NodeID, VarTable],
-    parent_var_table: VarTable = defaultdict(set)
-) -> None:
-
-    if merge_var_table_if_requried(global_state[node], parent_var_table) is not None:
-        current_var_table = copy_and_update_var_table(parent_var_table, g, node)
-        for s in g.successors(node):
-            kuzma_blud(g, s, global_state, current_var_table)
-    else:
-        not_visited_successors = [s for s in g.successors(node) if global_state.get(s) is None]
-        current_var_table = copy_and_update_var_table(parent_var_table, g, node)
-        for s in not_visited_successors:
-            kuzma_blud(g, s, global_state, current_var_table)
+    writes: NodeSymbols,
+    exits: Mapping[NodeID, Set[Symbol]],
+    global_state: Dict[NodeID, VarTable[Symbol]],
+    parent_var_table: Optional[VarTable[Symbol]] = None,
+    budget: Optional[Budget] = None
+) -> int:
+    ''' Propagate variable tables along control flow: `writes` are the symbols each node writes,
+        `exits` the ones going out of scope on the way into it. An explicit stack is used
+        instead of recursion, so long or deeply nested methods do not hit the interpreter
+        recursion limit. Returns the number of visited (node, table) pairs '''
+    stack: List[Tuple[NodeID, VarTable[Symbol]]] = [(node, parent_var_table or {})]
+    iterations = 0
+    while len(stack) > 0:
+        iterations += 1
+        if budget is not None:
+            budget.spend_iterations()
+        node, parent_var_table = stack.pop()
+        if node in exits:
+            parent_var_table = parent_var_table.copy()
+            for symbol in exits[node]:
+                parent_var_table.pop(symbol, None)
+        if merge_var_table_if_requried(global_state[node], parent_var_table) is not None:
+            successors = list(g.successors(node))
+        else:
+            successors = [s for s in g.successors(node) if global_state.get(s) is None]
+        current_var_table = copy_and_update_var_table(parent_var_table, node, writes)
+        stack.extend((s, current_var_table) for s in reversed(successors))
+    return iterations
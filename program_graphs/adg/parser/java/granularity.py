@@ -0,0 +1,146 @@
+from typing import Any, Dict, List, Optional, Tuple
+from program_graphs.types import NodeID, ASTNode
+from program_graphs.adg.adg import ADG
+
+GRANULARITY_STATEMENT = 'statement'
+GRANULARITY_BASIC_BLOCK = 'basic-block'
+GRANULARITY_EXPRESSION = 'expression'
+GRANULARITIES = [GRANULARITY_STATEMENT, GRANULARITY_BASIC_BLOCK, GRANULARITY_EXPRESSION]
+
+# sub-expressions getting a node of their own at the expression granularity
+EXPRESSION_NODE_TYPES = [
+    'assignment_expression', 'update_expression', 'method_invocation', 'object_creation_expression'
+]
+# code which is not run where it is written
+DEFERRED_NODE_TYPES = ['lambda_expression', 'class_body']
+
+
+def syntax_children(g: ADG, node: NodeID) -> List[NodeID]:
+    return [v for v, data in g.succ[node].items() if data.get('syntax') is True]
+
+
+def cflow_successors(g: ADG, node: NodeID) -> List[NodeID]:
+    return [v for v, data in g.succ[node].items() if data.get('cflow') is True]
+
+
+def cflow_predecessors(g: ADG, node: NodeID) -> List[NodeID]:
+    return [u for u, data in g.pred[node].items() if data.get('cflow') is True]
+
+
+def syntax_parent(g: ADG, node: NodeID) -> Optional[NodeID]:
+    return next((u for u, data in g.pred[node].items() if data.get('syntax') is True), None)
+
+
+def is_simple_statement(g: ADG, node: NodeID) -> bool:
+    ''' A statement without statements inside: a leaf of the syntax layer on the control flow '''
+    if g.nodes[node].get('ast_node') is None or len(syntax_children(g, node)) > 0:
+        return False
+    return len(cflow_successors(g, node)) > 0
+
+
+def statements(g: ADG, node: NodeID) -> List[ASTNode]:
+    ''' Syntax nodes of the statements a graph node stands for, in execution order '''
+    return g.nodes[node].get('statements') or [g.nodes[node]['ast_node']]
+
+
+def _merges_into(g: ADG, tail: NodeID, node: NodeID) -> bool:
+    ''' `node` always runs right after `tail` and nothing else runs before it '''
+    if not is_simple_statement(g, tail) or not is_simple_statement(g, node):
+        return False
+    if cflow_successors(g, tail) != [node] or cflow_predecessors(g, node) != [tail]:
+        return False
+    return syntax_parent(g, node) == syntax_parent(g, tail)
+
+
+def _absorb(g: ADG, head: NodeID, node: NodeID) -> None:
+    ''' Move `node`, which runs right after `head`, into it '''
+    parent = syntax_parent(g, node)
+    for u, data in list(g.pred[node].items()):
+        if u not in (head, parent):
+            g.add_edge(u, head, **data)
+    for v, data in list(g.succ[node].items()):
+        g.add_edge(head, v, **data)
+    g.nodes[head]['statements'] = statements(g, head) + [g.nodes[node]['ast_node']]
+    g.remove_node(node)
+
+
+def merge_basic_blocks(g: ADG) -> None:
+    ''' Merge every run of simple statements of a block into its first statement, which lists
+        the syntax nodes of the run in `statements`. Nodes are numbered successively again '''
+    merged = False
+    for head in sorted(g.nodes()):
+        if head not in g or not is_simple_statement(g, head):
+            continue
+        predecessors = cflow_predecessors(g, head)
+        if len(predecessors) == 1 and _merges_into(g, predecessors[0], head):
+            continue  # ends a run starting later in the numbering, merged from there
+        while True:
+            successors = cflow_successors(g, head)
+            if len(successors) != 1 or successors[0] == head or not _merges_into(g, head, successors[0]):
+                break
+            _absorb(g, head, successors[0])
+            merged = True
+    if merged:
+        renumber(g)
+
+
+def renumber(g: ADG) -> None:
+    ''' Number the nodes 1, 2, ... in their order, `ADG.add_node` takes the next number '''
+    mapping = {node: new for new, node in enumerate(sorted(g.nodes()), 1)}
+    nodes = [(mapping[node], data) for node, data in g.nodes(data=True)]
+    edges = [(mapping[u], mapping[v], data) for u, v, data in g.edges(data=True)]
+    g.remove_nodes_from(list(mapping))
+    g.add_nodes_from(sorted(nodes, key=lambda node: node[0]))
+    g.add_edges_from(edges)
+
+
+def sub_expressions(statement: ASTNode) -> List[Tuple[ASTNode, Optional[ASTNode]]]:
+    ''' Expressions of `statement` which get a node, operands before the operation using them,
+        each one with the innermost of them around it. The expression of an expression
+        statement is the statement itself '''
+    found: List[Tuple[ASTNode, Optional[ASTNode]]] = []
+    top = statement.type == 'expression_statement'
+    stack: List[Tuple[ASTNode, Optional[ASTNode], bool]] = [(child, None, top) for child in statement.named_children]
+    while len(stack) > 0:
+        node, around, is_statement = stack.pop()
+        if node.type in DEFERRED_NODE_TYPES:
+            continue
+        if node.type in EXPRESSION_NODE_TYPES and not is_statement:
+            found.append((node, around))
+            around = node
+        stack.extend((child, around, False) for child in node.named_children)
+    # a right to left preorder, reversed: children left to right, then their parent
+    return list(reversed(found))
+
+
+def split_expressions(g: ADG) -> None:
+    ''' Give the calls, assignments, updates and object creations inside simple statements
+        nodes of their own, on the control flow in evaluation order before their statement.
+        Short-circuit and conditional operators are taken as evaluating all of their operands '''
+    for node in list(g.nodes()):
+        if not is_simple_statement(g, node):
+            continue
+        expressions = sub_expressions(g.nodes[node]['ast_node'])
+        if len(expressions) == 0:
+            continue
+        ids: Dict[int, NodeID] = {}
+        for ast_node, _ in expressions:
+            ids[ast_node.id] = g.add_ast_node(ast_node, expression=True)
+        for ast_node, around in expressions:
+            g.add_edge(node if around is None else ids[around.id], ids[ast_node.id], syntax=True)
+        first = ids[expressions[0][0].id]
+        for u, _, data in list(g.in_edges(node, data=True)):
+            if data.get('cflow') is True:
+                _move_flow_edge(g, u, node, first, data)
+            if data.get('cdep') is True:
+                g.add_edges_from([(u, ids[ast_node.id]) for ast_node, _ in expressions], cdep=True)
+        chain = [ids[ast_node.id] for ast_node, _ in expressions] + [node]
+        g.add_edges_from(zip(chain, chain[1:]), cflow=True)
+
+
+def _move_flow_edge(g: ADG, u: NodeID, v: NodeID, target: NodeID, data: Dict[str, Any]) -> None:
+    ''' Let the control flow of edge (u, v) go to `target`, the other relations stay '''
+    flow = {key: data.pop(key) for key in ('cflow', 'back') if key in data}
+    if len(data) == 0:
+        g.remove_edge(u, v)
+    g.add_edge(u, target, **flow)
@@ -0,0 +1,60 @@
+from typing import Collection, Optional, Set
+from program_graphs.adg.adg import ADG
+from program_graphs.adg.parser.java.control_dependency import add_control_dependency_layer
+from program_graphs.adg.parser.java.control_dependency import remove_syntactic_control_dependencies
+from program_graphs.adg.parser.java.data_dependency import add_data_dependency_layer
+from program_graphs.ddg.parser.java.queries import ReadWriteIndex
+from program_graphs.utils.profiling import ParseStats, phase
+from program_graphs.utils.budget import Budget
+from program_graphs.utils.source import Buffer
+
+LAYER_SYNTAX = 'syntax'
+LAYER_CONTROL_FLOW = 'control-flow'
+LAYER_CONTROL_DEPENDENCE = 'control-dependence'
+LAYER_DATA_DEPENDENCE = 'data-dependence'
+LAYERS = [LAYER_SYNTAX, LAYER_CONTROL_FLOW, LAYER_CONTROL_DEPENDENCE, LAYER_DATA_DEPENDENCE]
+# built by the construction walk itself, every other layer is derived from them
+BASE_LAYERS = [LAYER_SYNTAX, LAYER_CONTROL_FLOW]
+
+
+def check_layers(layers: Collection[str]) -> None:
+    for layer in layers:
+        if layer not in LAYERS:
+            raise ValueError(f'Unknown layer: {layer}')
+
+
+def graph_layers(g: ADG) -> Set[str]:
+    ''' Layers present in the graph. A graph not built by `parse` is taken to have all of them '''
+    layers: Set[str] = g.graph.get('layers', set(LAYERS))
+    return layers
+
+
+def drop_control_dependencies(g: ADG) -> None:
+    ''' Remove the control dependencies marked during construction '''
+    remove_syntactic_control_dependencies(g)
+    g.graph['layers'] = graph_layers(g) - {LAYER_CONTROL_DEPENDENCE}
+    g.invalidate_analyses()
+
+
+def add_layer(
+    g: ADG,
+    layer: str,
+    source_code: Optional[Buffer] = None,
+    stats: Optional[ParseStats] = None,
+    budget: Optional[Budget] = None,
+    index: Optional[ReadWriteIndex] = None
+) -> None:
+    ''' Add a dependence layer to a graph built without it, a layer already present is kept.
+        Control dependencies added afterwards are derived from post dominance of the control flow,
+        data dependencies need the source code of the graph (and take a shared `index` of it) '''
+    check_layers([layer])
+    if layer in graph_layers(g):
+        return
+    if layer == LAYER_CONTROL_DEPENDENCE:
+        with phase(stats, 'cdep'):
+            add_control_dependency_layer(g)
+    elif layer == LAYER_DATA_DEPENDENCE:
+        if source_code is None:
+            raise ValueError('The data dependence layer needs the source code')
+        add_data_dependency_layer(g, source_code, stats, budget, index)
+    g.graph['layers'] = graph_layers(g) | {layer}
@@ -1,118 +1,168 @@
-from typing import Optional, Tuple, List
-import os
+from typing import Callable, Collection, Generator, Optional, Tuple, List, Union
 from program_graphs.adg.adg import ADG, mk_empty_adg
-from program_graphs.adg.parser.java.data_dependency import add_data_dependency_layer
-from tree_sitter import Language, Parser  # type: ignore
-from program_graphs.utils import get_project_root
+from program_graphs.adg.parser.java.control_dependency import CDEP_MODES, CDEP_SYNTAX
+from program_graphs.adg.parser.java.layers import LAYERS, BASE_LAYERS, LAYER_CONTROL_DEPENDENCE, LAYER_DATA_DEPENDENCE
+from program_graphs.adg.parser.java.layers import add_layer, check_layers, drop_control_dependencies
+from program_graphs.adg.parser.java.granularity import GRANULARITIES, GRANULARITY_STATEMENT, GRANULARITY_BASIC_BLOCK
+from program_graphs.adg.parser.java.granularity import GRANULARITY_EXPRESSION, merge_basic_blocks, split_expressions
+from program_graphs.utils.source import Buffer, Source, as_buffer, parse_java_tree
 from program_graphs.types import NodeID, ASTNode
-from functools import reduce
-from program_graphs.utils.graph import filter_nodes
-from program_graphs.adg.parser.java.utils import get_switch_block_label, get_switch_label, get_nodes_after_colon, get_identifier
-
-
-def parse_ast_tree_sitter(source_code: str) -> ASTNode:
-    bin_storage_path = os.path.join(get_project_root(), 'build/my-languages.so')
-    Language.build_library(
-        # Store the library in the `build` directory
-        bin_storage_path,
-
-        # Include one or more languages
-        [
-            os.path.join(get_project_root(), "tree-sitter-java")
-        ]
-    )
-    JAVA_LANGUAGE = Language(bin_storage_path, 'java')
-    parser = Parser()
-    parser.set_language(JAVA_LANGUAGE)
-    source_code_bytes = bytes(source_code, 'utf-8')
-    ast = parser.parse(source_code_bytes)
-    return ast.root_node
-
-def parse(source_code: str) -> ADG:
-    ast = parse_ast_tree_sitter(source_code)
-    source_code_bytes = bytes(source_code, 'utf-8')
-    return parse_from_ast(ast, source_code_bytes)
-
-
-def parse_from_ast(ast: ASTNode, source_code_bytes: bytes) -> ADG:
-    adg = mk_empty_adg()
-    mk_adg(ast, adg, parent_adg_node=None, source=source_code_bytes)
-    adg.wire_return_nodes()
-    add_data_dependency_layer(adg, source_code_bytes)
+from functools import reduce, wraps
+from program_graphs.utils.graph import filter_nodes, first_node
+from program_graphs.utils.trampoline import run_steps
+from program_graphs.utils.dispatch import Dispatcher
+from program_graphs.utils.profiling import ParseStats, phase
+from program_graphs.utils.budget import Budget, budget_scope, mark_truncated
+from program_graphs.adg.parser.java.utils import get_switch_block_label, get_switch_label
+from program_graphs.adg.parser.java.utils import get_nodes_after_colon, get_identifier
+from program_graphs.adg.parser.java.utils import get_nodes_after_arrow
+
+
+def parse_ast_tree_sitter(source_code: Source) -> ASTNode:
+    return parse_java_tree(as_buffer(source_code))
+
+
+def parse(
+    source_code: Source,
+    stats: Optional[ParseStats] = None,
+    budget: Optional[Budget] = None,
+    cdep_mode: str = CDEP_SYNTAX,
+    syntax_tokens: bool = True,
+    granularity: str = GRANULARITY_STATEMENT,
+    layers: Collection[str] = LAYERS
+) -> ADG:
+    ''' `source_code` is a `str` or its UTF-8 bytes in any buffer (`bytes`, `memoryview`, an `mmap`
+        of a file): tree-sitter reads the buffer in place and only names are decoded from it '''
+    source_code_bytes = as_buffer(source_code)
+    with phase(stats, 'tree_sitter'):
+        ast = parse_java_tree(source_code_bytes)
+    return parse_from_ast(ast, source_code_bytes, stats, budget, cdep_mode, syntax_tokens, granularity, layers)
+
+
+def parse_from_ast(
+    ast: ASTNode,
+    source_code_bytes: Buffer,
+    stats: Optional[ParseStats] = None,
+    budget: Optional[Budget] = None,
+    cdep_mode: str = CDEP_SYNTAX,
+    syntax_tokens: bool = True,
+    granularity: str = GRANULARITY_STATEMENT,
+    layers: Collection[str] = LAYERS
+) -> ADG:
+    ''' `cdep_mode` chooses how control dependencies are found: 'syntax' marks the branches
+        of every construct as it is built, 'post-dominance' derives them from the control flow,
+        so jumps like break, continue and return are taken into account.
+        With `syntax_tokens=False` the unnamed children (`{`, `}`, `;`, `case`, ...) and comments
+        of blocks and switch statements are left out of the graph.
+        `granularity` sets what a node of the control flow is: a 'statement', a 'basic-block'
+        of statements running one after another, or an 'expression': calls, assignments,
+        updates and object creations get nodes of their own.
+        `layers` names the layers to build, the passes of the others are skipped ('syntax' and
+        'control-flow' come out of the same walk and are always built); see `add_layer` '''
+    if cdep_mode not in CDEP_MODES:
+        raise ValueError(f'Unknown control dependency mode: {cdep_mode}')
+    if granularity not in GRANULARITIES:
+        raise ValueError(f'Unknown granularity: {granularity}')
+    check_layers(layers)
+    adg = mk_empty_adg(syntax_tokens)
+    adg.graph['layers'] = set(BASE_LAYERS + [LAYER_CONTROL_DEPENDENCE])  # the builders mark syntactic ones
+    with budget_scope(budget):
+        with phase(stats, 'mk_adg'):
+            mk_adg(ast, adg, parent_adg_node=None, source=source_code_bytes)
+        with phase(stats, 'wire_return_nodes'):
+            adg.wire_return_nodes()
+        if granularity == GRANULARITY_BASIC_BLOCK:
+            with phase(stats, 'granularity'):
+                merge_basic_blocks(adg)
+        elif granularity == GRANULARITY_EXPRESSION:
+            with phase(stats, 'granularity'):
+                split_expressions(adg)
+        if LAYER_CONTROL_DEPENDENCE not in layers or cdep_mode != CDEP_SYNTAX:
+            drop_control_dependencies(adg)
+        if LAYER_CONTROL_DEPENDENCE in layers:
+            add_layer(adg, LAYER_CONTROL_DEPENDENCE, stats=stats)
+        if LAYER_DATA_DEPENDENCE in layers:
+            add_layer(adg, LAYER_DATA_DEPENDENCE, source_code_bytes, stats, budget)
+    mark_truncated(adg, budget)
+    if stats is not None:
+        stats.count('parsed')
+        stats.count('nodes', len(adg.nodes()))
+        stats.count('edges', len(adg.edges()))
     return adg
 
 
 EntryNode = NodeID
 ExitNode = NodeID
+COMMENT_NODE_TYPES = ['line_comment', 'block_comment']
+EntryExit = Tuple[EntryNode, ExitNode]
+
+# A builder asks for a sub-graph by yielding (ast node, syntax parent) and gets back its (entry, exit).
+# Builders never call each other through `mk_adg`, so the nesting depth of a program costs heap, not C stack.
+Request = Tuple[ASTNode, Optional[NodeID]]
+Steps = Generator[Request, EntryExit, EntryExit]
+Builder = Callable[[ASTNode, ADG, Optional[NodeID], Optional[Buffer]], Union[EntryExit, Steps]]
+
+
+def run_adg_steps(steps: Steps, adg: ADG, source: Optional[Buffer]) -> EntryExit:
+    def dispatch(request: Request) -> Union[EntryExit, Steps]:
+        node, parent_adg_node = request
+        builder = ADG_BUILDERS.lookup(node.type)
+        return builder(node, adg, parent_adg_node, source)
+    return run_steps(steps, dispatch)
+
+
+def iterative(
+    steps: Callable[[ASTNode, ADG, Optional[NodeID], Optional[Buffer]], Steps]
+) -> Callable[..., EntryExit]:
+    ''' Turn a builder generator into a plain function returning (entry, exit) '''
+    @wraps(steps)
+    def build(
+        node: ASTNode,
+        adg: ADG,
+        parent_adg_node: Optional[NodeID] = None,
+        source: Optional[Buffer] = None
+    ) -> EntryExit:
+        return run_adg_steps(steps(node, adg, parent_adg_node, source), adg, source)
+    return build
+
 
-# flake8: noqa: C901
 def mk_adg(
     node: ASTNode,
     adg: ADG,
     parent_adg_node: Optional[NodeID] = None,
-    source: bytes = None
+    source: Optional[Buffer] = None
 ) -> Tuple[EntryNode, ExitNode]:
-    # print(node.type)
-    if node.type == 'program':
-        return mk_adg_block(node, adg, parent_adg_node, source)
-
-    if node.type == 'class_declaration':
-        methods = filter_nodes(node, ['method_declaration'])
-        return mk_adg(methods[0], adg, parent_adg_node, source)
-
-    if node.type == 'method_declaration':
-        return mk_adg_method_declaration(node, adg, parent_adg_node, source)
-
-    if node.type == 'block':
-        return mk_adg_block(node, adg, parent_adg_node, source)
-
-    if node.type == 'enhanced_for_statement':
-        return mk_adg_enhanced_for(node, adg, parent_adg_node, source)
-
-    if node.type == 'for_statement':
-        return mk_adg_for(node, adg, parent_adg_node, source)
-
-    if node.type == 'while_statement':
-        return mk_adg_while(node, adg, parent_adg_node, source)
-
-    if node.type == 'do_statement':
-        return mk_adg_do_while(node, adg, parent_adg_node, source)
+    return run_adg_steps(steps_delegate(node, parent_adg_node), adg, source)
 
-    if node.type == 'if_statement':
-        return mk_adg_if(node, adg, parent_adg_node, source)
 
-    if node.type == 'switch_expression':
-        return mk_adg_switch(node, adg, parent_adg_node, source)
+def steps_delegate(node: ASTNode, parent_adg_node: Optional[NodeID] = None) -> Steps:
+    return (yield node, parent_adg_node)
 
-    if node.type == 'continue_statement':
-        return mk_adg_continue(node, adg, parent_adg_node, source)
 
-    if node.type == 'break_statement':
-        return mk_adg_break(node, adg, parent_adg_node, source)
-
-    if node.type == 'return_statement':
-        return mk_adg_return(node, adg, parent_adg_node)
-    
-    if node.type in ['try_statement', 'try_with_resources_statement']:
-        return mk_adg_try_catch(node, adg, parent_adg_node, source)
-
-    if node.type == 'local_variable_declaration':
-        return mk_variable_declaration(node, adg, parent_adg_node)
-
-    if node.type == 'labeled_statement':
-        return mk_adg_labeled_statement(node, adg, parent_adg_node, source)
-
-    if node.type == 'synchronized_statement':
-        return mk_adg_synchronized(node, adg, parent_adg_node, source)
-
-    return mk_default(node, adg, parent_adg_node)
+def steps_class_declaration(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None,
+    source: Optional[Buffer] = None
+) -> Steps:
+    method = first_node(node, ['method_declaration'])
+    assert method is not None
+    return (yield method, parent_adg_node)
 
 
-def mk_adg_method_declaration(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None, source: bytes = None) -> Tuple[EntryNode, ExitNode]:
+def steps_adg_method_declaration(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None,
+    source: Optional[Buffer] = None
+) -> Steps:
     node_method_entry = adg.add_ast_node(ast_node=node)
     node_method_exit = adg.add_node(name='method_exit')
     formal_parameters = [n for n in node.child_by_field_name('parameters').children if n.type == 'formal_parameter']
-    params_and_body= [mk_adg(n, adg) for n in formal_parameters] + [mk_adg(node.child_by_field_name('body'), adg, source=source)]
+    params_and_body: List[EntryExit] = []
+    for n in formal_parameters:
+        params_and_body.append((yield n, None))
+    params_and_body.append((yield node.child_by_field_name('body'), None))
     entry, exit = combine_cf_linear(params_and_body, adg, node_method_entry)
     adg.add_edge(node_method_entry, entry, cflow=True)
     adg.add_edge(exit, node_method_exit, cflow=True)
@@ -122,14 +172,19 @@ def mk_adg_method_declaration(node: ASTNode, adg: ADG, parent_adg_node: Optional
     return node_method_entry, node_method_exit
 
 
-def mk_adg_enhanced_for(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None, source: bytes = None) -> Tuple[EntryNode, ExitNode]:
+def steps_adg_enhanced_for(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None,
+    source: Optional[Buffer] = None
+) -> Steps:
     ast_node_body = node.child_by_field_name('body')
     if ast_node_body.type == ';':
         return mk_default(node, adg, parent_adg_node, name='for_enhanced')
 
     node_for_entry = adg.add_ast_node(ast_node=node, name='for_enhanced')
     node_for_exit = adg.add_node(name='for_exit')
-    node_body_entry, node_body_exit = mk_adg(ast_node_body, adg, source=source)
+    node_body_entry, node_body_exit = yield ast_node_body, None
     if parent_adg_node is not None:
         adg.add_edge(parent_adg_node, node_for_entry, syntax=True)
 
@@ -143,11 +198,16 @@ def mk_adg_enhanced_for(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeI
     return node_for_entry, node_for_exit
 
 
-def mk_adg_for(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None, source: bytes = None) -> Tuple[EntryNode, ExitNode]:
+def steps_adg_for(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None,
+    source: Optional[Buffer] = None
+) -> Steps:
     node_for_entry = adg.add_ast_node(ast_node=node, name='for')
     node_init = adg.add_ast_node(ast_node=node.child_by_field_name('init'), name='for_init')
     node_condition = adg.add_ast_node(ast_node=node.child_by_field_name('condition'), name='for_condition')
-    node_body_entry, node_body_exit = mk_adg(node.child_by_field_name('body'), adg, source=source)
+    node_body_entry, node_body_exit = yield node.child_by_field_name('body'), None
     node_update = adg.add_ast_node(ast_node=node.child_by_field_name('update'), name='for_update')
     node_for_exit = adg.add_node(name='for_exit')
 
@@ -167,18 +227,17 @@ def mk_adg_for(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None
     adg.rewire_continue_nodes(node_update, min_node_id=node_for_entry)
     adg.rewire_break_nodes(node_for_exit, min_node_id=node_for_entry)
 
-
     return node_for_entry, node_for_exit
 
 
-def mk_adg_while(
+def steps_adg_while(
     node: ASTNode, adg: ADG,
     parent_adg_node: Optional[NodeID] = None,
-    source: bytes=None
-) -> Tuple[EntryNode, ExitNode]:
+    source: Optional[Buffer] = None
+) -> Steps:
     node_while_entry = adg.add_ast_node(ast_node=node, name='while')
     node_condition = adg.add_ast_node(ast_node=node.child_by_field_name('condition'), name='while_condition')
-    node_body_entry, node_body_exit = mk_adg(node.child_by_field_name('body'), adg, source=source)
+    node_body_entry, node_body_exit = yield node.child_by_field_name('body'), None
     node_while_exit = adg.add_node(name='while_exit')
 
     if parent_adg_node is not None:
@@ -192,7 +251,6 @@ def mk_adg_while(
     adg.add_edge(node_condition, node_condition, cdep=True)
     adg.add_edge(node_body_exit, node_condition, cflow=True)
 
-
     adg.rewire_continue_nodes(node_condition, min_node_id=node_while_entry)
     adg.rewire_break_nodes(node_while_exit, min_node_id=node_while_entry)
     # while continue_node := adg.pop_continue_node():
@@ -214,14 +272,14 @@ def mk_adg_while(
     return node_while_entry, node_while_exit
 
 
-def mk_adg_do_while(
+def steps_adg_do_while(
     node: ASTNode, adg: ADG,
     parent_adg_node: Optional[NodeID] = None,
-    source: bytes = None
-) -> Tuple[EntryNode, ExitNode]:
+    source: Optional[Buffer] = None
+) -> Steps:
     node_while_entry = adg.add_ast_node(ast_node=node, name='do_while')
     node_condition = adg.add_ast_node(ast_node=node.child_by_field_name('condition'), name='do_condition')
-    node_body_entry, node_body_exit = mk_adg(node.child_by_field_name('body'), adg, source=source)
+    node_body_entry, node_body_exit = yield node.child_by_field_name('body'), None
     node_while_exit = adg.add_node(name='do_while_exit')
 
     if parent_adg_node is not None:
@@ -235,19 +293,18 @@ def mk_adg_do_while(
     adg.add_edge(node_condition, node_condition, cdep=True)
     adg.add_edge(node_body_exit, node_condition, cflow=True)
 
-
     adg.rewire_continue_nodes(node_condition, min_node_id=node_while_entry)
     adg.rewire_break_nodes(node_while_exit, min_node_id=node_while_entry)
     return node_while_entry, node_while_exit
 
 
-def mk_adg_if(
+def steps_adg_if(
     node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None,
-    source: bytes=None
-) -> Tuple[EntryNode, ExitNode]:
+    source: Optional[Buffer] = None
+) -> Steps:
     node_if_entry = adg.add_ast_node(ast_node=node, name='if')
     node_condition = adg.add_ast_node(ast_node=node.child_by_field_name('condition'), name='if_condition')
-    node_body_entry, node_body_exit = mk_adg(node.child_by_field_name('consequence'), adg, source=source)
+    node_body_entry, node_body_exit = yield node.child_by_field_name('consequence'), None
     node_if_exit = adg.add_node(name='if_exit')
 
     if parent_adg_node is not None:
@@ -261,7 +318,7 @@ def mk_adg_if(
     adg.add_edge(node_body_exit, node_if_exit, cflow=True)
 
     if node.child_by_field_name('alternative') is not None:
-        node_else_entry, node_else_exit = mk_adg(node.child_by_field_name('alternative'), adg, source=source)
+        node_else_entry, node_else_exit = yield node.child_by_field_name('alternative'), None
         adg.add_edge(node_if_entry, node_else_entry, syntax=True)
         adg.add_edge(node_condition, node_else_entry, cflow=True, cdep=True)
         adg.add_edge(node_else_exit, node_if_exit, cflow=True)
@@ -271,20 +328,42 @@ def mk_adg_if(
     return node_if_entry, node_if_exit
 
 
-def mk_adg_switch(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None, source: bytes=None) -> Tuple[EntryNode, ExitNode]:
+def steps_adg_switch(  # noqa: C901
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None,
+    source: Optional[Buffer] = None
+) -> Steps:
     node_switch_entry = adg.add_ast_node(ast_node=node, name='switch')
     node_switch_exit = adg.add_node(name='switch_exit')
     node_condition = adg.add_ast_node(ast_node=node.child_by_field_name('condition'), name='switch_condition')
     # TODO: add not named syntax nodes { }
 
     for _node in node.child_by_field_name('body').children:
-        if not _node.is_named or _node.type in ['line_comment', 'block_comment']:
-            syntax_node = adg.add_ast_node(_node)
-            adg.add_edge(node_switch_entry, syntax_node, syntax=True)
-
-    groups: List[ASTNode] = [n for n in node.child_by_field_name('body').children if n.type == 'switch_block_statement_group']
-    case_groups = [mk_adg_switch_case_group(g, adg, source=source) for g in groups if get_switch_block_label(g) == 'case']
-    default_groups = [mk_adg_switch_default_group(g, adg, source=source) for g in groups if get_switch_block_label(g) == 'default']
+        if is_syntax_token(_node):
+            add_syntax_token(_node, adg, node_switch_entry)
+
+    groups: List[ASTNode] = [
+        n for n in node.child_by_field_name('body').children if n.type == 'switch_block_statement_group'
+    ]
+    rules: List[ASTNode] = [n for n in node.child_by_field_name('body').children if n.type == 'switch_rule']
+    case_groups: List[EntryExit] = []
+    for g in groups:
+        if get_switch_block_label(g) == 'case':
+            case_groups.append((yield from steps_adg_switch_case_group(g, adg, None, source)))
+    for r in rules:
+        if get_switch_block_label(r) == 'case':
+            case_groups.append((yield from steps_adg_switch_rule(r, adg, node_switch_exit, source)))
+    default_groups: List[EntryExit] = []
+    for g in groups:
+        if get_switch_block_label(g) == 'default':
+            default_groups.append((yield from steps_adg_switch_default_group(g, adg, None, source)))
+    for r in rules:
+        if get_switch_block_label(r) == 'default':
+            default_groups.append((yield from steps_adg_switch_rule(r, adg, node_switch_exit, source)))
+    if len(case_groups) + len(default_groups) == 0:
+        empty_node = adg.add_node(name='empty-case')
+        case_groups.append((empty_node, empty_node))
     block_entry, block_exit = combine_cf_linear(case_groups + default_groups, adg, node_switch_entry)
     adg.add_edge(node_switch_entry, node_condition, cflow=True, syntax=True)
     adg.add_edge(node_condition, block_entry, cflow=True)
@@ -295,20 +374,32 @@ def mk_adg_switch(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = N
         adg.add_edge(parent_adg_node, node_switch_entry, syntax=True)
     return node_switch_entry, node_switch_exit
 
-def mk_adg_switch_block_group_body(node: ASTNode, adg: ADG, syntax_parent: ASTNode, source: bytes = None) -> Tuple[EntryNode, ExitNode]:
-    nodes_after_colon = [mk_adg(node, adg, source=source) for node in get_nodes_after_colon(node)]
+
+def steps_adg_switch_block_group_body(
+    node: ASTNode, adg: ADG, syntax_parent: NodeID, source: Optional[Buffer] = None,
+    get_body: Callable[[ASTNode], List[ASTNode]] = get_nodes_after_colon
+) -> Steps:
+    nodes_after_colon: List[EntryExit] = []
+    for _node in get_body(node):
+        nodes_after_colon.append((yield _node, None))
     if len(nodes_after_colon) == 0:
         node = adg.add_node(name='empty-case')
         nodes_after_colon = [(node, node)]
     return combine_cf_linear(nodes_after_colon, adg, syntax_parent)
 
-def mk_adg_switch_case_group(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None, source: bytes = None) -> Tuple[EntryNode, ExitNode]:
+
+def steps_adg_switch_case_group(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None,
+    source: Optional[Buffer] = None
+) -> Steps:
     assert node.type == 'switch_block_statement_group'
     node_entry = adg.add_ast_node(ast_node=node, name='switch_case')
     node_exit = adg.add_node(name='switch_case_exit')
-    
+
     condition = adg.add_ast_node(ast_node=get_switch_label(node), name='case_condition')
-    case_entry, case_exit = mk_adg_switch_block_group_body(node, adg, node_entry, source=source)
+    case_entry, case_exit = yield from steps_adg_switch_block_group_body(node, adg, node_entry, source=source)
     adg.add_edges_from([
         (node_entry, condition),
         (condition, case_entry),
@@ -322,12 +413,18 @@ def mk_adg_switch_case_group(node: ASTNode, adg: ADG, parent_adg_node: Optional[
         adg.add_edge(parent_adg_node, node_entry, syntax=True)
     return node_entry, node_exit
 
-def mk_adg_switch_default_group(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None, source: bytes = None) -> Tuple[EntryNode, ExitNode]:
+
+def steps_adg_switch_default_group(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None,
+    source: Optional[Buffer] = None
+) -> Steps:
     assert node.type == 'switch_block_statement_group'
     node_entry = adg.add_ast_node(ast_node=node, name='switch_default')
     node_exit = adg.add_node(name='switch_default_exit')
-    
-    case_entry, case_exit = mk_adg_switch_block_group_body(node, adg, node_entry, source)
+
+    case_entry, case_exit = yield from steps_adg_switch_block_group_body(node, adg, node_entry, source)
     adg.add_edge(node_entry, node_exit, syntax=True, exit=True)
     adg.add_edge(node_entry, case_entry, cflow=True)
     adg.add_edge(case_exit, node_exit, cflow=True)
@@ -336,6 +433,34 @@ def mk_adg_switch_default_group(node: ASTNode, adg: ADG, parent_adg_node: Option
         adg.add_edge(parent_adg_node, node_entry, syntax=True)
     return node_entry, node_exit
 
+
+def steps_adg_switch_rule(node: ASTNode, adg: ADG, switch_exit: NodeID, source: Optional[Buffer] = None) -> Steps:
+    ''' `case L -> ...` does not fall through: the body of a case continues at the switch exit '''
+    assert node.type == 'switch_rule'
+    if get_switch_block_label(node) == 'default':
+        node_entry = adg.add_ast_node(ast_node=node, name='switch_default')
+        node_exit = adg.add_node(name='switch_default_exit')
+        body_entry, body_exit = yield from steps_adg_switch_block_group_body(
+            node, adg, node_entry, source, get_nodes_after_arrow
+        )
+        adg.add_edge(node_entry, body_entry, cflow=True)
+        adg.add_edge(body_exit, node_exit, cflow=True)
+    else:
+        node_entry = adg.add_ast_node(ast_node=node, name='switch_case')
+        node_exit = adg.add_node(name='switch_case_exit')
+        condition = adg.add_ast_node(ast_node=get_switch_label(node), name='case_condition')
+        body_entry, body_exit = yield from steps_adg_switch_block_group_body(
+            node, adg, node_entry, source, get_nodes_after_arrow
+        )
+        adg.add_edge(node_entry, condition, syntax=True, cflow=True)
+        adg.add_edge(condition, body_entry, cflow=True)
+        adg.add_edge(condition, node_exit, cflow=True)
+        adg.add_edge(body_exit, switch_exit, cflow=True)
+    adg.add_edge(node_entry, node_exit, syntax=True, exit=True)
+    adg.rewire_break_nodes(switch_exit, min_node_id=node_entry)
+    return node_entry, node_exit
+
+
 def find_continue_target_node(adg: ADG, node: NodeID, ast_node_type: str) -> Optional[NodeID]:
     if ast_node_type == 'for_statement':
         return next((s for s in adg.successors(node) if adg.nodes[s].get('name') == 'for_update'), None)
@@ -348,7 +473,12 @@ def find_continue_target_node(adg: ADG, node: NodeID, ast_node_type: str) -> Opt
     return None
 
 
-def mk_adg_labeled_statement(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None, source: bytes = None) -> Tuple[EntryNode, ExitNode]:
+def steps_adg_labeled_statement(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None,
+    source: Optional[Buffer] = None
+) -> Steps:
     assert node.type == 'labeled_statement'
     assert source is not None
 
@@ -356,7 +486,7 @@ def mk_adg_labeled_statement(node: ASTNode, adg: ADG, parent_adg_node: Optional[
 
     label = get_identifier(node, source)
     labeled_statement: ASTNode = get_nodes_after_colon(node)[0]
-    entry, exit = mk_adg(labeled_statement, adg, node_entry, source)
+    entry, exit = yield labeled_statement, node_entry
     # node_label = adg.add_ast_node(node.children[0], name='for_label')
     adg.add_edge(node_entry, entry, syntax=True, cflow=True)
     adg.add_edge(node_entry, exit, exit=True)
@@ -367,11 +497,12 @@ def mk_adg_labeled_statement(node: ASTNode, adg: ADG, parent_adg_node: Optional[
     adg.rewire_break_nodes(exit, min_node_id=entry, label=label)
     return node_entry, exit
 
+
 def mk_adg_continue(
     node: ASTNode,
     adg: ADG,
     parent_adg_node: Optional[NodeID] = None,
-    source: bytes = None
+    source: Optional[Buffer] = None
 ) -> Tuple[EntryNode, ExitNode]:
     maybe_label = get_identifier(node, source)
     node_entry = adg.add_ast_node(ast_node=node)
@@ -385,7 +516,7 @@ def mk_adg_break(
     node: ASTNode,
     adg: ADG,
     parent_adg_node: Optional[NodeID] = None,
-    source: bytes = None
+    source: Optional[Buffer] = None
 ) -> Tuple[EntryNode, ExitNode]:
     maybe_label = get_identifier(node, source)
     node_entry = adg.add_ast_node(ast_node=node)
@@ -407,49 +538,98 @@ def mk_adg_return(
     return node_entry, node_entry
 
 
-def mk_adg_finally_block(node: ASTNode, adg: ADG, syntax_parent: NodeID, source: bytes = None) -> Tuple[Optional[EntryNode], Optional[ExitNode]]:
+def mk_adg_throw(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None
+) -> Tuple[EntryNode, ExitNode]:
+    # exceptions are not traced to their handlers, `throw` leaves the method as `return` does
+    node_entry = adg.add_ast_node(ast_node=node, name='throw')
+    adg.push_return_node(node_entry)
+    if parent_adg_node is not None:
+        adg.add_edge(parent_adg_node, node_entry, syntax=True)
+    return node_entry, node_entry
+
+
+def mk_adg_yield(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None
+) -> Tuple[EntryNode, ExitNode]:
+    # `yield` leaves the enclosing switch expression as an unlabeled `break` does
+    node_entry = adg.add_ast_node(ast_node=node, name='yield')
+    adg.push_break_node(node_entry)
+    if parent_adg_node is not None:
+        adg.add_edge(parent_adg_node, node_entry, syntax=True)
+    return node_entry, node_entry
+
+
+def steps_adg_finally_block(
+    node: ASTNode,
+    adg: ADG,
+    syntax_parent: NodeID,
+    source: Optional[Buffer] = None
+) -> Generator[Request, EntryExit, Tuple[Optional[EntryNode], Optional[ExitNode]]]:
     final_node = next((ch for ch in node.children if ch.type == 'finally_clause'), None)
     if final_node is None:
         return None, None
     final_body_node = [ch for ch in final_node.children if ch.type == 'block'][0]
-    entry, exit = mk_adg(final_body_node, adg, syntax_parent, source)
+    entry, exit = yield final_body_node, syntax_parent
     adg.add_edge(entry, exit, cflow=True)
     return entry, exit
 
-def mk_adg_single_catch_block(node: ASTNode, adg: ADG, source: bytes = None) -> Tuple[EntryNode, ExitNode]:
+
+def steps_adg_single_catch_block(node: ASTNode, adg: ADG, source: Optional[Buffer] = None) -> Steps:
     catch_node_entry = adg.add_ast_node(node, name='catch-block')
-    entry, exit = combine_cf_linear([
-        mk_adg(filter_nodes(node, ['catch_formal_parameter'])[0], adg, source=source),
-        mk_adg(node.child_by_field_name('body'), adg, source=source)
-    ], adg, catch_node_entry)
+    parameter = first_node(node, ['catch_formal_parameter'])
+    assert parameter is not None
+    catch_parameter = yield parameter, None
+    catch_body = yield node.child_by_field_name('body'), None
+    entry, exit = combine_cf_linear([catch_parameter, catch_body], adg, catch_node_entry)
     adg.add_edge(catch_node_entry, entry, cflow=True)
     adg.add_edge(entry, exit, cflow=True)
     return catch_node_entry, exit
 
-def mk_adg_many_catch_blocks(node: ASTNode, adg: ADG, syntax_parent: NodeID, source: bytes = None) -> Tuple[Optional[EntryNode], Optional[ExitNode]]:
+
+def steps_adg_many_catch_blocks(
+    node: ASTNode,
+    adg: ADG,
+    syntax_parent: NodeID,
+    source: Optional[Buffer] = None
+) -> Generator[Request, EntryExit, Tuple[Optional[EntryNode], Optional[ExitNode]]]:
     catch_nodes = [ch for ch in node.children if ch.type == 'catch_clause']
-    catches = [mk_adg_single_catch_block(node, adg, source) for node in catch_nodes]
+    catches: List[EntryExit] = []
+    for catch_node in catch_nodes:
+        catches.append((yield from steps_adg_single_catch_block(catch_node, adg, source)))
     if len(catches) == 0:
         return None, None
     return combine_cf_linear(catches, adg, syntax_parent)
 
-def mk_adg_try_block(node: ASTNode, adg: ADG, syntax_parent: NodeID, source: bytes = None) -> Tuple[Optional[EntryNode], Optional[ExitNode]]:
+
+def steps_adg_try_block(node: ASTNode, adg: ADG, syntax_parent: NodeID, source: Optional[Buffer] = None) -> Steps:
     resources = filter_nodes(node.child_by_field_name('resources'), ['resource'])
     if len(resources) == 0:
-        return mk_adg(node.child_by_field_name('body'), adg, syntax_parent, source=source)
-    
-    resources_entry, resources_exit = combine_cf_linear([mk_adg(r, adg, source=source) for r in resources], adg, syntax_parent)
-    try_entry, try_exit = mk_adg(node.child_by_field_name('body'), adg, syntax_parent, source)
+        return (yield node.child_by_field_name('body'), syntax_parent)
+
+    resource_adgs: List[EntryExit] = []
+    for r in resources:
+        resource_adgs.append((yield r, None))
+    resources_entry, resources_exit = combine_cf_linear(resource_adgs, adg, syntax_parent)
+    try_entry, try_exit = yield node.child_by_field_name('body'), syntax_parent
     adg.add_edge(resources_exit, try_entry, cflow=True)
     return resources_entry, try_exit
-    
-  
 
-def mk_adg_try_catch(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None, source: bytes = None) -> Tuple[EntryNode, ExitNode]:
+
+def steps_adg_try_catch(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None,
+    source: Optional[Buffer] = None
+) -> Steps:
     try_catch_node = adg.add_ast_node(node, name='try_catch')
-    try_entry, try_exit = mk_adg_try_block(node, adg, try_catch_node, source)
-    mb_final_entry, mb_final_exit = mk_adg_finally_block(node, adg, try_catch_node, source)
-    mb_catches_entry, mb_catches_exit = mk_adg_many_catch_blocks(node, adg, try_catch_node, source)
+    try_entry, try_exit = yield from steps_adg_try_block(node, adg, try_catch_node, source)
+    mb_final_entry, mb_final_exit = yield from steps_adg_finally_block(node, adg, try_catch_node, source)
+    mb_catches_entry, mb_catches_exit = yield from steps_adg_many_catch_blocks(node, adg, try_catch_node, source)
 
     adg.add_edge(try_catch_node, try_entry, cflow=True)
     if parent_adg_node is not None:
@@ -482,18 +662,21 @@ def mk_adg_try_catch(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID]
     return try_catch_node, mb_final_exit  # type: ignore
 
 
-def mk_adg_block(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None, source: bytes = None) -> Tuple[EntryNode, ExitNode]:
+def steps_adg_block(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None,
+    source: Optional[Buffer] = None
+) -> Steps:
     node_entry = adg.add_ast_node(ast_node=node)
     node_exit = adg.add_node(name='block-exit')
-    comment_node_types = ['line_comment', 'block_comment']
 
     adgs: List[Tuple[EntryNode, ExitNode]] = []
     for _node in node.children:
-        if not _node.is_named or _node.type in comment_node_types:
-            syntax_node = adg.add_ast_node(_node)
-            adg.add_edge(node_entry, syntax_node, syntax=True)
+        if is_syntax_token(_node):
+            add_syntax_token(_node, adg, node_entry)
         else:
-            adgs.append(mk_adg(_node, adg, source=source))
+            adgs.append((yield _node, None))
 
     if len(adgs) == 0:
         return node_entry, node_entry
@@ -504,13 +687,29 @@ def mk_adg_block(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = No
     entry, exit = combine_cf_linear(adgs, adg, node_entry)
     adg.add_edge(node_entry, entry, syntax=True, cflow=True)
     adg.add_edge(exit, node_exit, cflow=True)
-    
+
     return node_entry, node_exit
 
-def combine_cf_linear(entry_exit_pairs: List[Tuple[EntryNode, ExitNode]], adg: ADG, syntax_parent: Optional[NodeID]) -> Tuple[EntryNode, ExitNode]:
+
+def is_syntax_token(node: ASTNode) -> bool:
+    ''' Punctuation, keywords and comments, which take no part in control or data flow '''
+    return not node.is_named or node.type in COMMENT_NODE_TYPES
+
+
+def add_syntax_token(node: ASTNode, adg: ADG, parent_adg_node: NodeID) -> None:
+    if adg.syntax_tokens:
+        adg.add_edge(parent_adg_node, adg.add_ast_node(node), syntax=True)
+
+
+def combine_cf_linear(
+    entry_exit_pairs: List[Tuple[EntryNode, ExitNode]],
+    adg: ADG,
+    syntax_parent: Optional[NodeID]
+) -> Tuple[EntryNode, ExitNode]:
     if len(entry_exit_pairs) == 0:
         raise ValueError()
     State = Tuple[ADG, Optional[NodeID], Optional[EntryNode], Optional[ExitNode]]
+
     def reduce_step(state: State, point: Tuple[EntryNode, ExitNode]) -> State:
         adg, mb_parent_syntax_node, mb_first_exit, mb_last_exit = state
         next_entry, next_exit = point
@@ -520,11 +719,12 @@ def combine_cf_linear(entry_exit_pairs: List[Tuple[EntryNode, ExitNode]], adg: A
         if mb_last_exit is not None:
             adg.add_edge(mb_last_exit, next_entry, cflow=True)
         return adg, mb_parent_syntax_node, mb_first_exit, next_exit
-        
+
     state: State = (adg, syntax_parent, None, None)
     _, _, first_entry, latest_exit = reduce(reduce_step, entry_exit_pairs, state)
     return first_entry, latest_exit  # type: ignore
 
+
 def mk_variable_declaration(
     node: Optional[ASTNode],
     adg: ADG,
@@ -537,9 +737,14 @@ def mk_variable_declaration(
     return node_id, node_id
 
 
-def mk_adg_synchronized(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID] = None, source: bytes = None) -> Tuple[EntryNode, ExitNode]:
+def steps_adg_synchronized(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID] = None,
+    source: Optional[Buffer] = None
+) -> Steps:
     node_entry = adg.add_ast_node(ast_node=node, name='synchronized')
-    node_body_entry, node_body_exit = mk_adg(node.child_by_field_name('body'), adg, node_entry, source=source)
+    node_body_entry, node_body_exit = yield node.child_by_field_name('body'), node_entry
     adg.add_edge(node_entry, node_body_entry, syntax=True, cflow=True)
     if parent_adg_node is not None:
         adg.add_edge(parent_adg_node, node_entry, syntax=True)
@@ -556,3 +761,69 @@ def mk_default(
     if parent_adg_node is not None:
         adg.add_edge(parent_adg_node, node_id, syntax=True)
     return node_id, node_id
+
+
+def build_default(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID], source: Optional[Buffer]) -> EntryExit:
+    return mk_default(node, adg, parent_adg_node)
+
+
+def build_return(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID], source: Optional[Buffer]) -> EntryExit:
+    return mk_adg_return(node, adg, parent_adg_node)
+
+
+def build_throw(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID], source: Optional[Buffer]) -> EntryExit:
+    return mk_adg_throw(node, adg, parent_adg_node)
+
+
+def build_yield(node: ASTNode, adg: ADG, parent_adg_node: Optional[NodeID], source: Optional[Buffer]) -> EntryExit:
+    return mk_adg_yield(node, adg, parent_adg_node)
+
+
+def build_variable_declaration(
+    node: ASTNode,
+    adg: ADG,
+    parent_adg_node: Optional[NodeID],
+    source: Optional[Buffer]
+) -> EntryExit:
+    return mk_variable_declaration(node, adg, parent_adg_node)
+
+
+mk_adg_method_declaration = iterative(steps_adg_method_declaration)
+mk_adg_enhanced_for = iterative(steps_adg_enhanced_for)
+mk_adg_for = iterative(steps_adg_for)
+mk_adg_while = iterative(steps_adg_while)
+mk_adg_do_while = iterative(steps_adg_do_while)
+mk_adg_if = iterative(steps_adg_if)
+mk_adg_switch = iterative(steps_adg_switch)
+mk_adg_switch_case_group = iterative(steps_adg_switch_case_group)
+mk_adg_switch_default_group = iterative(steps_adg_switch_default_group)
+mk_adg_labeled_statement = iterative(steps_adg_labeled_statement)
+mk_adg_try_catch = iterative(steps_adg_try_catch)
+mk_adg_block = iterative(steps_adg_block)
+mk_adg_synchronized = iterative(steps_adg_synchronized)
+
+
+ADG_BUILDERS: Dispatcher[Builder] = Dispatcher({
+    'program': steps_adg_block,
+    'class_declaration': steps_class_declaration,
+    'method_declaration': steps_adg_method_declaration,
+    'constructor_declaration': steps_adg_method_declaration,
+    'block': steps_adg_block,
+    'constructor_body': steps_adg_block,
+    'enhanced_for_statement': steps_adg_enhanced_for,
+    'for_statement': steps_adg_for,
+    'while_statement': steps_adg_while,
+    'do_statement': steps_adg_do_while,
+    'if_statement': steps_adg_if,
+    'switch_expression': steps_adg_switch,
+    'continue_statement': mk_adg_continue,
+    'break_statement': mk_adg_break,
+    'return_statement': build_return,
+    'throw_statement': build_throw,
+    'yield_statement': build_yield,
+    'try_statement': steps_adg_try_catch,
+    'try_with_resources_statement': steps_adg_try_catch,
+    'local_variable_declaration': build_variable_declaration,
+    'labeled_statement': steps_adg_labeled_statement,
+    'synchronized_statement': steps_adg_synchronized,
+}, default=build_default)
@@ -0,0 +1,216 @@
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from program_graphs.types import ASTNode
+from program_graphs.utils.source import Buffer, extract_name
+from program_graphs.ddg.parser.java.utils import VarName, VarType, find_types_and_aggregate
+
+DeclarationID = int
+Symbol = int  # a declaration id, or a negative id shared by the unresolved occurrences of a name
+
+SCOPES = [
+    'program', 'class_body', 'interface_body', 'enum_body', 'method_declaration', 'constructor_declaration',
+    'block', 'constructor_body', 'switch_block', 'for_statement', 'enhanced_for_statement', 'catch_clause',
+    'try_with_resources_statement', 'lambda_expression',
+]
+FIELD_CONTAINERS = ['class_body', 'interface_body', 'enum_body_declarations']
+
+
+class Declaration(NamedTuple):
+    id: DeclarationID
+    name: VarName
+    type: Optional[VarType]
+    node: ASTNode  # the declared identifier
+
+
+class SymbolTable:
+    ''' Declarations of a compilation unit and the declaration every identifier refers to.
+
+        Built in one walk of the syntax tree with a stack of scopes (classes, methods, blocks,
+        for statements, catch clauses, try resources, lambdas). Identifiers are keyed by
+        their start byte, so `resolve` and `declaration_type` are dictionary lookups.
+    '''
+
+    def __init__(self) -> None:
+        self.declarations: List[Declaration] = []
+        self._resolved: Dict[int, DeclarationID] = {}
+        self._declaring: Dict[int, DeclarationID] = {}
+        self._unresolved: Dict[VarName, Symbol] = {}
+        self.scopes: Dict[int, List[DeclarationID]] = {}  # by the id of the syntax node opening the scope
+        self.scope_parent: Dict[int, int] = {}  # the outermost scope is its own parent
+        self.scope_depth: Dict[int, int] = {}
+        self._scope_of: Dict[int, int] = {}  # innermost scope of every syntax node, by node id
+
+    def resolve(self, identifier: ASTNode) -> Optional[DeclarationID]:
+        return self._resolved.get(identifier.start_byte)
+
+    def symbol(self, identifier: ASTNode, source_code: Buffer) -> Symbol:
+        ''' Integer standing for the variable: names without a declaration in sight
+            (fields of other classes, code snippets) are told apart by name only '''
+        declaration = self._resolved.get(identifier.start_byte)
+        if declaration is not None:
+            return declaration
+        name = extract_name(identifier.start_byte, identifier.end_byte, source_code)
+        return self._unresolved.setdefault(name, -1 - len(self._unresolved))
+
+    def declaration_type(self, identifier: ASTNode) -> Optional[VarType]:
+        ''' Type of the variable if `identifier` is the name in its declaration '''
+        declaration = self._declaring.get(identifier.start_byte)
+        return None if declaration is None else self.declarations[declaration].type
+
+    def declare(self, identifier: ASTNode, name: VarName, var_type: Optional[VarType]) -> DeclarationID:
+        declaration = Declaration(len(self.declarations), name, var_type, identifier)
+        self.declarations.append(declaration)
+        self._declaring[identifier.start_byte] = declaration.id
+        self._resolved[identifier.start_byte] = declaration.id
+        return declaration.id
+
+    def bind(self, identifier: ASTNode, declaration: DeclarationID) -> None:
+        self._resolved[identifier.start_byte] = declaration
+
+    def scope_of(self, ast_node: ASTNode) -> Optional[int]:
+        ''' Innermost scope of a syntax node, the scope it opens included '''
+        return self._scope_of.get(ast_node.id)
+
+    def scope_after(self, ast_node: ASTNode) -> Optional[int]:
+        ''' Scope of the code following a syntax node, outside of the scope it opens '''
+        scope = self.scope_of(ast_node)
+        return self.scope_parent[scope] if scope == ast_node.id else scope
+
+    def exited_scopes(self, scope_from: int, scope_to: int) -> Iterator[int]:
+        ''' Scopes around `scope_from` (itself included) but not around `scope_to`, innermost first '''
+        a, b = scope_from, scope_to
+        while self.scope_depth[a] > self.scope_depth[b]:
+            yield a
+            a = self.scope_parent[a]
+        while self.scope_depth[b] > self.scope_depth[a]:
+            b = self.scope_parent[b]
+        while a != b:
+            yield a
+            a, b = self.scope_parent[a], self.scope_parent[b]
+
+
+def _type(node: Optional[ASTNode], source_code: Buffer) -> Optional[VarType]:
+    return None if node is None else find_types_and_aggregate(node, source_code)
+
+
+def declared_names(
+    node: ASTNode,
+    parent: Optional[ASTNode],
+    source_code: Buffer
+) -> Iterator[Tuple[ASTNode, Optional[VarType]]]:
+    ''' Identifiers declared by `node` itself and the type of each one '''
+    name = node.child_by_field_name('name')
+    if node.type == 'variable_declarator' and name is not None and parent is not None:
+        if parent.type in ('local_variable_declaration', 'field_declaration', 'constant_declaration'):
+            yield name, _type(parent.child_by_field_name('type'), source_code)
+        elif parent.type == 'spread_parameter':
+            yield name, _type(parent, source_code)
+    elif node.type in ('formal_parameter', 'enhanced_for_statement', 'resource') and name is not None:
+        yield name, _type(node.child_by_field_name('type'), source_code)
+    elif node.type == 'catch_formal_parameter' and name is not None:
+        yield name, _type(node, source_code)
+    elif node.type == 'lambda_expression':
+        yield from _lambda_parameters(node.child_by_field_name('parameters'))
+
+
+def _lambda_parameters(parameters: Optional[ASTNode]) -> Iterator[Tuple[ASTNode, Optional[VarType]]]:
+    ''' `x -> ...` and `(x, y) -> ...`, typed parameters are `formal_parameter` nodes '''
+    if parameters is not None and parameters.type == 'identifier':
+        yield parameters, None
+    elif parameters is not None and parameters.type == 'inferred_parameters':
+        for parameter in parameters.named_children:
+            yield parameter, None
+
+
+class _Builder:
+    ''' Scopes are frames of names; `visible` maps a name to its declarations, innermost last '''
+
+    def __init__(self, source_code: Buffer) -> None:
+        self.source_code = source_code
+        self.table = SymbolTable()
+        self.visible: Dict[VarName, List[DeclarationID]] = {}
+        self.frames: List[Tuple[int, List[VarName]]] = []
+        self.fields: List[Dict[VarName, DeclarationID]] = []  # of the enclosing classes, for `this.name`
+
+    def declare(self, identifier: ASTNode, var_type: Optional[VarType]) -> DeclarationID:
+        declaration = self.table._declaring.get(identifier.start_byte)
+        if declaration is not None:
+            return declaration  # a field declared ahead of its class body
+        name = extract_name(identifier.start_byte, identifier.end_byte, self.source_code)
+        declaration = self.table.declare(identifier, name, var_type)
+        self.visible.setdefault(name, []).append(declaration)
+        scope, names = self.frames[-1]
+        names.append(name)
+        self.table.scopes.setdefault(scope, []).append(declaration)
+        return declaration
+
+    def open(self, node: ASTNode) -> None:
+        self.table.scope_parent[node.id] = self.frames[-1][0] if len(self.frames) > 0 else node.id
+        self.table.scope_depth[node.id] = len(self.frames)
+        self.frames.append((node.id, []))
+        if node.type not in FIELD_CONTAINERS:
+            return
+        fields: Dict[VarName, DeclarationID] = {}  # fields are visible in the whole class body
+        for member in node.named_children:
+            if member.type not in ('field_declaration', 'constant_declaration'):
+                continue
+            for declarator in member.children_by_field_name('declarator'):
+                for identifier, var_type in declared_names(declarator, member, self.source_code):
+                    declaration = self.declare(identifier, var_type)
+                    fields[self.table.declarations[declaration].name] = declaration
+        self.fields.append(fields)
+
+    def close(self, node: ASTNode) -> None:
+        _, names = self.frames.pop()
+        for name in names:
+            self.visible[name].pop()
+        if node.type in FIELD_CONTAINERS:
+            self.fields.pop()
+
+    def visit(self, node: ASTNode, parent: Optional[ASTNode]) -> None:
+        if len(self.frames) > 0:
+            self.table._scope_of[node.id] = self.frames[-1][0]
+        for identifier, var_type in declared_names(node, parent, self.source_code):
+            self.declare(identifier, var_type)
+        if node.type == 'identifier' and node.start_byte not in self.table._declaring:
+            declarations = self.visible.get(extract_name(node.start_byte, node.end_byte, self.source_code))
+            if declarations:
+                self.table.bind(node, declarations[-1])
+        elif node.type == 'field_access' and len(self.fields) > 0:
+            obj, field = node.child_by_field_name('object'), node.child_by_field_name('field')
+            if obj is not None and obj.type == 'this' and field is not None:
+                declaration = self.fields[-1].get(extract_name(field.start_byte, field.end_byte, self.source_code))
+                if declaration is not None:
+                    self.table.bind(field, declaration)
+
+    def build(self, root: ASTNode) -> SymbolTable:
+        ''' Parents travel on the stack: `Node.parent` searches down from the root every time '''
+        stack: List[Tuple[ASTNode, Optional[ASTNode], bool]] = [(root, None, False)]
+        while len(stack) > 0:
+            node, parent, leaving = stack.pop()
+            if leaving:
+                self.close(node)
+                continue
+            if node.type in SCOPES:
+                self.open(node)
+                stack.append((node, parent, True))
+            self.visit(node, parent)
+            stack.extend((child, node, False) for child in reversed(node.children) if not _member_name(child, node))
+        return self.table
+
+
+def _member_name(node: ASTNode, parent: ASTNode) -> bool:
+    ''' Identifiers naming methods, fields, labels or types are not variables '''
+    if node.type != 'identifier':
+        return False
+    if parent.type == 'method_invocation':
+        return node == parent.child_by_field_name('name')
+    if parent.type == 'field_access':
+        return node == parent.child_by_field_name('field')
+    return parent.type in (
+        'labeled_statement', 'break_statement', 'continue_statement', 'method_declaration',
+        'class_declaration', 'constructor_declaration', 'interface_declaration', 'enum_declaration'
+    )
+
+
+def mk_symbol_table(root: ASTNode, source_code: Buffer) -> SymbolTable:
+    return _Builder(source_code).build(root)
@@ -0,0 +1,77 @@
+from typing import Set, Tuple
+from unittest import TestCase, main
+from program_graphs.adg.adg import ADG
+from program_graphs.adg.parser.java.parser import parse
+import networkx as nx  # type: ignore
+
+
+def cdep_edges(adg: ADG) -> Set[Tuple[int, int]]:
+    return set((u, v) for u, v, cdep in adg.edges(data='cdep') if cdep is True)
+
+
+def reference_cdep_edges(adg: ADG) -> Set[Tuple[int, int]]:
+    ''' Definition: `node` depends on `branch` if it post dominates a successor of `branch`
+        but does not strictly post dominate `branch` '''
+    cfg = nx.DiGraph(adg.to_cfg())
+    entry, exit = adg.get_entry_node(), adg.get_exit_node()
+    cfg.add_edge(entry, exit)
+    ipdom = nx.immediate_dominators(cfg.reverse(copy=False), exit)
+
+    def post_dominators(node: int) -> Set[int]:
+        result = {node}
+        while node != exit:
+            node = ipdom[node]
+            result.add(node)
+        return result
+    edges = set()
+    for branch in cfg.nodes():
+        if cfg.out_degree(branch) < 2:
+            continue
+        for s in cfg.successors(branch):
+            for node in post_dominators(s):
+                if node == branch or node not in post_dominators(branch):
+                    edges.add((branch, node))
+    return edges
+
+
+class TestControlDependency(TestCase):
+
+    codes = [
+        'int x = 1; if (x > 0) { x = 2; } else { x = 3; } return x;',
+        'int x = 0; while (x < 10) { if (x == 5) break; x++; } return x;',
+        'for (int i = 0; i < 10; i++) { if (i == 2) continue; if (i == 7) return; foo(i); } bar();',
+        'do { x++; if (x > 3) { y++; } } while (x < 10); switch (x) { case 1: y = 1; break; default: y = 2; }',
+        'try { foo(); } catch (Exception e) { bar(); } finally { baz(); }',
+    ]
+
+    def test_matches_definition(self) -> None:
+        for code in self.codes:
+            adg = parse(code, cdep_mode='post-dominance')
+            self.assertEqual(cdep_edges(adg), reference_cdep_edges(adg), code)
+
+    def test_jumps_in_branches(self) -> None:
+        adg = parse('if (x > 0) { return; } foo();', cdep_mode='post-dominance')
+        [condition] = [n for n, name in adg.nodes(data='name') if name == 'if_condition']
+        [call] = [
+            n for n, ast_node in adg.nodes(data='ast_node')
+            if ast_node is not None and ast_node.type == 'expression_statement'
+        ]
+        self.assertIn((condition, call), cdep_edges(adg))
+        self.assertNotIn((condition, call), cdep_edges(parse('if (x > 0) { return; } foo();')))
+
+    def test_other_layers_are_kept(self) -> None:
+        code = self.codes[1]
+        syntactic, derived = parse(code), parse(code, cdep_mode='post-dominance')
+        for attr in ['syntax', 'cflow', 'ddep']:
+            self.assertEqual(
+                set((u, v) for u, v, value in syntactic.edges(data=attr) if value is True),
+                set((u, v) for u, v, value in derived.edges(data=attr) if value is True)
+            )
+
+    def test_unknown_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            parse('x = 1;', cdep_mode='magic')
+
+
+if __name__ == '__main__':
+    main()
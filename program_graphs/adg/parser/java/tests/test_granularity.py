@@ -0,0 +1,82 @@
+from typing import List, Set, Tuple
+from unittest import TestCase, main
+from program_graphs.adg.adg import ADG
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.adg.parser.java.granularity import statements
+
+
+CODE = '''
+    int a = 1;
+    int b = a + 1;
+    if (b > 0) { c = b; d = c + a; }
+    e = f(a, g(b)) + (x = d);
+    return a;
+'''
+
+
+def text(adg: ADG, node: int) -> List[str]:
+    if adg.nodes[node].get('ast_node') is None:
+        return []
+    return [statement.text.decode() for statement in statements(adg, node)]
+
+
+def data_dependencies(adg: ADG) -> Set[Tuple[str, str, str]]:
+    return {
+        (' '.join(text(adg, u)), ' '.join(text(adg, v)), var)
+        for u, v, vars in adg.edges(data='vars') if vars is not None for var in vars
+    }
+
+
+class TestGranularity(TestCase):
+
+    def test_default_is_statement(self) -> None:
+        default = parse(CODE)
+        statement = parse(CODE, granularity='statement')
+        self.assertEqual(list(default.nodes()), list(statement.nodes()))
+        self.assertEqual(sorted(default.edges(data='vars')), sorted(statement.edges(data='vars')))
+
+    def test_unknown_granularity(self) -> None:
+        with self.assertRaises(ValueError):
+            parse(CODE, granularity='token')
+
+    def test_basic_blocks_are_merged(self) -> None:
+        adg = parse(CODE, granularity='basic-block')
+        blocks = [text(adg, node) for node, data in adg.nodes(data=True) if 'statements' in data]
+        self.assertEqual(
+            blocks,
+            [['int a = 1;', 'int b = a + 1;'], ['c = b;', 'd = c + a;'], ['e = f(a, g(b)) + (x = d);', 'return a;']]
+        )
+        self.assertEqual(list(adg.nodes()), list(range(1, len(adg) + 1)))
+
+    def test_basic_block_reads_are_upward_exposed(self) -> None:
+        adg = parse(CODE, granularity='basic-block')
+        deps = data_dependencies(adg)
+        block = 'c = b; d = c + a;'
+        self.assertIn(('int a = 1; int b = a + 1;', block, 'b'), deps)
+        self.assertIn(('int a = 1; int b = a + 1;', block, 'a'), deps)
+        self.assertIn((block, 'e = f(a, g(b)) + (x = d); return a;', 'd'), deps)
+        self.assertNotIn('c', {var for _, v, var in deps if v == block})
+
+    def test_expressions_get_nodes(self) -> None:
+        adg = parse(CODE, granularity='expression')
+        expressions = [node for node, expression in adg.nodes(data='expression') if expression is True]
+        self.assertEqual(
+            [adg.nodes[node]['ast_node'].text.decode() for node in expressions],
+            ['g(b)', 'f(a, g(b))', 'x = d']
+        )
+        statement = next(node for node in adg if text(adg, node) == ['e = f(a, g(b)) + (x = d);'])
+        flow = expressions + [statement]
+        for u, v in zip(flow, flow[1:]):
+            self.assertTrue(adg.edges[u, v].get('cflow'))
+
+    def test_expressions_read_their_own_identifiers(self) -> None:
+        adg = parse(CODE, granularity='expression')
+        deps = data_dependencies(adg)
+        self.assertIn(('int b = a + 1;', 'g(b)', 'b'), deps)
+        self.assertIn(('int a = 1;', 'f(a, g(b))', 'a'), deps)
+        self.assertIn(('d = c + a;', 'x = d', 'd'), deps)
+        self.assertNotIn(('int b = a + 1;', 'f(a, g(b))', 'b'), deps)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+from typing import List, Tuple
+from unittest import TestCase, main
+from program_graphs.adg.adg import ADG
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.adg.parser.java.layers import add_layer, graph_layers
+from program_graphs.utils.profiling import ParseStats
+
+
+CODE = '''
+    int a = 1;
+    while (a < 10) {
+        if (a > 5) { return; }
+        a = a + 1;
+    }
+'''
+
+
+def edges(adg: ADG, relation: str) -> List[Tuple[int, int]]:
+    return sorted((u, v) for u, v, mark in adg.edges(data=relation) if mark is True)
+
+
+class TestLayers(TestCase):
+
+    def test_all_layers_by_default(self) -> None:
+        adg = parse(CODE)
+        self.assertEqual(graph_layers(adg), {'syntax', 'control-flow', 'control-dependence', 'data-dependence'})
+        self.assertGreater(len(edges(adg, 'cdep')), 0)
+        self.assertGreater(len(edges(adg, 'ddep')), 0)
+
+    def test_unknown_layer(self) -> None:
+        with self.assertRaises(ValueError):
+            parse(CODE, layers=['syntax', 'call-graph'])
+
+    def test_passes_are_skipped(self) -> None:
+        stats = ParseStats()
+        adg = parse(CODE, stats, layers=['syntax', 'control-flow'])
+        self.assertEqual(graph_layers(adg), {'syntax', 'control-flow'})
+        self.assertEqual(edges(adg, 'cdep'), [])
+        self.assertEqual(edges(adg, 'ddep'), [])
+        self.assertNotIn('bind_variables', stats.timings)
+        self.assertNotIn('to_cfg', stats.timings)
+        self.assertEqual(edges(adg, 'cflow'), edges(parse(CODE), 'cflow'))
+        self.assertEqual(edges(adg, 'syntax'), edges(parse(CODE), 'syntax'))
+
+    def test_add_layer_later(self) -> None:
+        adg = parse(CODE, layers=['syntax', 'control-flow'])
+        add_layer(adg, 'data-dependence', CODE.encode())
+        add_layer(adg, 'control-dependence')
+        full = parse(CODE, cdep_mode='post-dominance')
+        self.assertEqual(edges(adg, 'ddep'), edges(full, 'ddep'))
+        self.assertEqual(edges(adg, 'cdep'), edges(full, 'cdep'))
+        self.assertEqual(graph_layers(adg), graph_layers(full))
+        add_layer(adg, 'data-dependence', CODE.encode())
+        self.assertEqual(list(adg.edges(data=True)), list(full.edges(data=True)))
+
+    def test_data_dependence_needs_source(self) -> None:
+        adg = parse(CODE, layers=['syntax', 'control-flow'])
+        with self.assertRaises(ValueError):
+            add_layer(adg, 'data-dependence')
+
+
+if __name__ == '__main__':
+    main()
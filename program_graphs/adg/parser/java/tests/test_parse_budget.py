@@ -0,0 +1,43 @@
+from unittest import TestCase, main
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.utils.budget import Budget, BudgetExceeded, is_truncated
+
+
+class TestParseBudget(TestCase):
+
+    code = '''
+        int x = 0;
+        while (x < 10) {
+            if (x > 5) {
+                x = x + 2;
+            } else {
+                x = x + 1;
+            }
+        }
+        return x;
+    '''
+
+    def ddep_edges(self, adg) -> int:  # type: ignore
+        return len([e for e in adg.edges(data='ddep') if e[2] is True])
+
+    def test_within_budget(self) -> None:
+        adg = parse(self.code, budget=Budget(max_nodes=1000, max_iterations=1000, timeout=60))
+        self.assertFalse(is_truncated(adg))
+        self.assertEqual(self.ddep_edges(adg), self.ddep_edges(parse(self.code)))
+
+    def test_iterations_budget_raises(self) -> None:
+        with self.assertRaises(BudgetExceeded) as ctx:
+            parse(self.code, budget=Budget(max_iterations=3))
+        self.assertEqual(ctx.exception.resource, 'iterations')
+
+    def test_truncated_graph_keeps_control_flow(self) -> None:
+        full = parse(self.code)
+        for budget in [Budget(max_iterations=3, truncate=True), Budget(max_nodes=5, truncate=True)]:
+            adg = parse(self.code, budget=budget)
+            self.assertTrue(is_truncated(adg))
+            self.assertEqual(len(adg), len(full))
+            self.assertLess(self.ddep_edges(adg), self.ddep_edges(full))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+from typing import List
+from unittest import TestCase, main
+from program_graphs.adg.parser.java.parser import parse, parse_ast_tree_sitter
+from program_graphs.utils.graph import walk_nodes, filter_nodes, first_node
+from program_graphs.types import ASTNode
+
+
+def preorder(node: ASTNode) -> List[ASTNode]:
+    return [node] + [n for child in node.children for n in preorder(child)]
+
+
+class TestWalkNodes(TestCase):
+
+    def test_document_order(self) -> None:
+        root = parse_ast_tree_sitter('class A { int f; void foo(String s) { if (s != null) { f = 1; } } }')
+        self.assertEqual(
+            [(n.type, n.start_byte, n.end_byte) for n in walk_nodes(root)],
+            [(n.type, n.start_byte, n.end_byte) for n in preorder(root)]
+        )
+
+    def test_subtree_root_keeps_its_alias(self) -> None:
+        root = parse_ast_tree_sitter('String t = "b";')
+        [type_identifier] = filter_nodes(root, ['type_identifier'])
+        self.assertEqual([n.type for n in walk_nodes(type_identifier)], ['type_identifier'])
+        self.assertEqual(first_node(type_identifier, ['type_identifier']), type_identifier)
+        self.assertIsNone(first_node(root, ['method_declaration']))
+
+
+class TestParseClass(TestCase):
+
+    def test_first_method_of_class(self) -> None:
+        method = 'void foo(int x) { if (x > 0) { x = x - 1; } }'
+        in_class = parse(f'class A {{ int f = 0; {method} void bar() {{ return; }} }}')
+        alone = parse(method)
+        self.assertEqual(
+            [(n, d.get('name'), d['ast_node'].type if 'ast_node' in d else None) for n, d in in_class.nodes(data=True)],
+            [(n, d.get('name'), d['ast_node'].type if 'ast_node' in d else None) for n, d in alone.nodes(data=True)]
+        )
+        self.assertEqual(sorted(in_class.edges()), sorted(alone.edges()))
+
+
+if __name__ == '__main__':
+    main()
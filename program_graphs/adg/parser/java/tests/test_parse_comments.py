@@ -1,7 +1,9 @@
 
+from typing import List, Tuple
 from unittest import TestCase, main
 from tree_sitter import Language, Parser  # type: ignore
-from program_graphs.adg.parser.java.parser import parse_from_ast
+from program_graphs.adg.adg import ADG
+from program_graphs.adg.parser.java.parser import parse_from_ast, is_syntax_token
 
 
 class TestParseComments(TestCase):
@@ -41,6 +43,30 @@ class TestParseComments(TestCase):
                 'Comments do not have syntax out relations'
             )
 
+    def test_adg_without_syntax_tokens(self) -> None:
+        bts = b"""
+            // comment
+            int x = 0;
+            while (x < 10) { /* block */ x++; }
+            switch (x) { case 1: y = x; break; default: y = 0; }
+            z = y;
+        """
+        ast = self.get_parser().parse(bts).root_node
+        full = parse_from_ast(ast, bts)
+        compact = parse_from_ast(ast, bts, syntax_tokens=False)
+        tokens = [n for n, a in full.nodes(data='ast_node') if a is not None and is_syntax_token(a)]
+        self.assertGreater(len(tokens), 0)
+        self.assertEqual(len(compact), len(full) - len(tokens))
+        self.assertFalse(any(is_syntax_token(a) for _, a in compact.nodes(data='ast_node') if a is not None))
+
+        def ddeps(adg: ADG) -> List[Tuple[bytes, bytes]]:
+            return sorted(
+                (adg.nodes[u]['ast_node'].text, adg.nodes[v]['ast_node'].text)
+                for u, v, ddep in adg.edges(data='ddep') if ddep
+            )
+        self.assertEqual(ddeps(compact), ddeps(full))
+        self.assertEqual(len(compact.to_cfg().edges()), len(full.to_cfg().edges()))
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,27 @@
+from unittest import TestCase, main
+from sys import getrecursionlimit
+from program_graphs.adg.parser.java.parser import parse
+import networkx as nx  # type: ignore
+
+
+class TestParseDeepNesting(TestCase):
+
+    def test_nesting_deeper_than_recursion_limit(self) -> None:
+        depth = getrecursionlimit() + 200
+        code = 'int x = 0;\n' + 'if (x > 0) {\n' * depth + 'x = x + 1;\n' + '}\n' * depth
+        adg = parse(code)
+        self.assertTrue(nx.algorithms.is_directed_acyclic_graph(adg.to_cfg()))
+        self.assertEqual(len([n for n, name in adg.nodes(data='name') if name == 'if']), depth)
+        self.assertEqual(len(adg.to_ddg().edges()), depth + 1)
+
+    def test_nested_loops_with_jumps(self) -> None:
+        depth = getrecursionlimit() + 200
+        code = 'while (x > 0) { if (x == 1) break;\n' * depth + 'continue;\n' + '}\n' * depth
+        adg = parse(code)
+        self.assertEqual(len([n for n, name in adg.nodes(data='name') if name == 'while']), depth)
+        self.assertEqual(len(adg._break_nodes), 0)
+        self.assertEqual(len(adg._continue_nodes), 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+from unittest import TestCase, main
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.utils.profiling import ParseStats
+
+
+class TestParseStats(TestCase):
+
+    code = '''
+        int x = 1;
+        while (x < 10) {
+            x = x + 1;
+        }
+        return x;
+    '''
+
+    def test_parse_without_stats(self) -> None:
+        self.assertEqual(
+            len(parse(self.code, ParseStats()).nodes()),
+            len(parse(self.code).nodes())
+        )
+
+    def test_phases_are_timed(self) -> None:
+        stats = ParseStats()
+        adg = parse(self.code, stats)
+        phases = [
+            'tree_sitter', 'mk_adg', 'wire_return_nodes', 'symbols',
+            'bind_variables', 'to_cfg', 'kuzma_blud', 'ddep_edges', 'def_use'
+        ]
+        for name in phases:
+            self.assertIn(name, stats.timings)
+            self.assertGreaterEqual(stats.timings[name], 0)
+        self.assertEqual(stats.counters['parsed'], 1)
+        self.assertEqual(stats.counters['nodes'], len(adg.nodes()))
+        self.assertEqual(stats.counters['edges'], len(adg.edges()))
+        self.assertGreater(stats.counters['dataflow_iterations'], 0)
+
+    def test_batch_aggregation(self) -> None:
+        shared = ParseStats()
+        separate = []
+        for _ in range(3):
+            parse(self.code, shared)
+            stats = ParseStats()
+            parse(self.code, stats)
+            separate.append(stats)
+        total = ParseStats.aggregate(separate)
+        self.assertEqual(shared.counters, total.counters)
+        self.assertEqual(total.counters['parsed'], 3)
+        self.assertEqual(set(shared.timings), set(total.timings))
+        self.assertIn('kuzma_blud', str(total))
+
+
+if __name__ == '__main__':
+    main()
@@ -166,6 +166,34 @@ class TestParseSwitch(TestCase):
             ])
         ))
 
+    def test_adg_switch_rules(self) -> None:
+        parser = self.get_parser()
+        bts = b"""
+            switch (i) {
+                case 1 -> a = 1;
+                default -> a = 0;
+            }
+        """
+        switch_node = parser.parse(bts).root_node.children[0]
+        assert switch_node.type == 'switch_expression'
+        adg = mk_empty_adg()
+        mk_adg_switch(switch_node, adg)
+        self.assertTrue(nx.algorithms.is_isomorphic(
+            adg.to_cfg(),
+            nx.DiGraph([
+                ("switch", "switch_condition"),
+                ("switch_condition", "case_1"),
+                ("case_1", "case_1_condition"),
+                ("case_1_condition", "a = 1;"),
+                ("a = 1;", "switch_exit"),
+                ("case_1_condition", "case_1_exit"),
+                ("case_1_exit", "default"),
+                ("default", "a = 0;"),
+                ("a = 0;", "default_exit"),
+                ("default_exit", "switch_exit")
+            ])
+        ))
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,129 @@
+from typing import List, Optional, Tuple
+from unittest import TestCase, main
+from program_graphs.adg.parser.java.parser import parse, parse_ast_tree_sitter
+from program_graphs.adg.parser.java.data_dependency import scope_exits
+from program_graphs.adg.parser.java.symbols import SymbolTable, mk_symbol_table, DeclarationID
+from program_graphs.types import ASTNode
+from program_graphs.utils.graph import filter_nodes
+
+
+class TestSymbolTable(TestCase):
+
+    def table(self, code: str) -> SymbolTable:
+        self.root = parse_ast_tree_sitter(code)
+        return mk_symbol_table(self.root, code.encode())
+
+    def occurrences(self, name: str) -> List[ASTNode]:
+        nodes = [n for n in filter_nodes(self.root, ['identifier']) if n.text.decode() == name]
+        return sorted(nodes, key=lambda n: n.start_byte)
+
+    def resolved(self, table: SymbolTable, name: str) -> List[Optional[DeclarationID]]:
+        return [table.resolve(n) for n in self.occurrences(name)]
+
+    def test_sibling_scopes(self) -> None:
+        table = self.table('''
+            for (int i = 0; i < 10; i++) { a += i; }
+            for (int i = 0; i < 10; i++) { b += i; }
+            { int t = a; } { String t = "b"; }
+        ''')
+        first, second = table.resolve(self.occurrences('i')[0]), table.resolve(self.occurrences('i')[4])
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.resolved(table, 'i'), [first] * 4 + [second] * 4)
+        t1, t2 = self.occurrences('t')
+        self.assertNotEqual(table.resolve(t1), table.resolve(t2))
+        self.assertEqual(table.declaration_type(t1), 'int')
+        self.assertEqual(table.declaration_type(t2), 'String')
+        self.assertEqual(self.resolved(table, 'a'), [None, None])
+
+    def test_field_and_local(self) -> None:
+        table = self.table('''
+            class A {
+                void foo() { this.f = f + 1; int f = 2; f++; }
+                int f;
+            }
+        ''')
+        write, read, local, update, field = self.resolved(table, 'f')
+        self.assertEqual([write, read], [field, field])
+        self.assertEqual(update, local)
+        self.assertNotEqual(field, local)
+        self.assertEqual([d.type for d in table.declarations], ['int', 'int'])
+
+    def test_declarations(self) -> None:
+        table = self.table('''
+            class A {
+                void foo(int x, String... ys) {
+                    try (Reader r = open()) { r.read(); } catch (IOException | E e) { e.log(); }
+                    for (String s : ys) { s.length(); }
+                    list.forEach(z -> z + x);
+                    list.forEach((u, v) -> u + v);
+                }
+            }
+        ''')
+        types = {d.name: d.type for d in table.declarations}
+        self.assertEqual(types, {
+            'x': 'int', 'ys': 'String', 'r': 'Reader', 'e': 'IOException,E', 's': 'String',
+            'z': None, 'u': None, 'v': None
+        })
+        for name in types:
+            [declaration] = [d.id for d in table.declarations if d.name == name]
+            self.assertEqual(self.resolved(table, name), [declaration] * len(self.occurrences(name)))
+        self.assertEqual(self.resolved(table, 'read'), [None])
+
+    def test_types_only_at_declaration(self) -> None:
+        table = self.table('int x = 1; x = 2;')
+        declaration, assignment = self.occurrences('x')
+        self.assertEqual(table.declaration_type(declaration), 'int')
+        self.assertIsNone(table.declaration_type(assignment))
+
+
+class TestResolvedDataDependencies(TestCase):
+
+    def ddeps(self, code: str, var: str) -> List[Tuple[str, str]]:
+        adg = parse(code)
+        return sorted(
+            (adg.nodes[u]['ast_node'].text.decode(), adg.nodes[v]['ast_node'].text.decode())
+            for u, v, data in adg.edges(data=True) if data.get('ddep') and var in data['vars']
+        )
+
+    def test_local_does_not_reach_shadowed_field(self) -> None:
+        code = '''
+            class A {
+                int t;
+                void foo() {
+                    while (c) {
+                        x = t;
+                        int t = 1;
+                        y = t;
+                    }
+                }
+            }
+        '''
+        self.assertEqual(self.ddeps(code, 't'), [('int t = 1;', 'y = t;')])
+
+    def test_this_field_reaches_field_reads(self) -> None:
+        code = '''
+            class A {
+                int f;
+                void foo(int f) {
+                    this.f = f;
+                    x = this.f + g(f);
+                }
+            }
+        '''
+        self.assertEqual(self.ddeps(code, 'f'), [('int f', 'this.f = f;'), ('int f', 'x = this.f + g(f);')])
+        adg = parse(code)
+        self.assertEqual(len(adg.symbols().declarations), 2)
+
+    def test_loop_variable_leaves_scope(self) -> None:
+        adg = parse('''
+            for (int i = 0; i < 10; i++) { s += i; }
+            s = 0;
+        ''')
+        symbols = adg.symbols()
+        [i] = [d.id for d in symbols.declarations if d.name == 'i']
+        gone = [adg.nodes[node].get('name') for node, exited in scope_exits(adg, symbols).items() if i in exited]
+        self.assertEqual(gone, ['for_exit'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+from array import array
+from bisect import bisect_right
+from sys import maxsize
+from typing import List, Tuple
+from program_graphs.types import NodeID
+from program_graphs.adg.slicing import CSR, DependenceIndex, ALL_DEPENDENCIES, strongly_connected_components
+
+BITSET = 'bitset'
+INTERVAL = 'interval'
+AUTO = 'auto'
+METHODS = (BITSET, INTERVAL, AUTO)
+
+BITSET_LIMIT = 10000  # components, the closure then takes at most 12.5 MB
+
+
+class ReachabilityIndex:
+    ''' Answers "is `b` reachable from `a` along dependence edges" without a traversal.
+
+        Nodes are grouped by strongly connected components. The condensed DAG is labeled
+        either with a transitive closure of bitsets, one bit per component (O(1) queries,
+        quadratic memory), or with interval sets over a post order numbering of a spanning
+        forest (Agrawal, Borgida, Jagadish. "Efficient management of transitive
+        relationships in large data and knowledge bases"), answered with a binary search.
+        'auto' picks bitsets for graphs up to `BITSET_LIMIT` components.
+    '''
+
+    def __init__(self, index: DependenceIndex, kinds: int = ALL_DEPENDENCIES, method: str = AUTO) -> None:
+        if method not in METHODS:
+            raise ValueError(f'Unknown reachability index: {method}')
+        self.index = index
+        csr = index.forward
+        self.component, members = strongly_connected_components(len(index.nodes), lambda i: csr.neighbours(i, kinds))
+        successors = _condense(csr, kinds, self.component, len(members))
+        if method == AUTO:
+            method = BITSET if len(members) <= BITSET_LIMIT else INTERVAL
+        self.method = method
+        if method == BITSET:
+            self._closure = _bitset_closure(successors)
+        else:
+            self._post, self._offsets, self._starts, self._ends = _interval_labels(successors)
+
+    def reaches(self, a: NodeID, b: NodeID) -> bool:
+        ''' There is a dependence path from `a` to `b`, every node reaches itself '''
+        ca = self.component[self.index.index[a]]
+        cb = self.component[self.index.index[b]]
+        if ca == cb:
+            return True
+        if cb > ca:
+            return False  # components are numbered in reverse topological order
+        if self.method == BITSET:
+            return bool(self._closure[ca][cb >> 3] >> (cb & 7) & 1)
+        post = self._post[cb]
+        lo, hi = self._offsets[ca], self._offsets[ca + 1]
+        k = bisect_right(self._starts, post, lo, hi) - 1
+        return k >= lo and bool(post <= self._ends[k])
+
+    def depends_on(self, a: NodeID, b: NodeID) -> bool:
+        ''' `a` transitively depends on `b` '''
+        return self.reaches(b, a)
+
+    def memory(self) -> int:
+        ''' Bytes taken by the labels '''
+        if self.method == BITSET:
+            return sum(len(bits) for bits in self._closure)
+        return sum(labels.itemsize * len(labels) for labels in (self._post, self._offsets, self._starts, self._ends))
+
+
+def _condense(csr: CSR, kinds: int, component: List[int], size: int) -> List[List[int]]:
+    ''' Successors of every component of the condensed DAG '''
+    successors: List[set] = [set() for _ in range(size)]
+    for i, c in enumerate(component):
+        for j in csr.neighbours(i, kinds):
+            if component[j] != c:
+                successors[c].add(component[j])
+    return [sorted(s) for s in successors]
+
+
+def _bitset_closure(successors: List[List[int]]) -> List[bytes]:
+    ''' Successors have smaller numbers, so they are closed before their predecessors '''
+    width = (len(successors) + 7) // 8
+    closure: List[int] = []
+    for c, targets in enumerate(successors):
+        bits = 1 << c
+        for t in targets:
+            bits |= closure[t]
+        closure.append(bits)
+    return [bits.to_bytes(width, 'little') for bits in closure]
+
+
+def _post_order(successors: List[List[int]]) -> List[int]:
+    ''' Post order numbers of a depth first spanning forest, the nodes of a subtree are numbered contiguously '''
+    size = len(successors)
+    post = [-1] * size
+    counter = 0
+    for root in reversed(range(size)):
+        if post[root] != -1:
+            continue
+        post[root] = -2
+        stack = [(root, iter(successors[root]))]
+        while len(stack) > 0:
+            node, children = stack[-1]
+            child = next(children, -1)
+            if child == -1:
+                stack.pop()
+                post[node] = counter
+                counter += 1
+            elif post[child] == -1:
+                post[child] = -2
+                stack.append((child, iter(successors[child])))
+    return post
+
+
+def _interval_labels(successors: List[List[int]]) -> Tuple[array, array, array, array]:
+    ''' Post numbers of the reachable components of each component as sorted, disjoint intervals.
+        Interval sets of component `c` are starts/ends[offsets[c]:offsets[c + 1]] '''
+    post = _post_order(successors)
+    labels: List[List[Tuple[int, int]]] = []
+    for c, targets in enumerate(successors):
+        intervals = [(post[c], post[c])]
+        # post numbers of a DAG decrease along paths: a successor reachable from
+        # an earlier one is covered by its label and adds nothing
+        for t in sorted(targets, key=lambda t: -post[t]):
+            if not _covers(intervals, post[t]):
+                intervals = _merge(intervals + labels[t])
+        labels.append(intervals)
+    offsets, starts, ends = array('l', [0]), array('l'), array('l')
+    for intervals in labels:
+        for start, end in intervals:
+            starts.append(start)
+            ends.append(end)
+        offsets.append(len(starts))
+    return array('l', post), offsets, starts, ends
+
+
+def _covers(intervals: List[Tuple[int, int]], value: int) -> bool:
+    k = bisect_right(intervals, (value, maxsize)) - 1
+    return k >= 0 and value <= intervals[k][1]
+
+
+def _merge(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    intervals.sort()
+    merged = [intervals[0]]
+    for start, end in intervals[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end + 1:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+    return merged
@@ -0,0 +1,215 @@
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Set, Tuple, Union
+import networkx as nx  # type: ignore
+from program_graphs.types import NodeID
+
+CDEP = 1
+DDEP = 2
+ALL_DEPENDENCIES = CDEP | DDEP
+
+Criteria = Union[NodeID, Iterable[NodeID]]
+Successors = Callable[[int], Iterable[int]]
+
+
+class CSR:
+    ''' Compressed adjacency: targets of node `i` are targets[offsets[i]:offsets[i + 1]] '''
+
+    def __init__(self, size: int, edges: Iterable[Tuple[int, int, int]]) -> None:
+        buckets: List[List[Tuple[int, int]]] = [[] for _ in range(size)]
+        for u, v, mask in edges:
+            buckets[u].append((v, mask))
+        self.offsets = array('l', [0])
+        self.targets = array('l')
+        self.masks = array('b')
+        for bucket in buckets:
+            for v, mask in bucket:
+                self.targets.append(v)
+                self.masks.append(mask)
+            self.offsets.append(len(self.targets))
+
+    def neighbours(self, i: int, kinds: int) -> Iterator[int]:
+        targets, masks = self.targets, self.masks
+        for k in range(self.offsets[i], self.offsets[i + 1]):
+            if masks[k] & kinds:
+                yield targets[k]
+
+
+class DependenceIndex:
+    ''' Control and data dependence edges of an ADG in compact arrays.
+
+        Built once per graph (see `ADG.dependence_index`), then every slice is a plain
+        traversal of integer arrays instead of a networkx BFS over a filtered copy.
+    '''
+
+    def __init__(self, g: nx.DiGraph) -> None:
+        self.nodes: List[NodeID] = list(g.nodes())
+        self.index: Dict[NodeID, int] = {node: i for i, node in enumerate(self.nodes)}
+        edges = []
+        for u, neighbours in g.adj.items():
+            for v, data in neighbours.items():
+                mask = (CDEP if data.get('cdep') is True else 0) | (DDEP if data.get('ddep') is True else 0)
+                if mask != 0:
+                    edges.append((self.index[u], self.index[v], mask))
+        self.forward = CSR(len(self.nodes), edges)
+        self.backward = CSR(len(self.nodes), [(v, u, mask) for u, v, mask in edges])
+
+    def _ids(self, criteria: Criteria) -> List[int]:
+        if isinstance(criteria, int):
+            criteria = [criteria]
+        return [self.index[node] for node in criteria]
+
+    def _traverse(self, csr: CSR, starts: List[int], kinds: int) -> List[int]:
+        offsets, targets, masks = csr.offsets, csr.targets, csr.masks
+        visited = bytearray(len(self.nodes))
+        for i in starts:
+            visited[i] = 1
+        order = list(set(starts))
+        stack = list(order)
+        while len(stack) > 0:
+            i = stack.pop()
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                if not visited[j] and masks[k] & kinds:
+                    visited[j] = 1
+                    stack.append(j)
+                    order.append(j)
+        return order
+
+    def _nodes(self, ids: Iterable[int]) -> Set[NodeID]:
+        nodes = self.nodes
+        return {nodes[i] for i in ids}
+
+    def backward_slice(self, criteria: Criteria, kinds: int = ALL_DEPENDENCIES) -> Set[NodeID]:
+        ''' Nodes the criteria transitively depend on, criteria included '''
+        return self._nodes(self._traverse(self.backward, self._ids(criteria), kinds))
+
+    def forward_slice(self, criteria: Criteria, kinds: int = ALL_DEPENDENCIES) -> Set[NodeID]:
+        ''' Nodes transitively depending on the criteria, criteria included '''
+        return self._nodes(self._traverse(self.forward, self._ids(criteria), kinds))
+
+    def chop(self, source: Criteria, sink: Criteria, kinds: int = ALL_DEPENDENCIES) -> Set[NodeID]:
+        ''' Nodes on dependence paths from `source` to `sink` '''
+        forward = set(self._traverse(self.forward, self._ids(source), kinds))
+        backward = self._traverse(self.backward, self._ids(sink), kinds)
+        return self._nodes(i for i in backward if i in forward)
+
+    def backward_slices(self, criteria: Iterable[NodeID], kinds: int = ALL_DEPENDENCIES) -> Dict[NodeID, Set[NodeID]]:
+        ''' Backward slice of every criterion, traversal work is shared between them '''
+        return self._slices(self.backward, criteria, kinds)
+
+    def forward_slices(self, criteria: Iterable[NodeID], kinds: int = ALL_DEPENDENCIES) -> Dict[NodeID, Set[NodeID]]:
+        ''' Forward slice of every criterion, traversal work is shared between them '''
+        return self._slices(self.forward, criteria, kinds)
+
+    def _slices(self, csr: CSR, criteria: Iterable[NodeID], kinds: int) -> Dict[NodeID, Set[NodeID]]:
+        ''' Reachable sets are collected bottom up over strongly connected components
+            as bitsets, so a component shared by many slices is traversed once '''
+        criteria = list(criteria)
+        component, members = strongly_connected_components(len(self.nodes), lambda i: csr.neighbours(i, kinds))
+        reach = _component_closure(component, members, lambda i: csr.neighbours(i, kinds), self._ids(criteria))
+        result: Dict[NodeID, Set[NodeID]] = {}
+        for node in criteria:
+            bits = reach[component[self.index[node]]]
+            result[node] = {self.nodes[i] for c in _bit_indices(bits) for i in members[c]}
+        return result
+
+
+class _Tarjan:
+    ''' State of an iterative Tarjan walk '''
+
+    def __init__(self, size: int, successors: Successors) -> None:
+        self.successors = successors
+        self.index = [-1] * size
+        self.low = [0] * size
+        self.on_stack = bytearray(size)
+        self.stack: List[int] = []
+        self.component = [-1] * size
+        self.members: List[List[int]] = []
+        self.counter = 0
+
+    def visit(self, node: int) -> Tuple[int, Iterator[int]]:
+        self.index[node] = self.low[node] = self.counter
+        self.counter += 1
+        self.stack.append(node)
+        self.on_stack[node] = 1
+        return node, iter(self.successors(node))
+
+    def close(self, node: int) -> None:
+        if self.low[node] != self.index[node]:
+            return
+        scc = []
+        while True:
+            member = self.stack.pop()
+            self.on_stack[member] = 0
+            self.component[member] = len(self.members)
+            scc.append(member)
+            if member == node:
+                break
+        self.members.append(scc)
+
+    def run(self, root: int) -> None:
+        work = [self.visit(root)]
+        while len(work) > 0:
+            node, children = work[-1]
+            child = next(children, -1)
+            if child == -1:
+                work.pop()
+                if len(work) > 0:
+                    parent = work[-1][0]
+                    self.low[parent] = min(self.low[parent], self.low[node])
+                self.close(node)
+            elif self.index[child] == -1:
+                work.append(self.visit(child))
+            elif self.on_stack[child]:
+                self.low[node] = min(self.low[node], self.index[child])
+
+
+def strongly_connected_components(size: int, successors: Successors) -> Tuple[List[int], List[List[int]]]:
+    ''' Component of every node and members of every component.
+        Components are numbered in reverse topological order: a component only reaches
+        components with smaller or equal numbers '''
+    tarjan = _Tarjan(size, successors)
+    for root in range(size):
+        if tarjan.index[root] == -1:
+            tarjan.run(root)
+    return tarjan.component, tarjan.members
+
+
+def _component_closure(
+    component: List[int],
+    members: List[List[int]],
+    successors: Successors,
+    starts: Iterable[int]
+) -> Mapping[int, int]:
+    ''' Bitset of components reachable from the components of `starts`, only the needed ones are computed '''
+    reach: Dict[int, int] = {}
+    for start in starts:
+        root = component[start]
+        if root in reach:
+            continue
+        work = [root]
+        while len(work) > 0:
+            c = work[-1]
+            pending = {
+                component[j] for i in members[c] for j in successors(i)
+                if component[j] != c and component[j] not in reach
+            }
+            if len(pending) > 0:
+                work.extend(pending)
+                continue
+            work.pop()
+            if c in reach:
+                continue
+            bits = 1 << c
+            for i in members[c]:
+                for j in successors(i):
+                    bits |= reach.get(component[j], 0)
+            reach[c] = bits
+    return reach
+
+
+def _bit_indices(bits: int) -> Iterator[int]:
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
@@ -0,0 +1,178 @@
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from program_graphs.types import NodeID
+from program_graphs.utils.dominance import ControlFlowAnalyses, DominatorTree
+from program_graphs.adg.chains import DefUseChains, Var, VarName, def_use_chains
+from program_graphs.adg.parser.java.symbols import Symbol
+
+Version = int  # 0 is the value on method entry: a parameter, a field or an undefined variable
+
+
+class Phi:
+    ''' Merge of the versions of a variable flowing into a join node, one operand per control flow predecessor '''
+
+    def __init__(self, symbol: Symbol, var: VarName) -> None:
+        self.symbol = symbol
+        self.var = var
+        self.version: Version = 0
+        self.operands: Dict[NodeID, Version] = {}
+
+    def __repr__(self) -> str:
+        operands = ', '.join(f'{pred}: {self.var}_{v}' for pred, v in self.operands.items())
+        return f'{self.var}_{self.version} = phi({operands})'
+
+
+class SSA:
+    ''' Static single assignment overlay of an ADG: the graph itself is not copied or changed.
+
+        Every write of a variable gets a new version, every read refers to the single
+        version reaching it, and join nodes get phi functions for variables defined on
+        more than one incoming path. Node ids of the ADG are kept.
+
+        Variables are the symbols of the def-use chains, so shadowed declarations get
+        versions of their own. Versions are numbered by name, so a name and a version
+        name one definition; a variable may be given by name or by symbol.
+    '''
+
+    def __init__(self, chains: Optional[DefUseChains] = None) -> None:
+        self.chains = chains if chains is not None else DefUseChains()
+        self.phis: Dict[NodeID, Dict[Symbol, Phi]] = {}
+        self.reads: Dict[NodeID, Dict[Symbol, Version]] = {}
+        self.writes: Dict[NodeID, Dict[Symbol, Version]] = {}
+        self.definitions: Dict[Tuple[Symbol, Version], NodeID] = {}
+
+    def _at(self, versions: Dict[Symbol, Version], var: Var) -> Optional[Version]:
+        for symbol in self.chains.symbols(var):
+            if symbol in versions:
+                return versions[symbol]
+        return None
+
+    def read_version(self, node: NodeID, var: Var) -> Optional[Version]:
+        return self._at(self.reads.get(node, {}), var)
+
+    def write_version(self, node: NodeID, var: Var) -> Optional[Version]:
+        return self._at(self.writes.get(node, {}), var)
+
+    def definition(self, var: Var, version: Version) -> Optional[NodeID]:
+        ''' Node assigning or merging (with a phi) this version, None for the entry value '''
+        for symbol in self.chains.symbols(var):
+            node = self.definitions.get((symbol, version))
+            if node is not None:
+                return node
+        return None
+
+    def phi(self, node: NodeID, var: Var) -> Optional[Phi]:
+        phis = self.phis.get(node, {})
+        return next((phis[s] for s in self.chains.symbols(var) if s in phis), None)
+
+    def is_phi(self, var: Var, version: Version) -> bool:
+        node = self.definition(var, version)
+        phi = self.phi(node, var) if node is not None else None
+        return phi is not None and phi.version == version
+
+    def iter_phis(self) -> Iterator[Tuple[NodeID, Phi]]:
+        for node, phis in self.phis.items():
+            for phi in phis.values():
+                yield node, phi
+
+    def versions(self, var: Var) -> int:
+        ''' Number of versions of `var` besides the entry value '''
+        symbols = set(self.chains.symbols(var))
+        return sum(1 for (symbol, _) in self.definitions if symbol in symbols)
+
+
+def place_phis(g: ControlFlowAnalyses, tree: DominatorTree, chains: DefUseChains) -> Dict[NodeID, Dict[Symbol, Phi]]:
+    ''' Phis at the iterated dominance frontiers of the writes (Cytron et al.), semi-pruned:
+        variables nobody reads get no phi '''
+    frontiers = g.dominance_frontiers()
+    sites: Dict[Symbol, Set[NodeID]] = {}
+    read: Set[Symbol] = set()
+    for node in tree.idom:
+        for symbol in chains.written_symbols(node):
+            sites.setdefault(symbol, set()).add(node)
+        read.update(chains.read_symbols(node))
+    phis: Dict[NodeID, Dict[Symbol, Phi]] = {}
+    for symbol, defs in sites.items():
+        if symbol not in read:
+            continue
+        work = list(defs)
+        placed: Set[NodeID] = set()
+        while len(work) > 0:
+            node = work.pop()
+            for join in frontiers.get(node, ()):
+                if join in placed:
+                    continue
+                placed.add(join)
+                phis.setdefault(join, {})[symbol] = Phi(symbol, chains.name(symbol) or '')
+                if join not in defs:
+                    work.append(join)
+    return phis
+
+
+class _Renaming:
+    ''' Version stacks of a walk down the dominator tree '''
+
+    def __init__(self, g: ControlFlowAnalyses, ssa: SSA) -> None:
+        self.g = g
+        self.ssa = ssa
+        self.chains = ssa.chains
+        self.flow = g.flow_view()
+        self.stacks: Dict[Symbol, List[Version]] = {}
+        self.counters: Dict[Optional[VarName], int] = {}
+
+    def current(self, symbol: Symbol) -> Version:
+        stack = self.stacks.get(symbol)
+        return stack[-1] if stack else 0
+
+    def define(self, symbol: Symbol, node: NodeID) -> Version:
+        name = self.chains.name(symbol)
+        version = self.counters.get(name, 0) + 1
+        self.counters[name] = version
+        self.stacks.setdefault(symbol, []).append(version)
+        self.ssa.definitions[(symbol, version)] = node
+        return version
+
+    def enter(self, node: NodeID) -> List[Symbol]:
+        ''' Rename the node and the phi operands of its successors, returns the pushed variables '''
+        pushed = []
+        for symbol, phi in self.ssa.phis.get(node, {}).items():
+            phi.version = self.define(symbol, node)
+            pushed.append(symbol)
+        reads = {symbol: self.current(symbol) for symbol in self.chains.read_symbols(node)}
+        if len(reads) > 0:
+            self.ssa.reads[node] = reads
+        writes = {}
+        for symbol in self.chains.written_symbols(node):
+            writes[symbol] = self.define(symbol, node)
+            pushed.append(symbol)
+        if len(writes) > 0:
+            self.ssa.writes[node] = writes
+        for succ in self.flow.successors(node):
+            for symbol, phi in self.ssa.phis.get(succ, {}).items():
+                phi.operands[node] = self.current(symbol)
+        return pushed
+
+    def leave(self, pushed: List[Symbol]) -> None:
+        for symbol in pushed:
+            self.stacks[symbol].pop()
+
+
+def mk_ssa(g: ControlFlowAnalyses) -> SSA:
+    ''' SSA overlay of the control flow view of `g`. The variables each node reads and writes
+        come from the def-use chains of the data dependency layer, resolved by the symbol table;
+        nodes unreachable from the entry are skipped '''
+    tree = g.dominator_tree()
+    ssa = SSA(def_use_chains(g))
+    if tree.root is None:
+        return ssa
+    ssa.phis = place_phis(g, tree, ssa.chains)
+    renaming = _Renaming(g, ssa)
+    stack: List[Tuple[List[Symbol], Iterator[NodeID]]] = [(renaming.enter(tree.root), iter(tree.children[tree.root]))]
+    while len(stack) > 0:
+        pushed, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            renaming.leave(pushed)
+            stack.pop()
+            continue
+        stack.append((renaming.enter(child), iter(tree.children[child])))
+    return ssa
@@ -0,0 +1,251 @@
+import re
+from time import perf_counter
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+from tabulate import tabulate
+from program_graphs.types import NodeID, ASTNode
+from program_graphs.adg.adg import ADG
+from program_graphs.utils.source import Buffer, extract_name
+from program_graphs.utils.graph import filter_nodes
+
+CALLS = ['method_invocation', 'object_creation_expression']
+
+
+class MethodSpec(NamedTuple):
+    ''' A method by name. `positions` select parameters (sources) or arguments (sinks), None means all '''
+    name: str
+    positions: Optional[Tuple[int, ...]] = None
+
+
+Spec = Union[str, MethodSpec]
+
+
+class TaintSpec:
+    ''' What is tainted, where it must not arrive and what cleans it.
+
+        sources: calls whose result is tainted, e.g. 'getParameter'; with `positions`,
+            the parameters at these positions of the methods declared with that name,
+            e.g. MethodSpec('doGet', (0,)).
+        sinks: calls which must not get tainted arguments (at `positions`, if given).
+        sanitizers: calls whose result is clean whatever their arguments are.
+    '''
+
+    def __init__(
+        self,
+        sources: Iterable[Spec] = (),
+        sinks: Iterable[Spec] = (),
+        sanitizers: Iterable[Spec] = ()
+    ) -> None:
+        source_specs = [_spec(s) for s in sources]
+        self.source_calls: FrozenSet[str] = frozenset(s.name for s in source_specs if s.positions is None)
+        self.source_parameters: Dict[str, FrozenSet[int]] = {
+            s.name: frozenset(s.positions) for s in source_specs if s.positions is not None
+        }
+        self.sinks: Dict[str, Optional[FrozenSet[int]]] = {
+            s.name: None if s.positions is None else frozenset(s.positions) for s in map(_spec, sinks)
+        }
+        self.sanitizers: FrozenSet[str] = frozenset(_spec(s).name for s in sanitizers)
+        names = self.source_calls | set(self.source_parameters) | set(self.sinks) | self.sanitizers
+        alternatives = b'|'.join(re.escape(name.encode()) for name in sorted(names))
+        self.pattern = re.compile(rb'\b(?:' + alternatives + rb')\b' if len(names) > 0 else rb'(?!)')
+
+    def mentioned(self, source_code: Buffer, ast_node: ASTNode) -> bool:
+        ''' The code of `ast_node` may contain a source, a sink or a sanitizer '''
+        return self.pattern.search(source_code, ast_node.start_byte, ast_node.end_byte) is not None
+
+
+def _spec(spec: Spec) -> MethodSpec:
+    return MethodSpec(spec) if isinstance(spec, str) else spec
+
+
+class TaintFinding(NamedTuple):
+    source: NodeID
+    sink: NodeID
+    source_name: str
+    sink_name: str
+
+
+class _Node:
+    ''' What the statement at a node does with taint '''
+
+    def __init__(self) -> None:
+        self.sources: List[str] = []  # names of source calls or parameters in the statement
+        self.flow_vars: Set[str] = set()  # variables whose taint flows into the values written
+        self.sinks: List[Tuple[str, Set[str], List[str]]] = []  # sink name, argument variables, sources inside
+
+
+def _call_name(call: ASTNode, source_code: Buffer) -> Optional[str]:
+    name = call.child_by_field_name('name' if call.type == 'method_invocation' else 'type')
+    if name is None:
+        return None
+    return extract_name(name.start_byte, name.end_byte, source_code)
+
+
+def _walk(node: ASTNode, source_code: Buffer, spec: TaintSpec) -> Iterator[ASTNode]:
+    ''' Nodes of an expression, the arguments of sanitizer calls excluded '''
+    stack = [node]
+    while len(stack) > 0:
+        node = stack.pop()
+        yield node
+        if node.type in CALLS and _call_name(node, source_code) in spec.sanitizers:
+            stack.extend(c for c in node.children if c.type != 'argument_list')
+        else:
+            stack.extend(node.children)
+
+
+def _identifiers(node: ASTNode, source_code: Buffer, spec: TaintSpec) -> Set[str]:
+    return {
+        extract_name(n.start_byte, n.end_byte, source_code)
+        for n in _walk(node, source_code, spec) if n.type == 'identifier'
+    }
+
+
+def _source_calls(node: ASTNode, source_code: Buffer, spec: TaintSpec) -> List[str]:
+    names = [_call_name(n, source_code) for n in _walk(node, source_code, spec) if n.type in CALLS]
+    return [name for name in names if name in spec.source_calls]  # type: ignore
+
+
+def _parameter_source(ast_node: ASTNode, source_code: Buffer, spec: TaintSpec) -> Optional[str]:
+    parameters = ast_node.parent
+    method = parameters.parent if parameters is not None else None
+    if parameters is None or method is None or method.type not in ('method_declaration', 'constructor_declaration'):
+        return None
+    name_node = method.child_by_field_name('name')
+    name = extract_name(name_node.start_byte, name_node.end_byte, source_code)  # type: ignore
+    positions = spec.source_parameters.get(name)
+    if positions is None:
+        return None
+    formal = [c for c in parameters.named_children if c.type == 'formal_parameter']
+    span = (ast_node.start_byte, ast_node.end_byte)  # nodes reached through `parent` are new objects
+    position = next((i for i, c in enumerate(formal) if (c.start_byte, c.end_byte) == span), None)
+    return f'{name}#{position}' if position in positions else None
+
+
+def _sinks(ast_node: ASTNode, source_code: Buffer, spec: TaintSpec) -> List[Tuple[str, Set[str], List[str]]]:
+    sinks = []
+    for call in filter_nodes(ast_node, CALLS):
+        name = _call_name(call, source_code)
+        if name not in spec.sinks:
+            continue
+        positions = spec.sinks[name]  # type: ignore
+        arguments = call.child_by_field_name('arguments')
+        if arguments is None:
+            continue
+        selected = [a for i, a in enumerate(arguments.named_children) if positions is None or i in positions]
+        variables: Set[str] = set()
+        sources: List[str] = []
+        for argument in selected:
+            variables |= _identifiers(argument, source_code, spec)
+            sources += _source_calls(argument, source_code, spec)
+        sinks.append((name, variables, sources))  # type: ignore
+    return sinks
+
+
+def _classify(ast_node: ASTNode, read_vars: Set[str], source_code: Buffer, spec: TaintSpec) -> Optional[_Node]:
+    node = _Node()
+    if ast_node.type == 'formal_parameter':
+        parameter = _parameter_source(ast_node, source_code, spec)
+        node.sources = [] if parameter is None else [parameter]
+    elif not spec.mentioned(source_code, ast_node):
+        node.flow_vars = read_vars
+    else:
+        node.sources = _source_calls(ast_node, source_code, spec)
+        node.flow_vars = _identifiers(ast_node, source_code, spec)
+        node.sinks = _sinks(ast_node, source_code, spec)
+    if len(node.sources) == 0 and len(node.flow_vars) == 0 and len(node.sinks) == 0:
+        return None
+    return node
+
+
+class TaintEngine:
+    ''' Source to sink reachability along the data dependencies of ADGs.
+
+        Every source occurrence gets a bit; the taint of a node is the bitset of the sources
+        whose values flow into what it writes, propagated along `ddep` edges whose variables
+        the node reads outside of sanitizer arguments. One engine (and its spec) serves a batch.
+    '''
+
+    def __init__(self, spec: TaintSpec) -> None:
+        self.spec = spec
+
+    def analyze(self, g: ADG, source_code: Buffer) -> List[TaintFinding]:
+        nodes: Dict[NodeID, _Node] = {}
+        for node, data in g.nodes(data=True):
+            ast_node, read_vars = data.get('ast_node'), data.get('read_vars')
+            if ast_node is None or read_vars is None:
+                continue
+            classified = _classify(ast_node, {name for name, _ in read_vars}, source_code, self.spec)
+            if classified is not None:
+                nodes[node] = classified
+        sites: List[Tuple[NodeID, str]] = []
+        taint: Dict[NodeID, int] = {}
+        for node, info in nodes.items():
+            for name in info.sources:
+                taint[node] = taint.get(node, 0) | (1 << len(sites))
+                sites.append((node, name))
+        if len(sites) == 0:
+            return []
+        self._propagate(g, nodes, taint)
+        return self._findings(g, nodes, taint, sites)
+
+    def _propagate(self, g: ADG, nodes: Dict[NodeID, _Node], taint: Dict[NodeID, int]) -> None:
+        work = list(taint)
+        while len(work) > 0:
+            u = work.pop()
+            bits = taint[u]
+            for v, data in g.adj[u].items():
+                if data.get('ddep') is not True or v not in nodes:
+                    continue
+                if data['vars'].isdisjoint(nodes[v].flow_vars):
+                    continue
+                old = taint.get(v, 0)
+                if old | bits != old:
+                    taint[v] = old | bits
+                    work.append(v)
+
+    def _findings(
+        self, g: ADG, nodes: Dict[NodeID, _Node], taint: Dict[NodeID, int], sites: List[Tuple[NodeID, str]]
+    ) -> List[TaintFinding]:
+        findings = []
+        for node, info in nodes.items():
+            for sink_name, variables, inner_sources in info.sinks:
+                bits = 0
+                for u, data in g.pred[node].items():
+                    if data.get('ddep') is True and not data['vars'].isdisjoint(variables):
+                        bits |= taint.get(u, 0)
+                for i, (site, name) in enumerate(sites):
+                    if bits >> i & 1 or (site == node and name in inner_sources):
+                        findings.append(TaintFinding(site, node, name, sink_name))
+        return findings
+
+    def analyze_batch(self, graphs: Iterable[Tuple[ADG, Buffer]]) -> 'TaintReport':
+        ''' Analyze every (graph, source code) pair, timing the analysis '''
+        report = TaintReport()
+        for g, source_code in graphs:
+            start = perf_counter()
+            report.findings.append(self.analyze(g, source_code))
+            report.analysis_time += perf_counter() - start
+        return report
+
+
+class TaintReport:
+    ''' Findings of every method of a batch, in order, and the throughput '''
+
+    def __init__(self) -> None:
+        self.findings: List[List[TaintFinding]] = []
+        self.analysis_time = 0.0
+
+    @property
+    def methods(self) -> int:
+        return len(self.findings)
+
+    def methods_per_second(self) -> float:
+        return self.methods / self.analysis_time if self.analysis_time > 0 else 0.0
+
+    def __str__(self) -> str:
+        return tabulate([
+            ('methods', self.methods),
+            ('with findings', sum(1 for f in self.findings if len(f) > 0)),
+            ('findings', sum(len(f) for f in self.findings)),
+            ('analysis, s', f'{self.analysis_time:.3f}'),
+            ('methods/s', f'{self.methods_per_second():.1f}'),
+        ])
@@ -0,0 +1,55 @@
+from unittest import TestCase, main
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.adg.parser.java.data_dependency import add_data_dependency_layer
+from program_graphs.utils.dominance import ControlFlowAnalyses
+import networkx as nx  # type: ignore
+
+
+class TestADGDominance(TestCase):
+
+    code = '''
+        int x = 0;
+        while (x < 10) {
+            if (x == 5) break;
+            x++;
+        }
+        return x;
+    '''
+
+    def test_control_flow_view(self) -> None:
+        adg = parse(self.code)
+        cfg = adg.to_cfg()
+        entry, exit = adg.get_entry_node(), adg.get_exit_node()
+        self.assertEqual(adg.dominator_tree().idom, {entry: entry, **nx.immediate_dominators(cfg, entry)})
+        reverse = cfg.reverse(copy=False)
+        self.assertEqual(adg.post_dominator_tree().idom, {exit: exit, **nx.immediate_dominators(reverse, exit)})
+        self.assertEqual(adg.dominance_frontiers(), nx.dominance_frontiers(cfg, entry))
+
+    def test_loops(self) -> None:
+        adg = parse(self.code)
+        [loop] = adg.loops()
+        self.assertEqual(adg.nodes[loop.header]['name'], 'while_condition')
+        self.assertEqual(len(adg.back_edges()), 1)
+
+    def test_cache_is_invalidated(self) -> None:
+        adg = parse(self.code)
+        loops = adg.loops()
+        self.assertIs(adg.loops(), loops)
+        adg.nodes[1]['note'] = 'attributes do not change the structure'
+        self.assertIs(adg.loops(), loops)
+        adg.add_edge(adg.get_exit_node(), adg.get_entry_node(), cflow=True)
+        self.assertIsNot(adg.loops(), loops)
+
+    def test_layers_invalidate_cache(self) -> None:
+        adg = parse(self.code)
+        liveness = adg.liveness()
+        add_data_dependency_layer(adg, self.code.encode())
+        self.assertIsNot(adg.liveness(), liveness)
+
+    def test_entry_and_exit_are_abstract(self) -> None:
+        with self.assertRaises(TypeError):
+            ControlFlowAnalyses()  # type: ignore
+
+
+if __name__ == '__main__':
+    main()
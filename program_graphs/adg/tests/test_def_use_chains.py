@@ -0,0 +1,78 @@
+from unittest import TestCase, main
+from program_graphs.adg.adg import ADG
+from program_graphs.adg.chains import DefUseChains
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.types import NodeID
+
+
+class TestDefUseChains(TestCase):
+
+    code = '''
+        int a = 0;
+        int b = a + 1;
+        int dead = 5;
+        while (a < b) {
+            a = a + b;
+        }
+        return a;
+    '''
+
+    def by_name(self, adg: ADG, name: str) -> NodeID:
+        [node] = [n for n, data in adg.nodes(data=True) if data.get('name') == name]
+        return node  # type: ignore
+
+    def test_matches_ddep_edges(self) -> None:
+        adg = parse(self.code)
+        chains = adg.def_use_chains()
+        links = {(u, v, var) for u, v, data in adg.edges(data=True) if data.get('ddep') for var in data['vars']}
+        self.assertEqual(len(chains), len(links))
+        for u, v, var in links:
+            self.assertIn(v, chains.uses(u, var))
+            self.assertIn(u, chains.definitions(v, var))
+            self.assertIn((u, v), set(chains.chains(var)))
+        for node in adg.nodes():
+            self.assertEqual(chains.uses(node), {v for u, v, _ in links if u == node})
+            self.assertEqual(chains.definitions(node), {u for u, v, _ in links if v == node})
+
+    def test_variables(self) -> None:
+        adg = parse(self.code)
+        chains = adg.def_use_chains()
+        self.assertEqual(chains.variables(), {'a', 'b', 'dead'})
+        [dead] = chains.writes('dead')
+        self.assertEqual(chains.uses(dead), set())
+        self.assertEqual(chains.reads('dead'), ())
+        ret = self.by_name(adg, 'return')
+        self.assertEqual(len(chains.definitions(ret, 'a')), 2)
+        self.assertEqual(chains.definitions(ret, 'b'), set())
+        self.assertEqual(set(chains.writes('a')), chains.definitions(ret, 'a'))
+
+    def test_shadowed_names(self) -> None:
+        adg = parse('''
+            for (int i = 0; i < n; i++) { s += i; }
+            for (int i = 0; i < n; i++) { t += i; }
+        ''')
+        chains = adg.def_use_chains()
+        first, second = chains.symbols('i')
+        self.assertEqual(chains.name(first), 'i')
+        self.assertEqual(len(chains.writes('i')), len(chains.writes(first)) + len(chains.writes(second)))
+        self.assertEqual(set(chains.chains('i')), set(chains.chains(first)) | set(chains.chains(second)))
+        self.assertFalse(set(chains.reads(first)) & set(chains.reads(second)))
+        for def_node in chains.writes(first):
+            self.assertFalse(chains.uses(def_node, second))
+
+    def test_copies_do_not_share_chains(self) -> None:
+        adg = parse(self.code)
+        chains, ddg = adg.def_use_chains(), adg.to_ddg()
+        self.assertIsNot(ddg.def_use_chains(), chains)
+        self.assertEqual(set(ddg.def_use_chains().chains('a')), set(chains.chains('a')))
+        [dead] = chains.writes('dead')
+        ddg.def_use_chains().add_write(dead, -100, 'b')
+        self.assertEqual(len(chains.writes('b')), 1)
+
+    def test_empty(self) -> None:
+        self.assertEqual(len(ADG().def_use_chains()), 0)
+        self.assertEqual(DefUseChains().uses(1, 'x'), set())
+
+
+if __name__ == '__main__':
+    main()
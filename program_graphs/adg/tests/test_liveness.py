@@ -0,0 +1,73 @@
+from typing import Dict, Set
+from unittest import TestCase, main
+from program_graphs.adg.adg import ADG
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.utils.liveness import solve, solve_batch
+from program_graphs.types import NodeID
+
+
+def reference_live_in(adg: ADG) -> Dict[NodeID, Set[str]]:
+    ''' Round robin fixed point of the textbook equations '''
+    flow = adg.flow_view()
+    reads = {n: {name for name, _ in adg.nodes[n].get('read_vars') or []} for n in adg.nodes()}
+    writes = {n: {name for name, _ in adg.nodes[n].get('write_vars') or []} for n in adg.nodes()}
+    live_in: Dict[NodeID, Set[str]] = {n: set() for n in adg.nodes()}
+    changed = True
+    while changed:
+        changed = False
+        for n in adg.nodes():
+            out = set().union(*(live_in[s] for s in flow.successors(n)))
+            new = reads[n] | (out - writes[n])
+            if new != live_in[n]:
+                live_in[n], changed = new, True
+    return live_in
+
+
+class TestLiveness(TestCase):
+
+    codes = [
+        '''
+        int a = 0;
+        int dead = 5;
+        int b = a + 1;
+        while (a < b) {
+            if (a % 2 == 0) { a = a + b; continue; }
+            b = b - 1;
+        }
+        return a;
+        ''',
+        '''
+        int s = 0;
+        for (int i = 0; i < n; i++) {
+            switch (i) { case 1: s += i; break; default: s--; }
+        }
+        try { s = 4; } catch (Exception e) { s = e.code; }
+        return s;
+        ''',
+    ]
+
+    def test_matches_reference(self) -> None:
+        for code in self.codes:
+            adg = parse(code)
+            self.assertEqual(adg.liveness().live_in, reference_live_in(adg))
+
+    def test_dead_stores(self) -> None:
+        adg = parse(self.codes[0])
+        result = adg.liveness()
+        self.assertEqual([var for _, var in result.dead_stores()], ['dead'])
+        [ret] = [n for n, name in adg.nodes(data='name') if name == 'return']
+        self.assertEqual(result.live_in[ret], {'a'})
+        self.assertEqual(result.live_out[ret], set())
+        self.assertEqual(result.max_live(), 2)
+        self.assertIs(adg.liveness(), result)
+
+    def test_batch(self) -> None:
+        problems = [parse(code).liveness_problem() for code in self.codes * 3]
+        for result, problem in zip(solve_batch(problems), problems):
+            reference = solve(problem)
+            self.assertEqual(result.live_in, reference.live_in)
+            self.assertEqual(result.live_out, reference.live_out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+from unittest import TestCase, main
+import networkx as nx  # type: ignore
+from program_graphs.adg.adg import ADG
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.adg.parser.java.control_dependency import CDEP_POST_DOMINANCE
+from program_graphs.adg.reachability import ReachabilityIndex, BITSET, INTERVAL
+from program_graphs.adg.slicing import DependenceIndex
+from program_graphs.adg.tests.utils import dependence_graph
+
+
+def random_adg(size: int, p: float, seed: int) -> ADG:
+    g = nx.gnp_random_graph(size, p, seed=seed, directed=True)
+    adg = ADG()
+    adg.add_nodes_from(g.nodes())
+    for i, (u, v) in enumerate(g.edges()):
+        adg.add_edge(u, v, **{'cdep' if i % 3 == 0 else 'ddep': True})
+    return adg
+
+
+class TestReachability(TestCase):
+
+    def assertIndex(self, adg: ADG, data_only: bool) -> None:
+        closure = nx.transitive_closure(dependence_graph(adg, data_only), reflexive=True)
+        for method in (BITSET, INTERVAL):
+            index = adg.reachability_index(data_only, method)
+            self.assertEqual(index.method, method)
+            for a in adg.nodes():
+                for b in adg.nodes():
+                    self.assertEqual(index.reaches(a, b), closure.has_edge(a, b), (method, a, b))
+
+    def test_random_graphs(self) -> None:
+        for seed in range(20):
+            adg = random_adg(40, 0.02 + seed * 0.005, seed)
+            self.assertIndex(adg, data_only=False)
+            self.assertIndex(adg, data_only=True)
+
+    def test_adg(self) -> None:
+        code = '''
+            int a = 0, b = 1;
+            while (a < 10) {
+                if (b > 0) { b = b + a; }
+                a++;
+            }
+            return b;
+        '''
+        adg = parse(code, cdep_mode=CDEP_POST_DOMINANCE)
+        self.assertIndex(adg, data_only=False)
+        self.assertIndex(adg, data_only=True)
+        [ret] = [n for n, name in adg.nodes(data='name') if name == 'return']
+        self.assertTrue(all(adg.depends_on(ret, node) for node in adg.backward_slice(ret)))
+        self.assertFalse(adg.depends_on(ret, adg.get_exit_node()))
+
+    def test_auto_and_memory(self) -> None:
+        adg = random_adg(200, 0.01, 1)
+        self.assertEqual(adg.reachability_index().method, BITSET)
+        self.assertIs(adg.reachability_index(), adg.reachability_index())
+        bitset = ReachabilityIndex(DependenceIndex(adg), method=BITSET)
+        interval = ReachabilityIndex(DependenceIndex(adg), method=INTERVAL)
+        self.assertGreater(bitset.memory(), 0)
+        self.assertGreater(interval.memory(), 0)
+        with self.assertRaises(ValueError):
+            ReachabilityIndex(DependenceIndex(adg), method='matrix')
+
+
+if __name__ == '__main__':
+    main()
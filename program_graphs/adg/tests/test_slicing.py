@@ -0,0 +1,88 @@
+from typing import Set
+from unittest import TestCase, main
+import networkx as nx  # type: ignore
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.adg.parser.java.control_dependency import CDEP_POST_DOMINANCE
+from program_graphs.adg.slicing import strongly_connected_components
+from program_graphs.adg.tests.utils import dependence_graph, by_name
+from program_graphs.types import NodeID
+
+
+class TestSlicing(TestCase):
+
+    code = '''
+        int a = 0;
+        int b = 1;
+        int c = 2;
+        while (a < 10) {
+            if (b > 0) {
+                c = c + a;
+            }
+            b = a * 2;
+            a++;
+        }
+        return c;
+    '''
+
+    def setUp(self) -> None:
+        self.adg = parse(self.code, cdep_mode=CDEP_POST_DOMINANCE)
+
+    def assertSlices(self, data_only: bool) -> None:
+        g = dependence_graph(self.adg, data_only)
+        for node in self.adg.nodes():
+            expected: Set[NodeID] = nx.ancestors(g, node) | {node}
+            self.assertEqual(self.adg.backward_slice(node, data_only), expected)
+            expected = nx.descendants(g, node) | {node}
+            self.assertEqual(self.adg.forward_slice(node, data_only), expected)
+
+    def test_backward_and_forward(self) -> None:
+        self.assertSlices(data_only=False)
+
+    def test_data_only(self) -> None:
+        self.assertSlices(data_only=True)
+        ret = by_name(self.adg, 'return')
+        self.assertLess(self.adg.thin_slice(ret), self.adg.backward_slice(ret))
+        self.assertIn(by_name(self.adg, 'if_condition'), self.adg.backward_slice(ret))
+        self.assertNotIn(by_name(self.adg, 'if_condition'), self.adg.thin_slice(ret))
+
+    def test_chop(self) -> None:
+        g = dependence_graph(self.adg)
+        nodes = list(self.adg.nodes())
+        for source in nodes[::3]:
+            for sink in nodes[::4]:
+                expected = (nx.descendants(g, source) | {source}) & (nx.ancestors(g, sink) | {sink})
+                self.assertEqual(self.adg.chop(source, sink), expected)
+
+    def test_many_criteria(self) -> None:
+        nodes = list(self.adg.nodes())
+        self.assertEqual(
+            self.adg.backward_slice(nodes[:5]),
+            set().union(*(self.adg.backward_slice(node) for node in nodes[:5]))
+        )
+        for data_only in (False, True):
+            backward = self.adg.backward_slices(nodes, data_only)
+            forward = self.adg.forward_slices(nodes, data_only)
+            for node in nodes:
+                self.assertEqual(backward[node], self.adg.backward_slice(node, data_only))
+                self.assertEqual(forward[node], self.adg.forward_slice(node, data_only))
+
+    def test_index_is_cached(self) -> None:
+        index = self.adg.dependence_index()
+        self.assertIs(self.adg.dependence_index(), index)
+        self.adg.add_edge(by_name(self.adg, 'return'), 1, ddep=True)
+        self.assertIsNot(self.adg.dependence_index(), index)
+        self.assertIn(by_name(self.adg, 'return'), self.adg.backward_slice(1))
+
+    def test_strongly_connected_components(self) -> None:
+        g = nx.gnp_random_graph(60, 0.05, seed=3, directed=True)
+        component, members = strongly_connected_components(60, lambda i: list(g.successors(i)))
+        self.assertEqual(
+            sorted(sorted(scc) for scc in members),
+            sorted(sorted(scc) for scc in nx.strongly_connected_components(g))
+        )
+        for u, v in g.edges():
+            self.assertGreaterEqual(component[u], component[v])
+
+
+if __name__ == '__main__':
+    main()
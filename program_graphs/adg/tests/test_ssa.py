@@ -0,0 +1,117 @@
+from typing import Set
+from unittest import TestCase, main
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.adg.chains import Var
+from program_graphs.adg.ssa import SSA, Version
+from program_graphs.types import NodeID
+
+
+def reaching_writes(ssa: SSA, var: Var, version: Version) -> Set[NodeID]:
+    ''' Statements whose write of `var` flows into `version` through phis '''
+    result: Set[NodeID] = set()
+    seen: Set[Version] = set()
+    work = [version]
+    while len(work) > 0:
+        version = work.pop()
+        if version in seen or version == 0:
+            continue
+        seen.add(version)
+        node = ssa.definition(var, version)
+        assert node is not None
+        phi = ssa.phi(node, var)
+        if phi is not None and phi.version == version:
+            work.extend(phi.operands.values())
+        else:
+            result.add(node)
+    return result
+
+
+class TestSSA(TestCase):
+
+    codes = [
+        '''
+        int a = 0;
+        int b = 1;
+        if (a > b) { a = 2; } else { b = 3; }
+        return a + b;
+        ''',
+        '''
+        int i = 0, s = 0;
+        while (i < 10) {
+            if (i % 2 == 0) { s += i; continue; }
+            for (int j = 0; j < i; j++) { s = s + j; }
+            i++;
+        }
+        return s;
+        ''',
+        '''
+        int x = 0;
+        do {
+            switch (x) {
+                case 1: x = 5; break;
+                case 2: x++;
+                default: x--;
+            }
+        } while (x < 3);
+        try { x = 4; } catch (Exception e) { x = 5; } finally { x++; }
+        return x;
+        ''',
+    ]
+
+    def test_single_assignment(self) -> None:
+        for code in self.codes:
+            ssa = parse(code).ssa()
+            for node, writes in ssa.writes.items():
+                for symbol, version in writes.items():
+                    self.assertEqual(ssa.definition(symbol, version), node)
+            for node, phi in ssa.iter_phis():
+                self.assertEqual(ssa.definition(phi.symbol, phi.version), node)
+                self.assertEqual(ssa.definition(phi.var, phi.version), node)
+                self.assertGreaterEqual(len(phi.operands), 2)
+
+    def test_agrees_with_data_dependencies(self) -> None:
+        for code in self.codes:
+            adg = parse(code)
+            ssa, chains = adg.ssa(), adg.def_use_chains()
+            for node, reads in ssa.reads.items():
+                for symbol, version in reads.items():
+                    self.assertEqual(reaching_writes(ssa, symbol, version), chains.definitions(node, symbol), node)
+
+    def test_phi_placement(self) -> None:
+        adg = parse(self.codes[0])
+        ssa = adg.ssa()
+        [(join, phis)] = ssa.phis.items()
+        self.assertEqual({phi.var for phi in phis.values()}, {'a', 'b'})
+        [ret] = [n for n, name in adg.nodes(data='name') if name == 'return']
+        phi = ssa.phi(join, 'a')
+        assert phi is not None
+        self.assertEqual(ssa.read_version(ret, 'a'), phi.version)
+        self.assertTrue(ssa.is_phi('a', phi.version))
+        self.assertEqual(ssa.versions('a'), 3)
+
+    def test_entry_values_and_cache(self) -> None:
+        adg = parse('y = x + 1; return y;')
+        ssa = adg.ssa()
+        [node] = [n for n in ssa.reads if ssa.read_version(n, 'x') is not None]
+        self.assertEqual(ssa.read_version(node, 'x'), 0)
+        self.assertIsNone(ssa.definition('x', 0))
+        self.assertIs(adg.ssa(), ssa)
+
+    def test_shadowed_variables(self) -> None:
+        adg = parse('''
+            for (int i = 0; i < n; i++) { s += i; }
+            for (int i = 0; i < n; i++) { t += i; }
+        ''')
+        ssa, chains = adg.ssa(), adg.def_use_chains()
+        first, second = chains.symbols('i')
+        self.assertEqual(ssa.versions(first) + ssa.versions(second), ssa.versions('i'))
+        for node, reads in ssa.reads.items():
+            for symbol, version in reads.items():
+                self.assertEqual(reaching_writes(ssa, symbol, version), chains.definitions(node, symbol))
+        for symbol in (first, second):
+            for node in chains.reads(symbol):
+                self.assertNotEqual(ssa.read_version(node, symbol), 0)
+
+
+if __name__ == '__main__':
+    main()
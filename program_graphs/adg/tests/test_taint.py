@@ -0,0 +1,87 @@
+from unittest import TestCase, main
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.adg.taint import TaintEngine, TaintSpec, MethodSpec
+
+
+class TestTaint(TestCase):
+
+    spec = TaintSpec(
+        sources=['getParameter', MethodSpec('doGet', (0,))],
+        sinks=[MethodSpec('executeQuery', (0,)), 'exec'],
+        sanitizers=['escape']
+    )
+
+    def findings(self, code: str):  # type: ignore
+        adg = parse(code)
+        return [
+            (f.source_name, f.sink_name, adg.nodes[f.sink]['ast_node'].text.decode())
+            for f in TaintEngine(self.spec).analyze(adg, code.encode())
+        ]
+
+    def test_flow_through_assignments(self) -> None:
+        code = '''
+            String id = req.getParameter("id");
+            String q = "select * from t where id = " + id;
+            String r = q;
+            db.executeQuery(r);
+        '''
+        self.assertEqual(self.findings(code), [('getParameter', 'executeQuery', 'db.executeQuery(r);')])
+
+    def test_sanitizer(self) -> None:
+        code = '''
+            String id = req.getParameter("id");
+            String safe = escape(id);
+            db.executeQuery(safe);
+            String direct = escape(req.getParameter("x"));
+            exec(direct);
+        '''
+        self.assertEqual(self.findings(code), [])
+
+    def test_positions(self) -> None:
+        code = '''
+            String id = req.getParameter("id");
+            db.executeQuery("select", id);
+            exec("ls", id);
+        '''
+        self.assertEqual(self.findings(code), [('getParameter', 'exec', 'exec("ls", id);')])
+
+    def test_source_inside_sink(self) -> None:
+        self.assertEqual(len(self.findings('exec(req.getParameter("cmd"));')), 1)
+
+    def test_parameters_and_branches(self) -> None:
+        code = '''
+            class Servlet {
+                void doGet(Request req, Response resp) {
+                    String cmd = "ls";
+                    if (resp.ok()) {
+                        cmd = req.body();
+                    }
+                    exec(cmd);
+                    exec(resp.text);
+                }
+            }
+        '''
+        self.assertEqual(self.findings(code), [('doGet#0', 'exec', 'exec(cmd);')])
+
+    def test_parameter_position(self) -> None:
+        code = '''
+            class A {
+                void doGet(String a, String b) {
+                    exec(b);
+                    exec(a);
+                }
+            }
+        '''
+        self.assertEqual(self.findings(code), [('doGet#0', 'exec', 'exec(a);')])
+
+    def test_batch(self) -> None:
+        methods = ['exec(getParameter("a"));', 'int x = 1; exec(x);', 'String s = getParameter(""); exec(s);']
+        report = TaintEngine(self.spec).analyze_batch((parse(code), code.encode()) for code in methods)
+        self.assertEqual([len(f) for f in report.findings], [1, 0, 1])
+        self.assertEqual(report.methods, 3)
+        self.assertGreater(report.methods_per_second(), 0)
+        self.assertIn('methods/s', str(report))
+
+
+if __name__ == '__main__':
+    main()
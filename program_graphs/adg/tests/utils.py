@@ -0,0 +1,19 @@
+import networkx as nx  # type: ignore
+from program_graphs.adg.adg import ADG
+from program_graphs.types import NodeID
+
+
+def dependence_graph(adg: ADG, data_only: bool = False) -> nx.DiGraph:
+    ''' Control and data dependency edges of `adg` as a plain graph, the reference for index tests '''
+    g = nx.DiGraph()
+    g.add_nodes_from(adg.nodes())
+    g.add_edges_from(
+        (u, v) for u, v, data in adg.edges(data=True)
+        if data.get('ddep') is True or (not data_only and data.get('cdep') is True)
+    )
+    return g
+
+
+def by_name(adg: ADG, name: str) -> NodeID:
+    [node] = [n for n, data in adg.nodes(data=True) if data.get('name') == name]
+    return node  # type: ignore
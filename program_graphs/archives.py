@@ -0,0 +1,64 @@
+''' Java sources read straight out of zip, jar and tar (plain or compressed) archives.
+
+    Entries are read one at a time, in archive order, without extracting anything to disk:
+    a tar is read as a stream, so a `.tar.gz` is decompressed once from front to back.
+    The bytes of an entry go to `program_graphs.files.parse_methods` as they are.
+'''
+import tarfile
+import zipfile
+from typing import Any, Collection, Iterator, Optional, Tuple
+from program_graphs.files import MethodGraph, parse_methods
+from program_graphs.utils.budget import Budget
+from program_graphs.utils.profiling import ParseStats, phase
+
+JAVA_SUFFIXES = ['.java']
+
+
+def _zip_entries(path: str, suffixes: Collection[str]) -> Iterator[Tuple[str, bytes]]:
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and info.filename.endswith(tuple(suffixes)):
+                yield info.filename, archive.read(info)
+
+
+def _tar_entries(path: str, suffixes: Collection[str]) -> Iterator[Tuple[str, bytes]]:
+    with tarfile.open(path, 'r|*') as archive:
+        for info in archive:
+            if not info.isfile() or not info.name.endswith(tuple(suffixes)):
+                continue
+            entry = archive.extractfile(info)
+            if entry is not None:
+                yield info.name, entry.read()
+
+
+def source_entries(path: str, suffixes: Collection[str] = JAVA_SUFFIXES) -> Iterator[Tuple[str, bytes]]:
+    ''' (name, bytes) of every file entry of the archive at `path` whose name ends with one of
+        `suffixes`. Zip and jar archives are told from tar archives by their content '''
+    if zipfile.is_zipfile(path):
+        return _zip_entries(path, suffixes)
+    if tarfile.is_tarfile(path):
+        return _tar_entries(path, suffixes)
+    raise ValueError(f'Unknown archive format: {path}')
+
+
+def parse_archive(
+    path: str,
+    stats: Optional[ParseStats] = None,
+    budget: Optional[Budget] = None,
+    suffixes: Collection[str] = JAVA_SUFFIXES,
+    **options: Any
+) -> Iterator[Tuple[str, MethodGraph]]:
+    ''' (entry name, graph) of every method of the Java sources in the archive at `path`,
+        see `parse_methods`. Only the entry being parsed is held in memory '''
+    entries = source_entries(path, suffixes)
+    while True:
+        with phase(stats, 'read_entry'):
+            entry = next(entries, None)
+        if entry is None:
+            return
+        name, source_code = entry
+        if stats is not None:
+            stats.count('files')
+            stats.count('bytes', len(source_code))
+        for graph in parse_methods(source_code, stats, budget, **options):
+            yield name, graph
@@ -0,0 +1,72 @@
+from typing import Collection, Optional
+from program_graphs.types import ASTNode
+from program_graphs.cfg.cfg import CFG
+from program_graphs.cfg.fcfg import FCFG, mk_fcfg_from_cfg
+from program_graphs.cfg.parser.java.parser import mk_cfg
+from program_graphs.ddg.ddg import DDG, mk_ddg_from_fcfg
+from program_graphs.ddg.parser.java.queries import ReadWriteIndex
+from program_graphs.adg.adg import ADG
+from program_graphs.adg.parser.java.parser import parse_from_ast
+from program_graphs.adg.parser.java.layers import LAYERS, LAYER_DATA_DEPENDENCE, add_layer
+from program_graphs.utils.profiling import ParseStats, phase
+from program_graphs.utils.budget import Budget, budget_scope, mark_truncated
+from program_graphs.utils.source import Buffer, Source, as_buffer, parse_java_tree
+
+KIND_CFG = 'cfg'
+KIND_FCFG = 'fcfg'
+KIND_DDG = 'ddg'
+KIND_ADG = 'adg'
+KINDS = [KIND_CFG, KIND_FCFG, KIND_DDG, KIND_ADG]
+
+
+class GraphBundle:
+    ''' Graphs of one method derived from a single syntax tree. A graph kind which was not
+        asked for, and is not needed to derive one which was, is None '''
+
+    def __init__(self, ast: ASTNode, source_code: Buffer) -> None:
+        self.ast = ast
+        self.source_code = source_code
+        self.index = ReadWriteIndex(ast, source_code)  # read and written identifiers, shared by DDG and ADG
+        self.cfg: Optional[CFG] = None
+        self.fcfg: Optional[FCFG] = None
+        self.ddg: Optional[DDG] = None
+        self.adg: Optional[ADG] = None
+
+
+def parse_java(
+    source_code: Source,
+    kinds: Collection[str] = KINDS,
+    stats: Optional[ParseStats] = None,
+    budget: Optional[Budget] = None
+) -> GraphBundle:
+    ''' Parse `source_code` once and build the graph `kinds` ('cfg', 'fcfg', 'ddg', 'adg') from
+        the same tree. Read and written variables are found once, by one query over the tree.
+        The budget is shared by all of the graphs, a truncated one is marked as such '''
+    for kind in kinds:
+        if kind not in KINDS:
+            raise ValueError(f'Unknown graph kind: {kind}')
+    source_code_bytes = as_buffer(source_code)
+    with phase(stats, 'tree_sitter'):
+        ast = parse_java_tree(source_code_bytes)
+    with phase(stats, 'read_write_index'):
+        bundle = GraphBundle(ast, source_code_bytes)
+    with budget_scope(budget):
+        if len({KIND_CFG, KIND_FCFG, KIND_DDG} & set(kinds)) > 0:
+            with phase(stats, 'mk_cfg'):
+                bundle.cfg = mk_cfg(ast, source=source_code_bytes)
+        if len({KIND_FCFG, KIND_DDG} & set(kinds)) > 0:
+            assert bundle.cfg is not None
+            with phase(stats, 'mk_fcfg'):
+                bundle.fcfg = mk_fcfg_from_cfg(bundle.cfg)
+        if KIND_DDG in kinds:
+            assert bundle.fcfg is not None
+            with phase(stats, 'mk_ddg'):
+                bundle.ddg = mk_ddg_from_fcfg(bundle.fcfg, source_code_bytes, bundle.index)
+        if KIND_ADG in kinds:
+            layers = [layer for layer in LAYERS if layer != LAYER_DATA_DEPENDENCE]
+            bundle.adg = parse_from_ast(ast, source_code_bytes, stats, budget, layers=layers)
+            add_layer(bundle.adg, LAYER_DATA_DEPENDENCE, source_code_bytes, stats, budget, bundle.index)
+    for graph in (bundle.cfg, bundle.ddg, bundle.adg):
+        if graph is not None:
+            mark_truncated(graph, budget)
+    return bundle
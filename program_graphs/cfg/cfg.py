@@ -7,11 +7,12 @@ import networkx as nx  # type: ignore
 from program_graphs.cfg.types import JumpKind
 from program_graphs.types import NodeID
 from program_graphs.cfg.types import Label
+from program_graphs.utils.dominance import ControlFlowAnalyses
 
 BasicBlock = List[Node]
 
 
-class CFG(nx.DiGraph):
+class CFG(ControlFlowAnalyses):
 
     def __init__(self, block: BasicBlock = None):
         super().__init__()
@@ -49,6 +50,12 @@ class CFG(nx.DiGraph):
     def exit_node(self) -> NodeID:
         return self.exit_nodes()[0][0]
 
+    def flow_entry(self) -> NodeID:
+        return self.entry_node()
+
+    def flow_exit(self) -> NodeID:
+        return self.exit_node()
+
     def entry_nodes(self) -> List[Tuple[NodeID, Label]]:
         return list(
             [(node, nx.get_node_attributes(self, 'name').get(node)) for node, in_degre in self.in_degree() if in_degre == 0]
@@ -1,8 +1,24 @@
 
-from typing import List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
 from program_graphs.types import NodeID, Edge
 from program_graphs.cfg import CFG
 import networkx as nx  # type: ignore
+from program_graphs.utils.budget import BudgetExceeded, current_budget
+
+_contract_edges: ContextVar[bool] = ContextVar('contract_edges', default=True)
+
+
+@contextmanager
+def without_edge_contraction() -> Iterator[None]:
+    ''' CFGs built in this scope keep their blocks apart. For a CFG which is only expanded to
+        statements (an FCFG) contraction changes nothing, and deciding one enumerates paths '''
+    token = _contract_edges.set(False)
+    try:
+        yield
+    finally:
+        _contract_edges.reset(token)
 
 
 def find_edge_to_contract(cfg: CFG) -> Optional[Edge]:
@@ -13,11 +29,22 @@ def find_edge_to_contract(cfg: CFG) -> Optional[Edge]:
 
 
 def edge_contraction_all(cfg: CFG) -> CFG:
-    mb_edge = find_edge_to_contract(cfg)
-    if mb_edge is None:
+    ''' Contract edges while possible. If the budget of the current parse runs out,
+        the partially contracted graph is returned: it is still a valid, finer CFG '''
+    if not _contract_edges.get():
         return cfg
-    cfg = edge_contraction(cfg, mb_edge)
-    return edge_contraction_all(cfg)
+    budget = current_budget()
+    try:
+        if budget is not None:
+            budget.check_nodes(len(cfg))
+        mb_edge = find_edge_to_contract(cfg)
+        while mb_edge is not None:
+            cfg = edge_contraction(cfg, mb_edge)
+            mb_edge = find_edge_to_contract(cfg)
+    except BudgetExceeded as error:
+        assert budget is not None
+        budget.stop(error)
+    return cfg
 
 
 def rewire_predecessors(cfg: CFG, from_node: NodeID, to_node: NodeID) -> None:
@@ -69,8 +96,11 @@ def is_possible_to_contract(cfg: CFG, edge: Edge) -> bool:
         if node == node_from:
             return False
 
+    budget = current_budget()
     all_paths = nx.all_simple_paths(cfg, entry, exit)
     for path in all_paths:
+        if budget is not None:
+            budget.spend_paths()
         if node_from in path and node_to not in path:
             return False
         if node_to in path and node_from not in path:
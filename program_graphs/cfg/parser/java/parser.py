@@ -1,87 +1,37 @@
-import os
 from program_graphs.utils.graph import filter_nodes
-from typing import Any, List, Optional
-from tree_sitter import Language, Parser  # type: ignore
+from typing import Any, Callable, List, Optional
 from program_graphs.cfg import CFG
 from program_graphs.cfg.operators import mk_empty_cfg, combine
 from program_graphs.cfg.operators import manage_jumps, eliminate_redundant_nodes
-from program_graphs.cfg.parser.java.utils import get_identifier, get_nodes_after_colon
+from program_graphs.cfg.parser.java.utils import get_identifier, get_nodes_after_colon, get_nodes_after_arrow
 from program_graphs.cfg.parser.java.switch_stmt import get_switch_block_label, get_switch_label
 from program_graphs.cfg.types import Node, JumpKind, Label
 from program_graphs.cfg.parser.java.break_stmt import mk_cfg_break
 from program_graphs.cfg.parser.java.continue_stmt import mk_cfg_continue
 from program_graphs.cfg.parser.java.return_stmt import mk_cfg_return
-from program_graphs.utils import get_project_root
-
-
-def parse(source_code: str) -> CFG:
-    Language.build_library(
-        # Store the library in the `build` directory
-        'build/my-languages.so',
-
-        # Include one or more languages
-        [
-            os.path.join(get_project_root(), "tree-sitter-java")
-        ]
-    )
-    JAVA_LANGUAGE = Language('build/my-languages.so', 'java')
-    parser = Parser()
-    parser.set_language(JAVA_LANGUAGE)
-    source_code_bytes = bytes(source_code, 'utf-8')
-    ast = parser.parse(source_code_bytes)
-    return mk_cfg(ast.root_node, source=source_code_bytes)
+from program_graphs.cfg.parser.java.throw_stmt import mk_cfg_throw
+from program_graphs.cfg.parser.java.yield_stmt import mk_cfg_yield
+from program_graphs.utils.dispatch import Dispatcher
+from program_graphs.utils.budget import Budget, budget_scope, mark_truncated
+from program_graphs.utils.source import Buffer, Source, as_buffer, parse_java_tree
+
+
+def parse(source_code: Source, budget: Optional[Budget] = None) -> CFG:
+    source_code_bytes = as_buffer(source_code)
+    ast = parse_java_tree(source_code_bytes)
+    with budget_scope(budget):
+        cfg = mk_cfg(ast, source=source_code_bytes)
+    mark_truncated(cfg, budget)
+    return cfg
 
 
-# flake8: noqa: C901
 def mk_cfg(node: Optional[Node], **kwargs: Any) -> CFG:
     if node is None:
         return mk_empty_cfg()
+    return CFG_BUILDERS.lookup(node.type)(node, **kwargs)
 
-    if node.type == 'for_statement':
-        return mk_cfg_for(node, **kwargs)
-
-    if node.type == 'while_statement':
-        return mk_cfg_while(node, **kwargs)
-
-    if node.type == 'do_statement':
-        return mk_cfg_do_while(node, **kwargs)
-
-    if node.type == 'block':
-        return mk_cfg_block(node, **kwargs)
-
-    if node.type == 'program':
-        return mk_cfg_block(node, **kwargs)
-
-    if node.type == 'if_statement':
-        return mk_cfg_if(node, **kwargs)
-
-    if node.type == 'continue_statement':
-        return mk_cfg_continue(node, **kwargs)
-
-    if node.type == 'break_statement':
-        return mk_cfg_break(node, **kwargs)
-
-    if node.type == 'return_statement':
-        return mk_cfg_return(node)
-
-    if node.type == 'switch_expression':
-        return mk_cfg_switch(node, **kwargs)
-
-    if node.type == 'labeled_statement':
-        return mk_cfg_labeled_statement(node, **kwargs)
-
-    if node.type == 'method_declaration':
-        return mk_cfg_method_declaration(node, **kwargs)
-
-    if node.type == 'try_statement':
-        return mk_cfg_try_catch(node, **kwargs)
-
-    if node.type == 'try_with_resources_statement':
-        return mk_cfg_try_with_resources(node, **kwargs)
-
-    if node.type == 'synchronized_statement':
-        return mk_cfg_synchronized(node, **kwargs)
 
+def mk_cfg_statement(node: Node, **kwargs: Any) -> CFG:
     cfg = CFG()
     cfg.add_node([node], 'statement')
     return cfg
@@ -106,7 +56,7 @@ def mk_cfg_block(node: Node, **kwargs: Any) -> CFG:
     return eliminate_redundant_nodes(cfg)
 
 
-def mk_cfg_for(node: Node, label: Label = None, source: bytes = None) -> CFG:
+def mk_cfg_for(node: Node, label: Label = None, source: Optional[Buffer] = None) -> CFG:
     init = mk_cfg(node.child_by_field_name('init'))
     condition = mk_cfg(node.child_by_field_name('condition'))
     body = mk_cfg(node.child_by_field_name('body'), source=source)
@@ -211,7 +161,44 @@ def mk_cfg_switch_default_group(node: Node, **kwargs: Any) -> CFG:
     return cfg
 
 
+def mk_cfg_switch_rules(rules: List[Node], **kwargs: Any) -> CFG:
+    default_rules = [r for r in rules if get_switch_block_label(r) == 'default']
+    case_rules = [r for r in rules if get_switch_block_label(r) == 'case']
+    cfg = mk_empty_cfg()
+    last_id = cfg.assign_id(cfg.entry_node())
+    body_exit_ids = []
+    for rule in case_rules + default_rules:
+        body = mk_cfg_of_list_of_nodes(get_nodes_after_arrow(rule), **kwargs)
+        body_entry_id = body.assign_id(body.entry_node())
+        body_exit_ids.append(body.assign_id(body.exit_node()))
+        if get_switch_block_label(rule) == 'case':
+            condition = CFG([get_switch_label(rule)])
+            condition_id = condition.assign_id(condition.entry_node())
+            cfg = combine(cfg, condition, cfg.find_node_by_id(last_id))
+            cfg = combine(cfg, body, cfg.find_node_by_id(condition_id))
+            cfg.set_node_name(cfg.find_node_by_id(condition_id), 'case')
+            last_id = condition_id
+        else:
+            cfg = combine(cfg, body, cfg.find_node_by_id(last_id))
+            cfg.set_node_name(cfg.find_node_by_id(body_entry_id), 'default')
+            last_id = body_exit_ids[-1]
+
+    exit = mk_empty_cfg()
+    exit_id = exit.assign_id(exit.entry_node())
+    cfg = combine(cfg, exit, cfg.find_node_by_id(last_id))
+    for body_exit_id in body_exit_ids:
+        cfg.add_edge(cfg.find_node_by_id(body_exit_id), cfg.find_node_by_id(exit_id))
+    cfg.set_node_name(cfg.find_node_by_id(exit_id), 'exit')
+    cfg.add_possible_jump(cfg.find_node_by_id(exit_id), None, JumpKind.BREAK)
+    manage_jumps(cfg)
+    cfg = eliminate_redundant_nodes(cfg)
+    return cfg
+
+
 def mk_cfg_switch(node: Node, **kwargs: Any) -> CFG:
+    rules = [n for n in node.child_by_field_name('body').children if n.type == 'switch_rule']
+    if len(rules) > 0:
+        return mk_cfg_switch_rules(rules, **kwargs)
     groups = [n for n in node.child_by_field_name('body').children if n.type == 'switch_block_statement_group']
     default_groups = [g for g in groups if get_switch_block_label(g) == 'default']
     case_groups = [g for g in groups if get_switch_block_label(g) == 'case']
@@ -240,7 +227,7 @@ def mk_cfg_labeled_statement(node: Node, **kwargs: Any) -> CFG:
     return cfg
 
 
-def mk_cfg_while(node: Node, label: Label = None, source: bytes = None) -> CFG:
+def mk_cfg_while(node: Node, label: Label = None, source: Optional[Buffer] = None) -> CFG:
     start = mk_empty_cfg()
     condition = mk_cfg(node.child_by_field_name('condition'))
     body = mk_cfg(node.child_by_field_name('body'), source=source)
@@ -249,7 +236,7 @@ def mk_cfg_while(node: Node, label: Label = None, source: bytes = None) -> CFG:
     condition_id = condition.assign_id(condition.entry_node())
     body_id = body.assign_id(body.exit_node())
     exit_id = exit.assign_id(exit.entry_node())
-    
+
     cfg = combine(start, condition)
     cfg = combine(cfg, body)
     cfg = combine(cfg, exit, cfg.find_node_by_id(condition_id))
@@ -267,7 +254,8 @@ def mk_cfg_while(node: Node, label: Label = None, source: bytes = None) -> CFG:
     cfg = eliminate_redundant_nodes(cfg)
     return cfg
 
-def mk_cfg_do_while(node: Node, label: Label = None, source: bytes = None) -> CFG:
+
+def mk_cfg_do_while(node: Node, label: Label = None, source: Optional[Buffer] = None) -> CFG:
     start = mk_empty_cfg()
     condition = mk_cfg(node.child_by_field_name('condition'))
     body = mk_cfg(node.child_by_field_name('body'), source=source)
@@ -276,7 +264,7 @@ def mk_cfg_do_while(node: Node, label: Label = None, source: bytes = None) -> CF
     condition_id = condition.assign_id(condition.exit_node())
     body_id = body.assign_id(body.entry_node())
     exit_id = exit.assign_id(exit.entry_node())
-    
+
     cfg = combine(start, body)
     cfg = combine(cfg, condition)
     cfg = combine(cfg, exit)
@@ -293,7 +281,8 @@ def mk_cfg_do_while(node: Node, label: Label = None, source: bytes = None) -> CF
     cfg = eliminate_redundant_nodes(cfg)
     return cfg
 
-def mk_cfg_method_declaration(node: Node, label: Label = None, source: bytes = None) -> CFG:
+
+def mk_cfg_method_declaration(node: Node, label: Label = None, source: Optional[Buffer] = None) -> CFG:
     body = mk_cfg(node.child_by_field_name('body'), source=source)
     formal_params = mk_cfg_of_list_of_nodes(
         [n for n in node.child_by_field_name('parameters').children if n.type == 'formal_parameter'],
@@ -312,10 +301,12 @@ def mk_cfg_catch(node: Node, **kwargs: Any) -> CFG:
         mk_cfg(node.child_by_field_name('body'), **kwargs)
     ])
 
+
 def mk_cfg_finally(node: Node, **kwargs: Any) -> CFG:
     final_body_node = [ch for ch in node.children if ch.type == 'block'][0]
     return mk_cfg(final_body_node, **kwargs)
 
+
 def mk_cfg_try_catch(node: Node, resources: Optional[Node] = [], **kwargs: Any) -> CFG:
     try_body = combine_list([
         mk_cfg_of_list_of_nodes(resources or []),
@@ -325,7 +316,7 @@ def mk_cfg_try_catch(node: Node, resources: Optional[Node] = [], **kwargs: Any)
     catches = [mk_cfg_catch(node, **kwargs) for node in catch_nodes]
     if len(catches) == 0:
         catches = [mk_empty_cfg()]
- 
+
     final_nodes = [ch for ch in node.children if ch.type == 'finally_clause']
     if len(final_nodes) > 0:
         final = mk_cfg_finally(final_nodes[0])
@@ -343,7 +334,7 @@ def mk_cfg_try_catch(node: Node, resources: Optional[Node] = [], **kwargs: Any)
         cfg = combine(cfg, catch_cfg, cfg.find_node_by_id(try_id), catch_cfg.find_node_by_id(catch_entry_id))
 
     cfg = combine(cfg, final, cfg.find_node_by_id(catch_exit_ids[0]))
-    for catch_exit_id in catch_exit_ids[1: ]:
+    for catch_exit_id in catch_exit_ids[1:]:
         cfg.add_edge(cfg.find_node_by_id(catch_exit_id), cfg.find_node_by_id(final_id))
 
     cfg.find_node_by_id(final_id)
@@ -355,9 +346,32 @@ def mk_cfg_try_catch(node: Node, resources: Optional[Node] = [], **kwargs: Any)
     cfg = eliminate_redundant_nodes(cfg)
     return cfg
 
+
 def mk_cfg_try_with_resources(node: Node, **kwargs: Any) -> CFG:
     resources = filter_nodes(node.child_by_field_name('resources'), ['resource'])
     return mk_cfg_try_catch(node, resources, **kwargs)
 
+
 def mk_cfg_synchronized(node: Node, **kwargs: Any) -> CFG:
     return mk_cfg(node.child_by_field_name('body'), **kwargs)
+
+
+CFG_BUILDERS: Dispatcher[Callable[..., CFG]] = Dispatcher({
+    'for_statement': mk_cfg_for,
+    'while_statement': mk_cfg_while,
+    'do_statement': mk_cfg_do_while,
+    'block': mk_cfg_block,
+    'program': mk_cfg_block,
+    'if_statement': mk_cfg_if,
+    'continue_statement': mk_cfg_continue,
+    'break_statement': mk_cfg_break,
+    'return_statement': mk_cfg_return,
+    'throw_statement': mk_cfg_throw,
+    'yield_statement': mk_cfg_yield,
+    'switch_expression': mk_cfg_switch,
+    'labeled_statement': mk_cfg_labeled_statement,
+    'method_declaration': mk_cfg_method_declaration,
+    'try_statement': mk_cfg_try_catch,
+    'try_with_resources_statement': mk_cfg_try_with_resources,
+    'synchronized_statement': mk_cfg_synchronized,
+}, default=mk_cfg_statement)
@@ -1,8 +1,9 @@
+from typing import Any
 from program_graphs.cfg import CFG
 from program_graphs.cfg.types import Node
 
 
-def mk_cfg_return(node: Node) -> CFG:
+def mk_cfg_return(node: Node, **kwargs: Any) -> CFG:
     cfg = CFG()
     stmt = cfg.add_node([node], 'return')
     exit = cfg.add_node([], 'exit')
@@ -0,0 +1,50 @@
+from typing import Any
+from unittest import TestCase, main
+from tree_sitter import Language, Parser  # type: ignore
+from program_graphs.cfg import CFG
+from program_graphs.cfg.parser.java.parser import CFG_BUILDERS, mk_cfg
+from program_graphs.cfg.types import Node
+
+
+class TestDispatch(TestCase):
+
+    def get_parser(self) -> Parser:
+        Language.build_library(
+            'build/my-languages.so',
+            [
+                './tree-sitter-java'
+            ]
+        )
+        JAVA_LANGUAGE = Language('build/my-languages.so', 'java')
+        parser = Parser()
+        parser.set_language(JAVA_LANGUAGE)
+        return parser
+
+    def test_unknown_statement_falls_back_to_default(self) -> None:
+        parser = self.get_parser()
+        node = parser.parse(b"assert a > 0;").root_node.children[0]
+        self.assertNotIn('assert_statement', CFG_BUILDERS)
+        cfg = mk_cfg(node)
+        self.assertEqual(len(cfg.nodes()), 1)
+        self.assertEqual(cfg.get_node_name(0), 'statement')
+
+    def test_register_new_statement_kind(self) -> None:
+        parser = self.get_parser()
+        node = parser.parse(b"assert a > 0;").root_node.children[0]
+
+        @CFG_BUILDERS.register('assert_statement')
+        def mk_cfg_assert(node: Node, **kwargs: Any) -> CFG:
+            cfg = CFG()
+            cfg.add_node([node], 'assert')
+            return cfg
+
+        try:
+            cfg = mk_cfg(node)
+            self.assertEqual(cfg.get_node_name(0), 'assert')
+        finally:
+            CFG_BUILDERS.unregister('assert_statement')
+        self.assertEqual(mk_cfg(node).get_node_name(0), 'statement')
+
+
+if __name__ == '__main__':
+    main()
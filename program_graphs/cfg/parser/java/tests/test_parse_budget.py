@@ -0,0 +1,53 @@
+from time import perf_counter
+from unittest import TestCase, main
+from program_graphs.cfg.parser.java.parser import parse
+from program_graphs.ddg.ddg import mk_ddg
+from program_graphs.utils.budget import Budget, BudgetExceeded, is_truncated
+
+
+def sequential_branches(n: int) -> str:
+    ''' A method with 2^n control flow paths '''
+    branches = '\n'.join(f'if (x > {i}) {{ x = x + {i}; }} else {{ x = x - {i}; }}' for i in range(n))
+    return f'int f(int x) {{ {branches} return x; }}'
+
+
+class TestParseBudget(TestCase):
+
+    def test_parse_within_budget(self) -> None:
+        code = sequential_branches(2)
+        cfg = parse(code, Budget(max_paths=1000, timeout=60))
+        self.assertFalse(is_truncated(cfg))
+        self.assertEqual(len(cfg), len(parse(code)))
+
+    def test_paths_budget_raises(self) -> None:
+        start = perf_counter()
+        with self.assertRaises(BudgetExceeded) as ctx:
+            parse(sequential_branches(16), Budget(max_paths=200))
+        self.assertEqual(ctx.exception.resource, 'paths')
+        self.assertLess(perf_counter() - start, 5)
+
+    def test_nodes_budget_truncates(self) -> None:
+        code = sequential_branches(3)
+        cfg = parse(code, Budget(max_nodes=1, truncate=True))
+        self.assertTrue(is_truncated(cfg))
+        self.assertGreater(len(cfg), len(parse(code)))
+
+    def test_budget_is_reset_per_parse(self) -> None:
+        budget = Budget(max_paths=100)
+        for _ in range(5):
+            parse(sequential_branches(2), budget)
+        self.assertLessEqual(budget.paths, 100)
+
+    def test_ddg_budget(self) -> None:
+        code = 'int a = 0; int b = a; int c = b; int d = c;'
+        cfg = parse(code)
+        with self.assertRaises(BudgetExceeded):
+            mk_ddg(cfg, code, Budget(max_paths=1))
+        ddg = mk_ddg(cfg, code, Budget(max_paths=1, truncate=True))
+        self.assertTrue(is_truncated(ddg))
+        self.assertLess(len(ddg.edges()), len(mk_ddg(cfg, code).edges()))
+        self.assertFalse(is_truncated(mk_ddg(cfg, code, Budget(max_paths=1000))))
+
+
+if __name__ == '__main__':
+    main()
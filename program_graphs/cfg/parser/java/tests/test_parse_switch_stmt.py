@@ -94,6 +94,76 @@ class TestParseSwitch(TestCase):
             ])
         ))
 
+    def test_cfg_switch_rules(self) -> None:
+        parser = self.get_parser()
+        bts = b"""
+            switch (i) {
+                case 1 -> a = 1;
+                case 2 -> { a = 2; }
+                default -> a = 0;
+            }
+        """
+        switch_node = parser.parse(bts).root_node.children[0]
+        assert switch_node.type == 'switch_expression'
+        cfg = mk_cfg_switch(switch_node)
+        self.assertTrue(nx.algorithms.is_isomorphic(
+            cfg,
+            nx.DiGraph([
+                ("case_1", "body_1"),
+                ("body_1", "exit"),
+                ("case_1", "case_2"),
+                ("case_2", "body_2"),
+                ("body_2", "exit"),
+                ("case_2", "default"),
+                ("default", "exit")
+            ])
+        ))
+
+    def test_cfg_switch_rules_without_default(self) -> None:
+        parser = self.get_parser()
+        bts = b"""
+            switch (i) {
+                case 1 -> a = 1;
+                case 2 -> a = 2;
+            }
+        """
+        switch_node = parser.parse(bts).root_node.children[0]
+        cfg = mk_cfg_switch(switch_node)
+        self.assertTrue(nx.algorithms.is_isomorphic(
+            cfg,
+            nx.DiGraph([
+                ("case_1", "body_1"),
+                ("body_1", "exit"),
+                ("case_1", "case_2"),
+                ("case_2", "body_2"),
+                ("body_2", "exit"),
+                ("case_2", "exit")
+            ])
+        ))
+
+    def test_cfg_switch_rules_yield(self) -> None:
+        parser = self.get_parser()
+        bts = b"""
+            switch (i) {
+                case 1 -> { yield 1; }
+                default -> { if (a) { yield 2; } yield 3; }
+            }
+        """
+        switch_node = parser.parse(bts).root_node.children[0]
+        cfg = mk_cfg_switch(switch_node)
+        self.assertTrue(nx.algorithms.is_isomorphic(
+            cfg,
+            nx.DiGraph([
+                ("case_1", "yield_1"),
+                ("yield_1", "exit"),
+                ("case_1", "if"),
+                ("if", "yield_2"),
+                ("yield_2", "exit"),
+                ("if", "yield_3"),
+                ("yield_3", "exit")
+            ])
+        ))
+
 
 if __name__ == '__main__':
     main()
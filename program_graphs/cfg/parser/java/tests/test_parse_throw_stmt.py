@@ -0,0 +1,50 @@
+from unittest import TestCase, main
+from tree_sitter import Language, Parser  # type: ignore
+from program_graphs.cfg.parser.java.parser import mk_cfg_throw, mk_cfg
+import networkx as nx  # type: ignore
+
+
+class TestParseThrow(TestCase):
+
+    def get_parser(self) -> Parser:
+        Language.build_library(
+            'build/my-languages.so',
+            [
+                './tree-sitter-java'
+            ]
+        )
+        JAVA_LANGUAGE = Language('build/my-languages.so', 'java')
+        parser = Parser()
+        parser.set_language(JAVA_LANGUAGE)
+        return parser
+
+    def test_cfg_throw(self) -> None:
+        parser = self.get_parser()
+        bts = b"""
+            throw new IllegalStateException();
+        """
+        node = parser.parse(bts).root_node.children[0]
+        self.assertEqual(node.type, 'throw_statement')
+        cfg = mk_cfg_throw(node)
+        self.assertEqual(len(cfg.return_nodes), 1)
+
+    def test_cfg_throw_as_return(self) -> None:
+        parser = self.get_parser()
+        cfg_throw = mk_cfg(parser.parse(b"""
+            while (a) {
+                if (b) { throw new IllegalStateException(); }
+                c = 1;
+            }
+        """).root_node)
+        cfg_return = mk_cfg(parser.parse(b"""
+            while (a) {
+                if (b) { return; }
+                c = 1;
+            }
+        """).root_node)
+        self.assertEqual(len(cfg_throw.return_nodes), 1)
+        self.assertTrue(nx.algorithms.is_isomorphic(cfg_throw, cfg_return))
+
+
+if __name__ == '__main__':
+    main()
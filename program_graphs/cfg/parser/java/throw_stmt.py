@@ -0,0 +1,13 @@
+from typing import Any
+from program_graphs.cfg import CFG
+from program_graphs.cfg.types import Node
+
+
+def mk_cfg_throw(node: Node, **kwargs: Any) -> CFG:
+    ''' Exceptions are not traced to their handlers, so `throw` leaves the method like `return` '''
+    cfg = CFG()
+    stmt = cfg.add_node([node], 'throw')
+    exit = cfg.add_node([], 'exit')
+    cfg.add_edge(stmt, exit)
+    cfg.add_return_node(stmt)
+    return cfg
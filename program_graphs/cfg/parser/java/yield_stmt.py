@@ -0,0 +1,13 @@
+from typing import Any
+from program_graphs.cfg import CFG
+from program_graphs.cfg.types import Node
+
+
+def mk_cfg_yield(node: Node, **kwargs: Any) -> CFG:
+    ''' `yield` leaves the enclosing switch expression the same way an unlabeled `break` does '''
+    cfg = CFG()
+    stmt = cfg.add_node([node], 'yield')
+    exit = cfg.add_node([], 'exit')
+    cfg.add_edge(stmt, exit)
+    cfg.add_break_node(stmt, None)
+    return cfg
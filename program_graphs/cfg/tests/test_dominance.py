@@ -0,0 +1,84 @@
+from typing import Dict
+from unittest import TestCase, main
+from program_graphs.cfg.parser.java import parse
+from program_graphs.utils.dominance import DominatorTree, dominance_frontiers
+from program_graphs.utils.dominance import immediate_dominators, immediate_post_dominators
+import networkx as nx  # type: ignore
+
+
+def strict(idom: Dict[int, int]) -> Dict[int, int]:
+    ''' networkx stopped mapping the root to itself at some version '''
+    return {node: parent for node, parent in idom.items() if node != parent}
+
+
+class TestDominance(TestCase):
+
+    def random_graphs(self, count: int = 300):  # type: ignore
+        for seed in range(count):
+            g = nx.gnp_random_graph(2 + seed % 15, 0.2, directed=True, seed=seed)
+            g.add_edges_from((i, i + 1) for i in range(0, len(g) - 1, 3))
+            yield g
+
+    def test_dominators_agree_with_networkx(self) -> None:
+        for g in self.random_graphs():
+            idom = immediate_dominators(g, 0)
+            self.assertEqual(strict(idom), strict(nx.immediate_dominators(g, 0)))
+            self.assertEqual(dominance_frontiers(g, idom), nx.dominance_frontiers(g, 0))
+
+    def test_post_dominators_agree_with_networkx(self) -> None:
+        for g in self.random_graphs():
+            exit = len(g) - 1
+            ipdom = immediate_post_dominators(g, exit)
+            self.assertEqual(strict(ipdom), strict(nx.immediate_dominators(g.reverse(), exit)))
+            self.assertEqual(
+                dominance_frontiers(g, ipdom, post=True),
+                nx.dominance_frontiers(g.reverse(), exit)
+            )
+
+    def test_dominator_tree_queries(self) -> None:
+        g = nx.DiGraph([(1, 2), (2, 3), (2, 4), (3, 5), (4, 5)])
+        tree = DominatorTree(immediate_dominators(g, 1))
+        self.assertTrue(tree.dominates(2, 5))
+        self.assertTrue(tree.dominates(5, 5))
+        self.assertFalse(tree.dominates(3, 5))
+        self.assertFalse(tree.strictly_dominates(5, 5))
+        self.assertEqual(tree.dominators(5), [5, 2, 1])
+        self.assertEqual(tree.immediate(1), None)
+        self.assertEqual(tree.depth[5], 2)
+
+    def test_cfg_loops(self) -> None:
+        cfg = parse('''
+            while (x > 0) {
+                for (int i = 0; i < x; i++) {
+                    if (i == 2) continue;
+                    y++;
+                }
+                x--;
+            }
+            do { x++; } while (x < 10);
+        ''')
+        self.assertEqual(len(cfg.back_edges()), 3)
+        loops = cfg.loops()
+        self.assertEqual(len(loops), 2)
+        outer = next(loop for loop in loops if len(loop.children) > 0)
+        [inner] = outer.children
+        self.assertEqual(inner.depth, 2)
+        self.assertTrue(inner.body < outer.body)
+        tree = cfg.dominator_tree()
+        for tail, header in cfg.back_edges():
+            self.assertTrue(tree.dominates(header, tail))
+
+    def test_cfg_cache_is_invalidated(self) -> None:
+        cfg = parse('x = 1; if (x > 0) { y = 1; } z = 1;')
+        tree = cfg.dominator_tree()
+        self.assertIs(cfg.dominator_tree(), tree)
+        self.assertIs(cfg.post_dominator_tree(), cfg.post_dominator_tree())
+        self.assertEqual(cfg.back_edges(), [])
+        last = cfg.exit_node()
+        cfg.add_edge(last, cfg.add_node([]))
+        self.assertIsNot(cfg.dominator_tree(), tree)
+        self.assertEqual(cfg.dominator_tree().immediate(cfg.exit_node()), last)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,2 @@
+from program_graphs.ddg.ddg import DDG  # noqa
+from program_graphs.ddg.parser.java.parser import parse as parse_java  # noqa
@@ -1,24 +1,67 @@
+from typing import Mapping, Optional, Set
 import networkx as nx  # type: ignore
+from program_graphs.types import NodeID
 from program_graphs.cfg.cfg import CFG
-from program_graphs.ddg.parser.java.utils import get_data_dependencies, read_write_variables
-from program_graphs.cfg.fcfg import mk_fcfg_from_cfg
+from program_graphs.cfg.fcfg import FCFG, mk_fcfg_from_cfg
+from program_graphs.ddg.parser.java.utils import Variable, VariablesByStmt, get_data_dependencies, get_variables_by_stmt
+from program_graphs.ddg.parser.java.utils import get_reaching_data_dependencies
+from program_graphs.ddg.parser.java.queries import ReadWriteIndex
+from program_graphs.utils.budget import Budget, budget_scope, mark_truncated
+from program_graphs.utils.source import Buffer, Source, as_buffer
+
+DDEP_PATHS = 'paths'
+DDEP_REACHING_DEFINITIONS = 'reaching-definitions'
+DDEP_MODES = [DDEP_PATHS, DDEP_REACHING_DEFINITIONS]
 
 
 class DDG(nx.DiGraph):
     pass
 
 
-def mk_ddg(cfg: CFG, source_code: str) -> DDG:
+def mk_ddg(cfg: CFG, source_code: Source, budget: Optional[Budget] = None) -> DDG:
+    with budget_scope(budget):
+        ddg = mk_ddg_from_fcfg(mk_fcfg_from_cfg(cfg), as_buffer(source_code))
+    mark_truncated(ddg, budget)
+    return ddg
+
+
+def variables_by_stmt(fcfg: FCFG, source_code: Buffer, index: Optional[ReadWriteIndex] = None) -> VariablesByStmt:
+    ''' Read and written variables of every statement of `fcfg`, found by `index` if given '''
+    if index is None:
+        return get_variables_by_stmt(fcfg, source_code)
+    read_vars_map: Mapping[NodeID, Set[Variable]] = {}
+    write_vars_map: Mapping[NodeID, Set[Variable]] = {}
+    for node_id, stmt in fcfg.nodes(data='statement'):
+        read_vars, write_vars = index.read_write_variables_with_types(stmt) if stmt is not None else (set(), set())
+        read_vars_map[node_id] = read_vars  # type: ignore
+        write_vars_map[node_id] = write_vars  # type: ignore
+    return read_vars_map, write_vars_map
+
+
+def mk_ddg_from_fcfg(
+    fcfg: FCFG,
+    source_code: Buffer,
+    index: Optional[ReadWriteIndex] = None,
+    ddep_mode: str = DDEP_PATHS
+) -> DDG:
+    ''' `index` over the syntax tree of `fcfg` can be shared with other graphs of the same tree.
+        `ddep_mode` 'paths' follows the control flow paths from every write, visiting each
+        statement once; 'reaching-definitions' solves reaching definitions, which scales
+        to large methods and also finds dependencies carried around loops '''
+    if ddep_mode not in DDEP_MODES:
+        raise ValueError(f'Unknown data dependency mode: {ddep_mode}')
     ddg = DDG()
-    full_cfg = mk_fcfg_from_cfg(cfg)
-    dds = get_data_dependencies(full_cfg, source_code.encode())
+    variables = variables_by_stmt(fcfg, source_code, index)
+    if ddep_mode == DDEP_REACHING_DEFINITIONS:
+        dds = get_reaching_data_dependencies(fcfg, source_code, variables)
+    else:
+        dds = get_data_dependencies(fcfg, source_code, variables)
 
-    for node, stmt in full_cfg.nodes(data='statement'):
-        read_vars, write_vars = read_write_variables(stmt, source_code.encode())
-        if len(read_vars) + len(write_vars) > 0:
+    read_vars_map, write_vars_map = variables
+    for node, stmt in fcfg.nodes(data='statement'):
+        if len(read_vars_map[node]) + len(write_vars_map[node]) > 0:
             ddg.add_node(node, statement=stmt)
 
     for (write_node, read_node, vars) in dds:
         ddg.add_edge(write_node, read_node, dependency='data', vars=vars)
-
     return ddg
@@ -1,18 +1,43 @@
-# from typing import Any, List, Optional
-# from tree_sitter import Language, Parser  # type: ignore
-from program_graphs.ddg.ddg import DDG
-# from program_graphs.cfg.operators import mk_empty_cfg, combine
-# from program_graphs.cfg.operators import manage_jumps, eliminate_redundant_nodes
-# from program_graphs.cfg.parser.java.utils import get_identifier, get_nodes_after_colon
-# from program_graphs.cfg.parser.java.switch_stmt import get_switch_block_label, get_switch_label
-# from program_graphs.cfg.types import Node, JumpKind, Label
-# from program_graphs.cfg.parser.java.break_stmt import mk_cfg_break
-# from program_graphs.cfg.parser.java.continue_stmt import mk_cfg_continue
-# from program_graphs.cfg.parser.java.return_stmt import mk_cfg_return
+from contextlib import nullcontext
+from typing import Optional
+from program_graphs.ddg.ddg import DDG, DDEP_REACHING_DEFINITIONS, mk_ddg_from_fcfg
+from program_graphs.ddg.parser.java.queries import ReadWriteIndex
+from program_graphs.cfg.fcfg import mk_fcfg_from_cfg
+from program_graphs.cfg.edge_contraction import without_edge_contraction
+from program_graphs.cfg.parser.java.parser import mk_cfg
+from program_graphs.utils.profiling import ParseStats, phase
+from program_graphs.utils.budget import Budget, budget_scope, mark_truncated
+from program_graphs.utils.source import Source, as_buffer, parse_java_tree
 
 
-def parse(source_code: str) -> DDG:
-    # cfg =
-    # fcfg = mk_fcfg(cfg)
-    # dds = get_data_dependencies(fcfg)
-    pass
+def parse(
+    source_code: Source,
+    stats: Optional[ParseStats] = None,
+    budget: Optional[Budget] = None,
+    ddep_mode: str = DDEP_REACHING_DEFINITIONS
+) -> DDG:
+    ''' DDG of `source_code` from a single tree-sitter parse: a `str` is encoded once, a buffer read in place, and
+        the CFG, its statement level FCFG and the read and written variables (one query
+        over the tree) are all derived from the same tree. Data dependencies are found
+        by solving reaching definitions unless `ddep_mode` is 'paths', see `mk_ddg_from_fcfg`.
+        Reaching definitions do not depend on how statements are grouped in blocks, so the CFG
+        is built without edge contraction, whose path enumeration is exponential in branches '''
+    source_code_bytes = as_buffer(source_code)
+    with phase(stats, 'tree_sitter'):
+        ast = parse_java_tree(source_code_bytes)
+    with budget_scope(budget):
+        contraction = without_edge_contraction() if ddep_mode == DDEP_REACHING_DEFINITIONS else nullcontext()
+        with phase(stats, 'mk_cfg'), contraction:
+            cfg = mk_cfg(ast, source=source_code_bytes)
+        with phase(stats, 'mk_fcfg'):
+            fcfg = mk_fcfg_from_cfg(cfg)
+        with phase(stats, 'read_write_index'):
+            index = ReadWriteIndex(ast, source_code_bytes)
+        with phase(stats, 'mk_ddg'):
+            ddg = mk_ddg_from_fcfg(fcfg, source_code_bytes, index, ddep_mode)
+    mark_truncated(ddg, budget)
+    if stats is not None:
+        stats.count('parsed')
+        stats.count('nodes', len(ddg))
+        stats.count('edges', ddg.number_of_edges())
+    return ddg
@@ -0,0 +1,245 @@
+''' Read and written identifiers of many statements from one tree-sitter query.
+
+    `write_read_identifiers` walks every statement subtree in Python. `ReadWriteIndex` runs
+    one precompiled query over a whole method (or file) instead: the query engine, in C,
+    captures the identifiers and the few constructs which decide whether an identifier
+    is read or written (assignments, declarators, updates, parameters, lambdas, ...).
+    The captured nodes form a much smaller tree, on which the rules of
+    `write_read_identifiers` are applied to any statement, found by its byte range.
+'''
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+from tree_sitter import Query  # type: ignore
+from program_graphs.types import ASTNode
+from program_graphs.utils.source import Buffer, java_language
+from program_graphs.ddg.parser.java.utils import VarName, VarType, get_type, identifier_to_string
+from program_graphs.ddg.parser.java.utils import write_read_identifiers
+
+READ_WRITE_PATTERNS = '''
+(identifier) @identifier
+(lambda_expression) @lambda
+(assignment_expression left: (_) @assignment.left) @assignment
+(variable_declarator) @declarator
+(update_expression) @update
+(class_declaration) @class
+(class_declaration body: (_) @class.body)
+(method_invocation name: (identifier) @call.name)
+(field_access field: (identifier) @field.name)
+(field_access (identifier) @object.child)
+(array_access (identifier) @object.child)
+[(formal_parameter) (catch_formal_parameter) (resource)] @parameter
+(formal_parameter name: (_) @parameter.name)
+(catch_formal_parameter name: (_) @parameter.name)
+(resource name: (_) @parameter.name)
+(object_creation_expression arguments: (_) @new.arguments) @new
+(enhanced_for_statement) @for
+(enhanced_for_statement name: (_) @for.name)
+(enhanced_for_statement value: (_) @for.value)
+(labeled_statement (identifier) @label)
+(break_statement (identifier) @label)
+(continue_statement (identifier) @label)
+(method_declaration (identifier) @label)
+(class_declaration (identifier) @label)
+'''
+
+# capture names as bit flags, a captured node carries the union of its names
+ROLE = {
+    name: 1 << i for i, name in enumerate([
+        'identifier', 'lambda', 'assignment', 'assignment.left', 'declarator', 'update', 'class', 'class.body',
+        'call.name', 'field.name', 'object.child', 'parameter', 'parameter.name', 'new', 'new.arguments',
+        'for', 'for.name', 'for.value', 'label',
+    ])
+}
+IDENTIFIER, LAMBDA, ASSIGNMENT, DECLARATOR = ROLE['identifier'], ROLE['lambda'], ROLE['assignment'], ROLE['declarator']
+UPDATE, CLASS, CLASS_BODY, PARAMETER = ROLE['update'], ROLE['class'], ROLE['class.body'], ROLE['parameter']
+NEW, NEW_ARGUMENTS, FOR = ROLE['new'], ROLE['new.arguments'], ROLE['for']
+FOR_NAME, FOR_VALUE, ASSIGNMENT_LEFT = ROLE['for.name'], ROLE['for.value'], ROLE['assignment.left']
+OBJECT_CHILD, PARAMETER_NAME = ROLE['object.child'], ROLE['parameter.name']
+# roles an identifier gets from the way its parent is walked, meaningless at a statement root
+PARENT_WALK = ROLE['call.name'] | ROLE['field.name']
+NOT_READ = PARENT_WALK | ROLE['label']
+
+
+@lru_cache(maxsize=None)
+def read_write_query() -> Query:
+    return java_language().query(READ_WRITE_PATTERNS)
+
+
+class _Captured:
+    ''' A captured syntax node, its capture names and its captured descendants '''
+
+    __slots__ = ('node', 'roles', 'children', 'start', 'end')
+
+    def __init__(self, node: ASTNode, roles: int) -> None:
+        self.node = node
+        self.roles = roles
+        self.children: List['_Captured'] = []
+        self.start: int = node.start_byte
+        self.end: int = node.end_byte
+
+
+Identifiers = Tuple[List[ASTNode], List[ASTNode]]
+TypedVariable = Tuple[VarName, Optional[VarType]]
+
+
+class ReadWriteIndex:
+    ''' Captures of the read/write query under `root`, in document order.
+
+        `write_read_identifiers(statement)` gives the same lists as the function of
+        `program_graphs.ddg.parser.java.utils` for any statement under `root`. Statements
+        with syntax errors are handed to that function: error recovery does not keep
+        the grammar fields the query relies on.
+    '''
+
+    def __init__(self, root: ASTNode, source_code: Buffer) -> None:
+        self.source_code = source_code
+        by_id: Dict[int, _Captured] = {}
+        captured: List[_Captured] = []
+        for node, name in read_write_query().captures(root):
+            c = by_id.get(node.id)
+            if c is None:
+                by_id[node.id] = c = _Captured(node, ROLE[name])
+                captured.append(c)
+            else:
+                c.roles |= ROLE[name]
+        # ancestors are captured before descendants starting at the same byte, the sort is stable
+        captured.sort(key=lambda c: (c.start, -c.end))
+        self.captured = captured
+        self.starts = [c.start for c in captured]
+        self.next: List[int] = [len(captured)] * len(captured)  # index following the captured subtree
+        stack: List[_Captured] = []
+        indices: List[int] = []
+        for i, c in enumerate(captured):
+            while len(stack) > 0 and stack[-1].end < c.end:
+                stack.pop()
+                self.next[indices.pop()] = i
+            if len(stack) > 0:
+                stack[-1].children.append(c)
+            stack.append(c)
+            indices.append(i)
+
+    def _top_level(self, statement: ASTNode) -> Tuple[Optional[_Captured], List[_Captured]]:
+        ''' The statement itself if it is captured, otherwise the outermost captures inside it '''
+        start, end, statement_id = statement.start_byte, statement.end_byte, statement.id
+        captured = self.captured
+        inside = []
+        i = bisect_left(self.starts, start)
+        while i < len(captured) and (captured[i].start < end or captured[i].start == start):
+            c = captured[i]
+            if c.end > end:
+                i += 1  # encloses the statement
+                continue
+            if c.node.id == statement_id:
+                return c, []
+            if c.start == start and c.end == end:
+                same = _same_range(c, statement_id)
+                if same is not None:
+                    return same, []
+            inside.append(c)
+            i = self.next[i]
+        return None, inside
+
+    def write_read_identifiers(self, statement: ASTNode) -> Identifiers:
+        if statement.has_error:
+            return write_read_identifiers(statement, self.source_code)
+        captured, inside = self._top_level(statement)
+        if captured is not None:
+            return _walk(captured, captured.roles & ~PARENT_WALK)
+        return _walk_children(inside)
+
+    def read_write_variables_with_types(self, statement: ASTNode) -> Tuple[Set[TypedVariable], Set[TypedVariable]]:
+        w, r = self.write_read_identifiers(statement)
+        return (
+            {(identifier_to_string(s, self.source_code), None) for s in r},
+            {(identifier_to_string(s, self.source_code), get_type(s, self.source_code)) for s in w}
+        )
+
+
+def _same_range(captured: _Captured, statement_id: int) -> Optional[_Captured]:
+    ''' The statement among the captured descendants of `captured` spanning the same bytes '''
+    while True:
+        child = next((c for c in captured.children if c.start == captured.start and c.end == captured.end), None)
+        if child is None:
+            return None
+        if child.node.id == statement_id:
+            return child
+        captured = child
+
+
+def _identifiers_df(captured: _Captured, root: bool = False) -> List[_Captured]:
+    ''' `identifiers_df`: every identifier, nested assignments excluded '''
+    if captured.roles & ASSIGNMENT and not root:
+        return []
+    if captured.roles & IDENTIFIER:
+        return [captured]
+    result: List[_Captured] = []
+    for child in captured.children:
+        result += _identifiers_df(child)
+    return result
+
+
+def _identifiers_of(captured: _Captured, role: int) -> List[ASTNode]:
+    ''' `identifiers_df` of the children having `role` '''
+    return [i.node for c in captured.children if c.roles & role for i in _identifiers_df(c, root=True)]
+
+
+def _walk_children(children: List[_Captured]) -> Identifiers:
+    write: List[ASTNode] = []
+    read: List[ASTNode] = []
+    for child in children:
+        w, r = _walk(child, child.roles)
+        write += w
+        read += r
+    return write, read
+
+
+def _walk(captured: _Captured, roles: int) -> Identifiers:  # noqa: C901
+    ''' The rules of `write_read_identifiers`; nodes which are not captured just pass their children on '''
+    if roles & IDENTIFIER:
+        if roles & NOT_READ or captured.start == captured.end:
+            return [], []
+        return [], [captured.node]
+    if roles & LAMBDA:
+        return [], []
+    if roles & ASSIGNMENT:
+        return _walk_assignment(captured)
+    if roles & DECLARATOR:
+        lm = _identifiers_df(captured, root=True)[0].node
+        write, read = _walk_children(captured.children)
+        return write + [lm], [s for s in read if s is not lm]
+    if roles & UPDATE:
+        write, read = _walk_children(captured.children)
+        return write + [_identifiers_df(captured, root=True)[0].node], read
+    if roles & CLASS:
+        return _walk_children([c for c in captured.children if c.roles & CLASS_BODY])
+    if roles & PARAMETER:
+        return [n for c in captured.children if c.roles & PARAMETER_NAME for n in _all_identifiers(c)], []
+    if roles & NEW:
+        return [], _identifiers_of(captured, NEW_ARGUMENTS)
+    if roles & FOR:
+        return _identifiers_of(captured, FOR_NAME), _identifiers_of(captured, FOR_VALUE)
+    return _walk_children(captured.children)
+
+
+def _walk_assignment(captured: _Captured) -> Identifiers:
+    first = _identifiers_df(captured, root=True)[0]
+    lm = first.node
+    l_write, l_read = _walk_children([c for c in captured.children if c.roles & ASSIGNMENT_LEFT])
+    r_write, r_read = _walk_children([c for c in captured.children if not c.roles & ASSIGNMENT_LEFT])
+    operator = captured.node.child_by_field_name('operator')
+    if operator is not None and operator.type == '=' and not first.roles & OBJECT_CHILD:
+        return l_write + r_write + [lm], [s for s in l_read if s is not lm] + r_read
+    return l_write + r_write + [lm], l_read + r_read
+
+
+def _all_identifiers(captured: _Captured) -> List[ASTNode]:
+    ''' `filter_nodes(node, ['identifier'])` '''
+    result = []
+    stack = [captured]
+    while len(stack) > 0:
+        captured = stack.pop()
+        if captured.roles & IDENTIFIER:
+            result.append(captured.node)
+        stack.extend(reversed(captured.children))
+    return result
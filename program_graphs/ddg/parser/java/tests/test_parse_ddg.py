@@ -0,0 +1,77 @@
+from typing import Set, Tuple
+from unittest import TestCase, main
+from program_graphs.cfg.parser.java import parse as parse_cfg
+from program_graphs.ddg.ddg import DDG, mk_ddg
+from program_graphs.ddg.parser.java.parser import parse
+from program_graphs.cfg.parser.java.utils import extract_code
+from program_graphs.utils.budget import Budget, BudgetExceeded, is_truncated
+
+
+def dependencies(ddg: DDG, code: str) -> Set[Tuple[str, str, str]]:
+    text = {
+        node: extract_code(stmt.start_byte, stmt.end_byte, code.encode()).strip('()')
+        for node, stmt in ddg.nodes(data='statement')
+    }
+    return {(text[u], text[v], var) for u, v, vars in ddg.edges(data='vars') for var, _ in vars}
+
+
+class TestParseDDG(TestCase):
+
+    def test_same_as_two_step_route(self) -> None:
+        code = '''
+            int a = 0, b = 1;
+            if (a > b) { a = b; }
+            int c = a + b;
+        '''
+        ddg = parse(code)
+        self.assertEqual(dependencies(ddg, code), dependencies(mk_ddg(parse_cfg(code), code), code))
+        self.assertEqual(dependencies(parse(code, ddep_mode='paths'), code), dependencies(ddg, code))
+        self.assertIn(('b', 'int'), {var for _, _, vars in ddg.edges(data='vars') for var in vars})
+
+    def test_writes_reaching_through_any_branch(self) -> None:
+        code = '''
+            int a = 0, b = 1;
+            if (a > b) { a = b; } else { b = a; }
+            int c = a + b;
+        '''
+        deps = dependencies(parse(code), code)
+        self.assertIn(('int a = 0, b = 1;', 'int c = a + b;', 'a'), deps)
+        self.assertIn(('a = b;', 'int c = a + b;', 'a'), deps)
+        self.assertIn(('b = a;', 'int c = a + b;', 'b'), deps)
+        self.assertLessEqual(dependencies(mk_ddg(parse_cfg(code), code), code), deps)
+
+    def test_loop_carried_dependencies(self) -> None:
+        code = '''
+            int s = 0;
+            for (int i = 0; i < 10; i++) {
+                s = s + i;
+            }
+        '''
+        deps = dependencies(parse(code), code)
+        self.assertIn(('i++', 'i++', 'i'), deps)
+        self.assertIn(('s = s + i;', 's = s + i;', 's'), deps)
+        self.assertIn(('int i = 0;', 'i < 10', 'i'), deps)
+        self.assertIn(('i++', 'i < 10', 'i'), deps)
+        self.assertNotIn(('int s = 0;', 'i < 10', 's'), deps)
+
+    def test_many_branches(self) -> None:
+        branches = '\n'.join(f'if (x > {i}) {{ x = x + {i}; }} else {{ x = x - {i}; }}' for i in range(40))
+        code = f'int f(int x) {{ {branches} return x; }}'
+        ddg = parse(code, budget=Budget(max_paths=10))
+        self.assertFalse(is_truncated(ddg))
+        self.assertIn(('x = x - 39;', 'return x;', 'x'), dependencies(ddg, code))
+
+    def test_iterations_budget(self) -> None:
+        code = 'int a = 0; while (a < 10) { a = a + 1; } int b = a;'
+        with self.assertRaises(BudgetExceeded):
+            parse(code, budget=Budget(max_iterations=1))
+        ddg = parse(code, budget=Budget(max_iterations=1, truncate=True))
+        self.assertTrue(is_truncated(ddg))
+
+    def test_unknown_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            parse('int a = 0;', ddep_mode='all-paths')
+
+
+if __name__ == '__main__':
+    main()
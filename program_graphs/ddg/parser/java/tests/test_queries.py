@@ -0,0 +1,68 @@
+from typing import List, Tuple
+from unittest import TestCase, main
+from program_graphs.adg.parser.java.parser import parse_ast_tree_sitter
+from program_graphs.ddg.parser.java.utils import write_read_identifiers, read_write_variables_with_types
+from program_graphs.ddg.parser.java.queries import ReadWriteIndex
+from program_graphs.types import ASTNode
+
+SNIPPETS = [
+    'int a = c, b[] = {a, d}; a += b[i]; b[j] = a; x.y = z; this.f = f; a = b = c; i++; --j; s.length();',
+    'for (String s : items) { total += s.length(); } for (int i = 0, j = n; i < j; i++, j--) { swap(a, i, j); }',
+    'try (Reader r = open(p); Writer w = r.writer()) { w.write(q); } catch (IOException | E e) { log(e); }',
+    'outer: while (x > 0) { if (y) break outer; else continue outer; } do { x--; } while (x > y);',
+    'list.forEach(z -> z + x); Runnable r = () -> { k = 1; }; Object o = new Foo(a, b.c) { int f = g; };',
+    'class A { int f = g; void foo(int x, String... ys) { return x + ys.length; } }',
+    'switch (k) { case 1: a = b; break; default: c = d ? e : f; } int[][] m = new int[i][j]; m[i][j] = (int) v;',
+    'x = y = z += w; a[b[c]] = d; obj.field.inner = value; assert p : q; throw new E(msg); synchronized (lock) { }',
+    'if (x > 0 { y = ; } z = w;',
+]
+
+
+class TestReadWriteIndex(TestCase):
+
+    def nodes(self, root: ASTNode) -> List[ASTNode]:
+        result = []
+        stack = [root]
+        while len(stack) > 0:
+            node = stack.pop()
+            result.append(node)
+            stack.extend(node.children)
+        return result
+
+    def spans(self, identifiers: Tuple[List[ASTNode], List[ASTNode]]) -> List[List[Tuple[int, int]]]:
+        return [[(n.start_byte, n.end_byte) for n in ns] for ns in identifiers]
+
+    def test_same_identifiers_as_walker(self) -> None:
+        for code in SNIPPETS:
+            source_code = code.encode()
+            root = parse_ast_tree_sitter(code)
+            index = ReadWriteIndex(root, source_code)
+            for node in self.nodes(root):
+                self.assertEqual(
+                    self.spans(index.write_read_identifiers(node)),
+                    self.spans(write_read_identifiers(node, source_code)),
+                    f'{node.type} in {code}'
+                )
+
+    def test_same_variables_with_types(self) -> None:
+        code = 'void foo(int x) { int y = x; y += z; for (String s : ss) { t = s; } }'
+        root = parse_ast_tree_sitter(code)
+        index = ReadWriteIndex(root, code.encode())
+        for node in self.nodes(root):
+            self.assertEqual(
+                index.read_write_variables_with_types(node),
+                read_write_variables_with_types(node, code.encode())
+            )
+
+    def test_statement_in_nested_captures(self) -> None:
+        code = 'a = foo(b = c, new Bar(d));'
+        root = parse_ast_tree_sitter(code)
+        index = ReadWriteIndex(root, code.encode())
+        [inner] = [n for n in self.nodes(root) if n.type == 'assignment_expression' and n.text == b'b = c']
+        write, read = index.write_read_identifiers(inner)
+        self.assertEqual([n.text for n in write], [b'b'])
+        self.assertEqual([n.text for n in read], [b'c'])
+
+
+if __name__ == '__main__':
+    main()
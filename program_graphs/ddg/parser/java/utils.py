@@ -1,17 +1,20 @@
 from collections import defaultdict
 from program_graphs.cfg.fcfg import FCFG
-from program_graphs.cfg.parser.java.utils import extract_code
+from program_graphs.utils.source import Buffer, extract_code, extract_name
 from typing import Callable, Tuple, List, Mapping, Set, Iterator, Any, Optional, Iterable, Dict
 from program_graphs.types import NodeID
 from tree_sitter import Node as Statement  # type: ignore
 import networkx as nx  # type: ignore
-from itertools import chain
 from program_graphs.utils.graph import filter_nodes
+from itertools import chain
+from program_graphs.utils.budget import BudgetExceeded, current_budget
+from program_graphs.utils.paths import Path, iter_paths
+from program_graphs.utils.liveness import Liveness, LivenessProblem, solve
+from program_graphs.utils.reaching import ReachingProblem, solve_reaching
 
 VarName = str
 VarType = str
 Variable = Tuple[VarName, VarType]
-Path = List[NodeID]
 DataDependency = Tuple[NodeID, NodeID, Set[Variable]]
 WriteIdentifier = Any
 ReadIdentifier = Any
@@ -33,7 +36,7 @@ def left_most_identifier(node: Statement) -> Statement:
     return identifiers_df(node)[0]
 
 
-def find_types_and_aggregate(node: Statement, source_code: bytes) -> VarType:
+def find_types_and_aggregate(node: Statement, source_code: Buffer) -> VarType:
     var_types = filter_nodes(node, ['integral_type', 'type_identifier', 'boolean_type', 'floating_point_type'])
     return ','.join(
         map(
@@ -43,7 +46,7 @@ def find_types_and_aggregate(node: Statement, source_code: bytes) -> VarType:
     )
 
 
-def get_type(node: Identifier, source_code: bytes) -> Optional[VarType]:
+def get_type(node: Identifier, source_code: Buffer) -> Optional[VarType]:
     if (node.parent.type in ['formal_parameter']):
         return find_types_and_aggregate(node.parent.child_by_field_name('type'), source_code)
 
@@ -58,7 +61,7 @@ def get_type(node: Identifier, source_code: bytes) -> Optional[VarType]:
 
 def _write_read_indetifiers_of_children(
     node: Statement,
-    source_code: bytes
+    source_code: Buffer
 ) -> Tuple[List[WriteIdentifier], List[ReadIdentifier]]:
     r, w = [], []
     for child in node.children:
@@ -70,7 +73,7 @@ def _write_read_indetifiers_of_children(
 
 def write_read_identifiers_assignment_expression(
     node: Statement,
-    source_code: bytes
+    source_code: Buffer
 ) -> Tuple[List[WriteIdentifier], List[ReadIdentifier]]:
     lm = left_most_identifier(node)
     operator_node = node.child_by_field_name('operator')
@@ -88,7 +91,7 @@ def write_read_identifiers_assignment_expression(
 
 def write_read_identifiers_variable_declarator(
     node: Statement,
-    source_code: bytes
+    source_code: Buffer
 ) -> Tuple[List[WriteIdentifier], List[ReadIdentifier]]:
     lm = left_most_identifier(node)
     l_write, l_read = write_read_identifiers(node.child_by_field_name('name'), source_code)
@@ -100,7 +103,7 @@ def write_read_identifiers_variable_declarator(
 
 def write_read_identifiers_update_expression(
     node: Statement,
-    source_code: bytes
+    source_code: Buffer
 ) -> Tuple[List[WriteIdentifier], List[ReadIdentifier]]:
     lm = left_most_identifier(node)
     write, read = _write_read_indetifiers_of_children(node, source_code)
@@ -110,7 +113,7 @@ def write_read_identifiers_update_expression(
 
 def write_read_identifiers(  # noqa
     node: Statement,
-    source_code: bytes
+    source_code: Buffer
 ) -> Tuple[List[WriteIdentifier], List[ReadIdentifier]]:
     # print(node)
     if node is None:
@@ -160,38 +163,42 @@ def write_read_identifiers(  # noqa
     return _write_read_indetifiers_of_children(node, source_code)
 
 
-def statement_to_string(node: Statement, source_code: bytes) -> str:
+def statement_to_string(node: Statement, source_code: Buffer) -> str:
     return extract_code(node.start_byte, node.end_byte, source_code)
 
 
-def read_write_variables(node: Statement, source_code: bytes) -> Tuple[Set[VarName], Set[VarName]]:
+def identifier_to_string(node: Statement, source_code: Buffer) -> VarName:
+    return extract_name(node.start_byte, node.end_byte, source_code)
+
+
+def read_write_variables(node: Statement, source_code: Buffer) -> Tuple[Set[VarName], Set[VarName]]:
     w, r = write_read_identifiers(node, source_code)
-    w = [statement_to_string(s, source_code) for s in w]
-    r = [statement_to_string(s, source_code) for s in r]
+    w = [identifier_to_string(s, source_code) for s in w]
+    r = [identifier_to_string(s, source_code) for s in r]
     return set(r), set(w)
 
 
-def read_write_variables_with_types(node: Statement, source_code: bytes) -> Tuple[Set[Variable], Set[Variable]]:
+def read_write_variables_with_types(node: Statement, source_code: Buffer) -> Tuple[Set[Variable], Set[Variable]]:
     w, r = write_read_identifiers(node, source_code)
-    w = [(statement_to_string(s, source_code), get_type(s, source_code)) for s in w]
-    r = [(statement_to_string(s, source_code), None) for s in r]
+    w = [(identifier_to_string(s, source_code), get_type(s, source_code)) for s in w]
+    r = [(identifier_to_string(s, source_code), None) for s in r]
     return set(r), set(w)
 
 
-def get_all_variables(node: Statement, source_code: bytes) -> Set[VarName]:
+def get_all_variables(node: Statement, source_code: Buffer) -> Set[VarName]:
     read_vars, write_vars = read_write_variables(node, source_code)
     return write_vars | read_vars
 
 
-def get_all_variables_with_types(node: Statement, source_code: bytes) -> Set[Variable]:
+def get_all_variables_with_types(node: Statement, source_code: Buffer) -> Set[Variable]:
     read_vars, write_vars = read_write_variables_with_types(node, source_code)
     return write_vars | read_vars
 
 
-def get_variables_by_stmt(
-    fcfg: FCFG,
-    source_code: bytes
-) -> Tuple[Mapping[NodeID, Set[Variable]], Mapping[NodeID, Set[Variable]]]:
+VariablesByStmt = Tuple[Mapping[NodeID, Set[Variable]], Mapping[NodeID, Set[Variable]]]
+
+
+def get_variables_by_stmt(fcfg: FCFG, source_code: Buffer) -> VariablesByStmt:
     read_vars_map: Mapping[NodeID, Set[Variable]] = {}
     write_vars_map: Mapping[NodeID, Set[Variable]] = {}
     for node_id, stmt in fcfg.nodes(data='statement'):
@@ -208,31 +215,69 @@ def group_data_dependencies_by_edges(dependencies: List[DataDependency]) -> List
     return [(node_from, node_to, vars) for ((node_from, node_to), vars) in edge_to_vars.items()]
 
 
-def get_data_dependencies(fcfg: FCFG, source_code: bytes) -> List[DataDependency]:
-    read_vars_map, write_vars_map = get_variables_by_stmt(fcfg, source_code)
+def get_data_dependencies(
+    fcfg: FCFG,
+    source_code: Buffer,
+    variables: Optional[VariablesByStmt] = None
+) -> List[DataDependency]:
+    ''' If the budget of the current parse runs out, the dependencies found so far are returned.
+        `variables` are the read and written variables of every statement, when already known '''
+    budget = current_budget()
     data_dependencies: List[DataDependency] = list()
-    for node_id in fcfg.nodes():
-        for w_var, w_var_type in write_vars_map[node_id]:
-            paths = all_paths_from(fcfg, node_id)
-            for path in paths:
-                for dependent_node in find_dependent_stmt(w_var, read_vars_map, write_vars_map, path[1:]):
-                    data_dependencies.append((node_id, dependent_node, set([(w_var, w_var_type)])))
+    try:
+        if budget is not None:
+            budget.check_nodes(len(fcfg))
+        read_vars_map, write_vars_map = variables or get_variables_by_stmt(fcfg, source_code)
+        for node_id in fcfg.nodes():
+            for w_var, w_var_type in write_vars_map[node_id]:
+                for path in iter_paths(fcfg, node_id):
+                    if budget is not None:
+                        budget.spend_paths()
+                    for dependent_node in find_dependent_stmt(w_var, read_vars_map, write_vars_map, path[1:]):
+                        data_dependencies.append((node_id, dependent_node, set([(w_var, w_var_type)])))
+    except BudgetExceeded as error:
+        assert budget is not None
+        budget.stop(error)
     return group_data_dependencies_by_edges(
         data_dependencies
     )
 
 
-def all_paths_from(g: nx.DiGraph, node: NodeID, mb_visited_nodes: List[NodeID] = None) -> List[Path]:
-    visited_nodes: List[NodeID] = mb_visited_nodes or []
-    successors = [s for s in g.successors(node) if s not in visited_nodes]
-    if len(visited_nodes) == 0 and len(successors) == 0:
+def get_reaching_data_dependencies(
+    fcfg: FCFG,
+    source_code: Buffer,
+    variables: Optional[VariablesByStmt] = None
+) -> List[DataDependency]:
+    ''' Every read depends on the writes of its variable reaching it along the control flow,
+        loop-carried ones included. One bit vector data flow pass over the statements instead
+        of a path enumeration per write. If the budget of the current parse runs out, the
+        dependencies found so far are returned '''
+    budget = current_budget()
+    try:
+        if budget is not None:
+            budget.check_nodes(len(fcfg))
+    except BudgetExceeded as error:
+        assert budget is not None
+        budget.stop(error)
         return []
-    visited_nodes.append(node)
-    if len(successors) == 0:
-        return [[node]]
-    paths = [all_paths_from(g, s, visited_nodes) for s in successors]
-    flatten_paths = chain(*paths)
-    return [[node] + path for path in flatten_paths]
+    read_vars_map, write_vars_map = variables or get_variables_by_stmt(fcfg, source_code)
+    types = {(node, var): var_type for node, vars in write_vars_map.items() for var, var_type in vars}
+    problem = ReachingProblem(
+        fcfg.nodes(), fcfg.entry_node if len(fcfg) > 0 else None, fcfg.successors,
+        lambda node: {var for var, _ in write_vars_map[node]}
+    )
+    reaching = solve_reaching(problem)
+    data_dependencies: List[DataDependency] = []
+    for node, read_vars in read_vars_map.items():
+        for var, _ in read_vars:
+            for write_node in reaching.reaching(node, var):
+                data_dependencies.append((write_node, node, {(var, types[write_node, var])}))
+    return group_data_dependencies_by_edges(data_dependencies)
+
+
+def all_paths_from(g: nx.DiGraph, node: NodeID) -> List[Path]:
+    ''' All paths from `node` visiting every node once, prefer the lazy `iter_paths` '''
+    return list(iter_paths(g, node))
 
 
 def find_dependent_stmt(
@@ -249,7 +294,7 @@ def find_dependent_stmt(
             break
 
 
-def get_declared_variables_nodes(node: Statement, source_code: bytes) -> List[Statement]:
+def get_declared_variables_nodes(node: Statement, source_code: Buffer) -> List[Statement]:
     if node.type == 'variable_declarator':
         return [left_most_identifier(node)]
     if node.type in ['catch_formal_parameter', 'formal_parameter', 'resource']:
@@ -260,8 +305,23 @@ def get_declared_variables_nodes(node: Statement, source_code: bytes) -> List[St
     return vars
 
 
-def get_declared_variables(node: Statement, source_code: bytes) -> Set[VarName]:
+def get_declared_variables(node: Statement, source_code: Buffer) -> Set[VarName]:
     return set(map(
-        lambda stmt: statement_to_string(stmt, source_code),
+        lambda stmt: identifier_to_string(stmt, source_code),
         get_declared_variables_nodes(node, source_code))
     )
+
+
+def fcfg_liveness_problem(fcfg: FCFG, source_code: Buffer) -> LivenessProblem:
+    variables = {
+        node: read_write_variables(stmt, source_code) for node, stmt in fcfg.nodes(data='statement')
+    }
+    return LivenessProblem(
+        fcfg.nodes(), fcfg.entry_node if len(fcfg) > 0 else None, fcfg.successors,
+        lambda node: variables[node][0], lambda node: variables[node][1]
+    )
+
+
+def fcfg_liveness(fcfg: FCFG, source_code: Buffer) -> Liveness:
+    ''' Live variables before and after every statement of `fcfg` '''
+    return solve(fcfg_liveness_problem(fcfg, source_code))
@@ -0,0 +1,63 @@
+from itertools import islice
+from unittest import TestCase, main
+from program_graphs.adg.parser.java.parser import parse
+from program_graphs.utils.paths import iter_paths, path_trie
+import networkx as nx  # type: ignore
+
+
+def diamonds(n: int) -> nx.DiGraph:
+    ''' A chain of `n` diamonds, 2^n paths from 0 to the last node '''
+    g = nx.DiGraph()
+    for i in range(n):
+        a, b, c, d = 3 * i, 3 * i + 1, 3 * i + 2, 3 * i + 3
+        g.add_edges_from([(a, b), (a, c), (b, d), (c, d)])
+    return g
+
+
+class TestIterPaths(TestCase):
+
+    def test_visit_once(self) -> None:
+        self.assertEqual(list(iter_paths(nx.DiGraph([(1, 2), (1, 3), (2, 1)]), 1)), [[1, 2], [1, 3]])
+        self.assertEqual(list(iter_paths(nx.DiGraph([(1, 2), (1, 3), (2, 3)]), 1)), [[1, 2, 3], [1, 3]])
+        self.assertEqual(list(iter_paths(diamonds(2), 0)), [[0, 1, 3, 4, 6], [0, 1, 3, 5], [0, 2]])
+        g = nx.DiGraph()
+        g.add_node(1)
+        self.assertEqual(list(iter_paths(g, 1)), [])
+
+    def test_simple_paths(self) -> None:
+        g = diamonds(3)
+        paths = sorted(iter_paths(g, 0, visited='path'))
+        self.assertEqual(paths, sorted(nx.all_simple_paths(g, 0, 9)))
+        cycle = nx.DiGraph([(1, 2), (2, 3), (3, 1), (2, 4)])
+        self.assertEqual(list(iter_paths(cycle, 1, visited='path')), [[1, 2, 3], [1, 2, 4]])
+
+    def test_limits(self) -> None:
+        g = diamonds(40)
+        first = list(islice(iter_paths(g, 0, visited='path'), 3))
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(list(iter_paths(g, 0, visited='path', max_paths=5))), 5)
+        short = list(iter_paths(diamonds(3), 0, visited='path', max_length=3))
+        self.assertEqual(short, [[0, 1, 3], [0, 2, 3]])
+        with self.assertRaises(ValueError):
+            list(iter_paths(g, 0, visited='none'))
+
+    def test_adg_control_flow_view(self) -> None:
+        adg = parse('int x = 1; if (x > 0) { x = 2; } return x;')
+        paths = list(iter_paths(adg, adg.get_entry_node(), visited='path', edge_attr='cflow'))
+        self.assertEqual(len(paths), 2)
+        for path in paths:
+            self.assertEqual(path[-1], adg.get_exit_node())
+            for edge in zip(path, path[1:]):
+                self.assertTrue(adg.edges[edge].get('cflow'))
+
+    def test_trie(self) -> None:
+        g = diamonds(6)
+        paths = list(iter_paths(g, 0, visited='path'))
+        trie = path_trie(g, 0, visited='path')
+        self.assertEqual(len(trie), len(paths))
+        self.assertEqual(sorted(trie.paths()), sorted(paths))
+        self.assertLess(trie.size(), sum(len(p) for p in paths) / 3)
+
+
+if __name__ == '__main__':
+    main()
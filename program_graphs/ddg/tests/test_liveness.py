@@ -0,0 +1,32 @@
+from unittest import TestCase, main
+from program_graphs.cfg.parser.java import parse
+from program_graphs.cfg.fcfg import mk_fcfg_from_cfg
+from program_graphs.ddg.parser.java.utils import fcfg_liveness
+from program_graphs.cfg.parser.java.utils import extract_code
+
+
+class TestFCFGLiveness(TestCase):
+
+    def test_fcfg_liveness(self) -> None:
+        code = '''
+            int a = 1;
+            int b = 2;
+            a = b;
+            while (a < 10) {
+                a++;
+            }
+        '''
+        fcfg = mk_fcfg_from_cfg(parse(code))
+        result = fcfg_liveness(fcfg, code.encode())
+        text = {
+            node: extract_code(stmt.start_byte, stmt.end_byte, code.encode())
+            for node, stmt in fcfg.nodes(data='statement') if stmt is not None
+        }
+        dead = [text[node] for node, _ in result.dead_stores()]
+        self.assertEqual(dead, ['int a = 1;'])
+        [condition] = [node for node, t in text.items() if t.strip('()') == 'a < 10']
+        self.assertEqual(result.live_in[condition], {'a'})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+''' ADGs of the methods of large Java files, built one method at a time.
+
+    A syntax tree takes tens of bytes per byte of source, so a file is not parsed whole.
+    A scanner over the bytes (comments, strings and text blocks skipped) splits it into
+    the members of its classes, nested classes are split further, and each member is
+    parsed on its own. The graphs of a member's methods are built from that small tree;
+    nothing of a member is kept once its graphs are handed out, so memory tracks the
+    largest method rather than the file. Files are memory-mapped, never read into a `str`.
+'''
+import mmap
+import re
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple
+from program_graphs.adg.adg import ADG
+from program_graphs.adg.parser.java.parser import parse_from_ast
+from program_graphs.types import ASTNode
+from program_graphs.utils.budget import Budget
+from program_graphs.utils.profiling import ParseStats, phase
+from program_graphs.utils.source import Buffer, Source, as_buffer, extract_name, parse_java_tree
+
+METHODS = ['method_declaration', 'constructor_declaration']
+
+TOKENS = re.compile(rb'''
+    //[^\n]* | /\*.*?\*/ | """.*?""" | "(?:\\.|[^"\\\n])*" | '(?:\\.|[^'\\\n])*' | [{};=()]
+''', re.S | re.X)
+WRAPPERS = {b'class': b'class _ {', b'record': b'record _() {'}
+TYPE_HEADER = re.compile(rb'''
+    //[^\n]* | /\*.*?\*/ | "(?:\\.|[^"\\\n])*" | \b(class|interface|enum|record)\s+[A-Za-z_$\x80-\xff]
+''', re.S | re.X)
+
+
+class Declaration(NamedTuple):
+    start_byte: int
+    end_byte: int
+    body: Optional[int]  # position of the `{` opening the body, None for a `;` ended declaration
+    initializer: bool  # a field with a value, braces in it are arrays, lambdas or anonymous classes
+
+
+class MethodGraph(NamedTuple):
+    ''' ADG of a method and the bytes it was parsed from: the class member declaring it in a
+        stand-in type declaration. Byte `i` of the member is byte `offset + i` of the file '''
+    name: str
+    adg: ADG
+    source_code: bytes
+    offset: int
+
+
+def declarations(code: Buffer, start: int, end: int) -> Iterator[Declaration]:
+    ''' Declarations between `start` and `end`, each one ended by a `;` or by the `}` closing its body '''
+    depth, parens, begin = 0, 0, start
+    body: Optional[int] = None
+    initializer = False
+    for token in TOKENS.finditer(code, start, end):
+        c = code[token.start()]
+        if c in b'()':
+            parens += 1 if c == ord('(') else -1
+        elif parens > 0 or c in b'/"\'':
+            continue  # comments, strings and what is in parentheses (annotations, parameters)
+        elif c == ord('='):
+            initializer = initializer or depth == 0
+        elif c == ord('{'):
+            body = token.start() if depth == 0 and body is None else body
+            depth += 1
+        elif c == ord('}'):
+            depth -= 1
+            if depth == 0 and not initializer:
+                yield Declaration(begin, token.end(), body, initializer)
+                begin, body = token.end(), None
+        elif c == ord(';') and depth == 0:
+            yield Declaration(begin, token.end(), body, initializer)
+            begin, body, initializer = token.end(), None, False
+    if begin < end and len(bytes(code[begin: end]).strip()) > 0:
+        yield Declaration(begin, end, body, initializer)
+
+
+def type_keyword(code: Buffer, declaration: Declaration) -> Optional[bytes]:
+    ''' `class`, `interface`, `enum` or `record` if `declaration` declares a type '''
+    if declaration.body is None or declaration.initializer:
+        return None
+    for match in TYPE_HEADER.finditer(code, declaration.start_byte, declaration.body):
+        if match.group(1) is not None:
+            return match.group(1)
+    return None
+
+
+def members(code: Buffer) -> Iterator[Tuple[int, int, bytes]]:
+    ''' Byte ranges of the class members of `code` (methods, constructors, fields, initializers),
+        found without parsing, with the keyword of the type declaring them. The members of
+        nested types are listed instead of the types '''
+    scopes: List[Tuple[int, int, bytes]] = [(0, len(code), b'class')]
+    while len(scopes) > 0:
+        start, end, keyword = scopes.pop()
+        nested: List[Tuple[int, int, bytes]] = []
+        for declaration in declarations(code, start, end):
+            nested_keyword = type_keyword(code, declaration)
+            if nested_keyword is not None and declaration.body is not None:
+                nested.append((declaration.body + 1, declaration.end_byte - 1, nested_keyword))
+            else:
+                yield declaration.start_byte, declaration.end_byte, keyword
+        scopes.extend(reversed(nested))
+
+
+def methods_of(node: ASTNode) -> Iterator[ASTNode]:
+    ''' Method and constructor declarations under `node`, those inside another method excluded '''
+    stack = [node]
+    while len(stack) > 0:
+        node = stack.pop()
+        if node.type in METHODS:
+            yield node
+        else:
+            stack.extend(reversed(node.children))
+
+
+def parse_methods(
+    source_code: Source,
+    stats: Optional[ParseStats] = None,
+    budget: Optional[Budget] = None,
+    **options: Any
+) -> Iterator[MethodGraph]:
+    ''' ADG of every method of `source_code` with a body, in order.
+        `options` (`cdep_mode`, `syntax_tokens`, `granularity`, `layers`) go to `parse_from_ast`,
+        the budget is given to every method on its own '''
+    code = as_buffer(source_code)
+    with phase(stats, 'find_members'):
+        ranges = list(members(code))
+    for start, end, keyword in ranges:
+        # a member is parsed in a type of its kind, or constructors would be taken for methods
+        header = WRAPPERS.get(keyword, WRAPPERS[b'class'])
+        member = header + bytes(code[start: end]) + b'\n}'
+        with phase(stats, 'tree_sitter'):
+            root = parse_java_tree(member)
+        for method in methods_of(root):
+            if method.child_by_field_name('body') is None:
+                continue
+            name_node = method.child_by_field_name('name')
+            name = extract_name(name_node.start_byte, name_node.end_byte, member) if name_node is not None else ''
+            adg = parse_from_ast(method, member, stats, budget, **options)
+            if stats is not None:
+                stats.count('methods')
+            yield MethodGraph(name, adg, member, start - len(header))
+
+
+def parse_file(
+    path: str,
+    stats: Optional[ParseStats] = None,
+    budget: Optional[Budget] = None,
+    **options: Any
+) -> Iterator[MethodGraph]:
+    ''' `parse_methods` of the memory-mapped file at `path`. The file stays mapped until
+        the iteration is over, only the member being parsed is copied out of it '''
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as code:
+            yield from parse_methods(code, stats, budget, **options)
@@ -0,0 +1,83 @@
+import io
+import os
+import tarfile
+import tempfile
+import zipfile
+from typing import Any, Dict, List
+from unittest import TestCase, main
+import networkx as nx  # type: ignore
+from program_graphs.archives import parse_archive, source_entries
+from program_graphs.files import parse_methods
+from program_graphs.utils.profiling import ParseStats
+
+
+SOURCES = {
+    'src/a/A.java': 'class A { int f(int a) { if (a > 0) { a = a - 1; } return a; } A() { } }',
+    'src/b/B.java': 'class B { void g() { int x = 0; while (x < 3) { x++; } } }',
+    'META-INF/MANIFEST.MF': 'Manifest-Version: 1.0',
+}
+
+
+def edge_list(g: nx.DiGraph) -> List[Any]:
+    return sorted((u, v, str(sorted(data.items(), key=str))) for u, v, data in g.edges(data=True))
+
+
+def write_zip(path: str, files: Dict[str, str]) -> None:
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('src/', '')
+        for name, code in files.items():
+            archive.writestr(name, code)
+
+
+def write_tar(path: str, files: Dict[str, str], mode: str) -> None:
+    with tarfile.open(path, mode) as archive:  # type: ignore
+        for name, code in files.items():
+            data = code.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+class TestArchives(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.archives = []
+        for name in ('sources.zip', 'sources.jar'):
+            self.archives.append(os.path.join(self.directory.name, name))
+            write_zip(self.archives[-1], SOURCES)
+        for name, mode in (('sources.tar', 'w'), ('sources.tar.gz', 'w:gz'), ('sources.tar.bz2', 'w:bz2')):
+            self.archives.append(os.path.join(self.directory.name, name))
+            write_tar(self.archives[-1], SOURCES, mode)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_java_entries_of_every_format(self) -> None:
+        for path in self.archives:
+            entries = list(source_entries(path))
+            self.assertEqual([name for name, _ in entries], ['src/a/A.java', 'src/b/B.java'], path)
+            self.assertEqual(entries[1][1], SOURCES['src/b/B.java'].encode())
+
+    def test_same_graphs_as_parse_methods(self) -> None:
+        expected = [
+            (name, edge_list(g.adg)) for name in ('src/a/A.java', 'src/b/B.java')
+            for g in parse_methods(SOURCES[name])
+        ]
+        for path in self.archives:
+            stats = ParseStats()
+            graphs = [(name, edge_list(g.adg)) for name, g in parse_archive(path, stats)]
+            self.assertEqual(graphs, expected, path)
+            self.assertEqual(stats.counters['files'], 2)
+            self.assertEqual(stats.counters['methods'], 3)
+
+    def test_unknown_format(self) -> None:
+        path = os.path.join(self.directory.name, 'A.java')
+        with open(path, 'w') as f:
+            f.write(SOURCES['src/a/A.java'])
+        with self.assertRaises(ValueError):
+            source_entries(path)
+
+
+if __name__ == '__main__':
+    main()
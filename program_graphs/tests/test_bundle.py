@@ -0,0 +1,62 @@
+from typing import Any, List
+from unittest import TestCase, main
+import networkx as nx  # type: ignore
+from program_graphs.bundle import parse_java
+from program_graphs.cfg.parser.java.parser import parse as parse_cfg
+from program_graphs.cfg.fcfg import mk_fcfg_from_cfg
+from program_graphs.ddg.ddg import mk_ddg
+from program_graphs.adg.parser.java.parser import parse as parse_adg
+from program_graphs.utils.budget import Budget, is_truncated
+
+
+CODE = '''
+    int a = 0;
+    for (int i = 0; i < 10; i++) {
+        if (i > a) { a = i; } else { a = a + 1; }
+    }
+    return a;
+'''
+
+
+def edge_list(g: nx.DiGraph) -> List[Any]:
+    return sorted((u, v, str(sorted(data.items(), key=str))) for u, v, data in g.edges(data=True))
+
+
+class TestGraphBundle(TestCase):
+
+    def test_same_graphs_as_separate_parses(self) -> None:
+        bundle = parse_java(CODE)
+        cfg = parse_cfg(CODE)
+        assert bundle.cfg is not None and bundle.fcfg is not None and bundle.ddg is not None
+        assert bundle.adg is not None
+        self.assertTrue(nx.is_isomorphic(bundle.cfg, cfg))
+        self.assertTrue(nx.is_isomorphic(bundle.fcfg, mk_fcfg_from_cfg(cfg)))
+        ddg = mk_ddg(cfg, CODE)
+        self.assertEqual(sorted(bundle.ddg.nodes()), sorted(ddg.nodes()))
+        self.assertEqual(edge_list(bundle.ddg), edge_list(ddg))
+        adg = parse_adg(CODE)
+        self.assertEqual(list(bundle.adg.nodes()), list(adg.nodes()))
+        self.assertEqual(edge_list(bundle.adg), edge_list(adg))
+
+    def test_only_requested_kinds(self) -> None:
+        bundle = parse_java(CODE, kinds=['adg'])
+        self.assertIsNone(bundle.cfg)
+        self.assertIsNone(bundle.ddg)
+        self.assertIsNotNone(bundle.adg)
+        bundle = parse_java(CODE, kinds=['ddg'])
+        self.assertIsNotNone(bundle.fcfg)
+        self.assertIsNotNone(bundle.ddg)
+        self.assertIsNone(bundle.adg)
+
+    def test_unknown_kind(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_java(CODE, kinds=['cdg'])
+
+    def test_shared_budget(self) -> None:
+        bundle = parse_java(CODE, budget=Budget(max_paths=1, truncate=True))
+        assert bundle.ddg is not None and bundle.adg is not None
+        self.assertTrue(is_truncated(bundle.ddg))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+from typing import Any, List
+from unittest import TestCase, main
+import networkx as nx  # type: ignore
+from program_graphs.adg.parser.java.parser import parse_from_ast
+from program_graphs.files import members, methods_of, parse_file, parse_methods
+from program_graphs.utils.profiling import ParseStats
+from program_graphs.utils.source import parse_java_tree
+
+
+CODE = '''package a.b;
+import java.util.*;
+/** A class { with braces in docs */
+public class A<T extends Comparable<T>> {
+    private static final String S = "}{;";  // } comment
+    private char c = '{';
+    private int[] xs = {1, 2, 3};
+    private Runnable r = new Runnable() { public void run() { int q = 1; q++; } };
+    @SuppressWarnings({"unchecked", "class Foo"})
+    public A(int c) { super(); this.c = '}'; }
+    static { int z = 0; }
+    abstract void noBody();
+    /* class B { */ int f(int a) { String t = """
+        { text block }
+        """; if (a > 0) { a = a - 1; } return a; }
+    static class Inner { void g() { class Local { void h() {} } } }
+    interface I { default int i() { return 1; } }
+    enum E { X, Y; int e() { return 0; } }
+    record P(int x) { int px() { return x; } }
+    @interface Ann { int v() default 1; }
+}
+class B { void b(int größe) { größe++; } }
+'''
+
+
+def edge_list(g: nx.DiGraph) -> List[Any]:
+    return sorted((u, v, str(sorted(data.items(), key=str))) for u, v, data in g.edges(data=True))
+
+
+class TestFiles(TestCase):
+
+    def test_same_methods_as_a_parse_of_the_whole_file(self) -> None:
+        code = CODE.encode()
+        root = parse_java_tree(code)
+        expected = [m for m in methods_of(root) if m.child_by_field_name('body') is not None]
+        graphs = list(parse_methods(code))
+        self.assertEqual([g.name for g in graphs], ['run', 'A', 'f', 'g', 'i', 'e', 'px', 'b'])
+        self.assertEqual(len(graphs), len(expected))
+        for graph, method in zip(graphs, expected):
+            own = next(m for m in methods_of(parse_java_tree(graph.source_code)))
+            self.assertEqual(own.start_byte + graph.offset, method.start_byte)
+            self.assertEqual(own.end_byte + graph.offset, method.end_byte)
+            self.assertEqual(edge_list(graph.adg), edge_list(parse_from_ast(method, code)))
+
+    def test_members_are_not_parsed_whole(self) -> None:
+        code = CODE.encode()
+        spans = [code[start: end].strip() for start, end, _ in members(code)]
+        self.assertIn(b'private int[] xs = {1, 2, 3};', spans)
+        self.assertIn(b'int e() { return 0; }', spans)
+        self.assertFalse(any(span.startswith(b'static class') for span in spans))
+
+    def test_parse_file(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'A.java')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(CODE)
+            stats = ParseStats()
+            graphs = list(parse_file(path, stats, syntax_tokens=False))
+            self.assertEqual(stats.counters['methods'], 8)
+            self.assertEqual(
+                [edge_list(g.adg) for g in graphs],
+                [edge_list(g.adg) for g in parse_methods(CODE, syntax_tokens=False)]
+            )
+            empty = os.path.join(directory, 'Empty.java')
+            open(empty, 'w').close()
+            self.assertEqual(list(parse_file(empty)), [])
+
+
+if __name__ == '__main__':
+    main()
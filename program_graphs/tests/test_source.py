@@ -0,0 +1,86 @@
+import mmap
+import os
+import tempfile
+from typing import Any, Iterator, List
+from contextlib import contextmanager
+from unittest import TestCase, main
+import networkx as nx  # type: ignore
+from program_graphs.bundle import parse_java
+from program_graphs.cfg.parser.java.parser import parse as parse_cfg
+from program_graphs.ddg.parser.java.parser import parse as parse_ddg
+from program_graphs.adg.parser.java.parser import parse as parse_adg
+from program_graphs.utils.source import as_buffer, extract_code, extract_name
+
+
+CODE = '''
+    int größe = 0;
+    String s = "ünïcode";
+    for (int i = 0; i < 10; i++) {
+        if (i > größe) { größe = i; } else { größe = größe + s.length(); }
+    }
+    return größe;
+'''
+
+
+def edge_list(g: nx.DiGraph) -> List[Any]:
+    return sorted((u, v, str(sorted(data.items(), key=str))) for u, v, data in g.edges(data=True))
+
+
+def variables(g: nx.DiGraph) -> List[Any]:
+    return [(n, d.get('read_vars'), d.get('write_vars')) for n, d in g.nodes(data=True)]
+
+
+@contextmanager
+def mapped(code: str) -> Iterator[mmap.mmap]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'Main.java')
+        with open(path, 'wb') as out:
+            out.write(code.encode())
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            yield m
+
+
+class TestSource(TestCase):
+
+    def test_str_is_encoded_buffers_are_kept(self) -> None:
+        buffer = memoryview(b'int a;')
+        self.assertIs(as_buffer(buffer), buffer)
+        self.assertEqual(as_buffer('größe'), 'größe'.encode())
+
+    def test_extract_from_buffers(self) -> None:
+        code = CODE.encode()
+        start = code.index('größe'.encode())
+        end = start + len('größe'.encode())
+        for buffer in (code, bytearray(code), memoryview(code)):
+            self.assertEqual(extract_code(start, end, buffer), 'größe')
+        self.assertIs(extract_name(start, end, code), extract_name(start, end, memoryview(code)))
+
+    def test_same_adg_from_every_source(self) -> None:
+        expected = parse_adg(CODE)
+        with mapped(CODE) as m:
+            for source in (CODE.encode(), memoryview(CODE.encode()), m):
+                adg = parse_adg(source)
+                self.assertEqual(edge_list(adg), edge_list(expected))
+                self.assertEqual(variables(adg), variables(expected))
+
+    def test_same_cfg_and_ddg_from_mmap(self) -> None:
+        cfg, ddg = parse_cfg(CODE), parse_ddg(CODE)
+        with mapped(CODE) as m:
+            self.assertTrue(nx.is_isomorphic(parse_cfg(m), cfg))
+            self.assertEqual(edge_list(parse_ddg(m)), edge_list(ddg))
+            bundle = parse_java(m)
+            assert bundle.adg is not None
+            self.assertEqual(edge_list(bundle.adg), edge_list(parse_adg(CODE)))
+
+    def test_names_are_interned(self) -> None:
+        adg = parse_adg(CODE.encode())
+        names = [
+            name for _, data in adg.nodes(data=True)
+            for name, _ in data.get('read_vars', set()) | data.get('write_vars', set()) if name == 'größe'
+        ]
+        self.assertGreater(len(names), 3)
+        self.assertTrue(all(name is names[0] for name in names))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Iterator, Optional
+import networkx as nx  # type: ignore
+
+
+class BudgetExceeded(Exception):
+    ''' A graph construction spent more work than its `Budget` allows '''
+
+    def __init__(self, resource: str, limit: float) -> None:
+        super().__init__(f'{resource} budget of {limit} exceeded')
+        self.resource = resource
+        self.limit = limit
+
+
+class Budget:
+    ''' Upper bound of work for a single parse.
+
+        `max_nodes` limits the size of a graph an expensive phase (edge contraction,
+        data dependency analysis) is started on, `max_paths` the number of control flow
+        paths enumerated, `max_iterations` the number of data flow propagation steps
+        and `timeout` the wall time in seconds since the parse started.
+
+        By default `BudgetExceeded` is raised. With `truncate=True` a phase that runs out
+        of budget stops early and keeps what it has computed so far; the resulting graph
+        is flagged with `graph.graph['truncated'] = True`.
+    '''
+
+    def __init__(
+        self,
+        max_nodes: Optional[int] = None,
+        max_paths: Optional[int] = None,
+        max_iterations: Optional[int] = None,
+        timeout: Optional[float] = None,
+        truncate: bool = False
+    ) -> None:
+        self.max_nodes = max_nodes
+        self.max_paths = max_paths
+        self.max_iterations = max_iterations
+        self.timeout = timeout
+        self.truncate = truncate
+        self.reset()
+
+    def reset(self) -> None:
+        self.paths = 0
+        self.iterations = 0
+        self.truncated = False
+        self._deadline = None if self.timeout is None else perf_counter() + self.timeout
+
+    def check_nodes(self, nodes: int) -> None:
+        if self.max_nodes is not None and nodes > self.max_nodes:
+            raise BudgetExceeded('nodes', self.max_nodes)
+        self.check_deadline()
+
+    def spend_paths(self, paths: int = 1) -> None:
+        self.paths += paths
+        if self.max_paths is not None and self.paths > self.max_paths:
+            raise BudgetExceeded('paths', self.max_paths)
+        self.check_deadline()
+
+    def spend_iterations(self, iterations: int = 1) -> None:
+        self.iterations += iterations
+        if self.max_iterations is not None and self.iterations > self.max_iterations:
+            raise BudgetExceeded('iterations', self.max_iterations)
+        self.check_deadline()
+
+    def check_deadline(self) -> None:
+        if self._deadline is not None and perf_counter() > self._deadline:
+            raise BudgetExceeded('timeout', self.timeout)  # type: ignore
+
+    def stop(self, error: BudgetExceeded) -> None:
+        ''' Called by a phase which caught `error`: re-raise it unless truncation is allowed '''
+        if not self.truncate:
+            raise error
+        self.truncated = True
+
+    def as_dict(self) -> Dict[str, int]:
+        return {'paths': self.paths, 'iterations': self.iterations}
+
+
+_current_budget: ContextVar[Optional[Budget]] = ContextVar('budget', default=None)
+
+
+def current_budget() -> Optional[Budget]:
+    ''' Budget of the parse in progress, if any '''
+    return _current_budget.get()
+
+
+@contextmanager
+def budget_scope(budget: Optional[Budget]) -> Iterator[Optional[Budget]]:
+    ''' Make `budget` visible to the phases of a parse via `current_budget`.
+
+        The counters and the deadline are reset when a budget becomes active, so the same
+        object can be passed to every parse of a batch. Entering the scope of the budget
+        which is already active keeps its counters.
+    '''
+    if budget is None or budget is _current_budget.get():
+        yield budget
+        return
+    budget.reset()
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def mark_truncated(g: nx.DiGraph, budget: Optional[Budget]) -> None:
+    if budget is not None and budget.truncated:
+        g.graph['truncated'] = True
+
+
+def is_truncated(g: nx.DiGraph) -> bool:
+    return bool(g.graph.get('truncated', False))
@@ -0,0 +1,69 @@
+from typing import Any, Callable, Dict, TypeVar
+import networkx as nx  # type: ignore
+
+T = TypeVar('T')
+
+
+class AnalysisCache(nx.DiGraph):
+    ''' DiGraph remembering the results of analyses (dominators, loops, ...) of its structure.
+
+        Every structural mutation through the networkx API drops the remembered results,
+        changes of node or edge attributes do not: code writing attributes analyses read
+        (the `cdep`, `ddep`, `read_vars` and `write_vars` of the dependency layers) calls
+        `invalidate_analyses` when it is done.
+    '''
+
+    def cached_analysis(self, key: str, compute: Callable[[], T]) -> T:
+        analyses = self._analyses()
+        if key not in analyses:
+            analyses[key] = compute()
+        return analyses[key]  # type: ignore
+
+    def invalidate_analyses(self) -> None:
+        ''' Forget every remembered result, they are computed again on next use '''
+        analyses = self.__dict__.get('_analysis_results')
+        if analyses:
+            analyses.clear()
+
+    def _analyses(self) -> Dict[str, Any]:
+        return self.__dict__.setdefault('_analysis_results', {})  # type: ignore
+
+    def add_node(self, *args: Any, **kwargs: Any) -> Any:
+        self.invalidate_analyses()
+        return super().add_node(*args, **kwargs)
+
+    def add_nodes_from(self, *args: Any, **kwargs: Any) -> None:
+        self.invalidate_analyses()
+        super().add_nodes_from(*args, **kwargs)
+
+    def remove_node(self, *args: Any, **kwargs: Any) -> None:
+        self.invalidate_analyses()
+        super().remove_node(*args, **kwargs)
+
+    def remove_nodes_from(self, *args: Any, **kwargs: Any) -> None:
+        self.invalidate_analyses()
+        super().remove_nodes_from(*args, **kwargs)
+
+    def add_edge(self, *args: Any, **kwargs: Any) -> None:
+        self.invalidate_analyses()
+        super().add_edge(*args, **kwargs)
+
+    def add_edges_from(self, *args: Any, **kwargs: Any) -> None:
+        self.invalidate_analyses()
+        super().add_edges_from(*args, **kwargs)
+
+    def remove_edge(self, *args: Any, **kwargs: Any) -> None:
+        self.invalidate_analyses()
+        super().remove_edge(*args, **kwargs)
+
+    def remove_edges_from(self, *args: Any, **kwargs: Any) -> None:
+        self.invalidate_analyses()
+        super().remove_edges_from(*args, **kwargs)
+
+    def clear(self) -> None:
+        self.invalidate_analyses()
+        super().clear()
+
+    def clear_edges(self) -> None:
+        self.invalidate_analyses()
+        super().clear_edges()
@@ -0,0 +1,42 @@
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, Mapping, TypeVar, Union
+
+Builder = TypeVar('Builder', bound=Callable[..., Any])
+
+
+class Dispatcher(Generic[Builder]):
+    ''' Registry from an AST node type to the builder of its graph.
+
+        Parsers look builders up with a single dict access instead of testing
+        `node.type` against a chain of literals. New statement kinds are plugged in
+        with `register` without touching the parser itself.
+    '''
+
+    def __init__(self, builders: Mapping[str, Builder], default: Builder) -> None:
+        self._builders: Dict[str, Builder] = dict(builders)
+        self.default = default
+
+    def lookup(self, node_type: str) -> Builder:
+        return self._builders.get(node_type, self.default)
+
+    def register(self, node_types: Union[str, Iterable[str]]) -> Callable[[Builder], Builder]:
+        if isinstance(node_types, str):
+            node_types = [node_types]
+        types = list(node_types)
+
+        def decorator(builder: Builder) -> Builder:
+            for node_type in types:
+                self._builders[node_type] = builder
+            return builder
+        return decorator
+
+    def unregister(self, node_type: str) -> None:
+        self._builders.pop(node_type, None)
+
+    def __contains__(self, node_type: object) -> bool:
+        return node_type in self._builders
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._builders)
+
+    def __len__(self) -> int:
+        return len(self._builders)
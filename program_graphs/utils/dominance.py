@@ -0,0 +1,287 @@
+import abc
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import networkx as nx  # type: ignore
+from program_graphs.types import NodeID, Edge
+from program_graphs.utils.cache import AnalysisCache
+
+Adjacency = Callable[[NodeID], Iterable[NodeID]]
+IDom = Dict[NodeID, NodeID]
+
+
+class FlowView:
+    ''' Successors and predecessors along the edges of `g` having `edge_attr` set to True.
+        Built in one pass over the edges, so dependency edges are not filtered on every query '''
+
+    def __init__(self, g: nx.DiGraph, edge_attr: str) -> None:
+        self._succ: Dict[NodeID, List[NodeID]] = {node: [] for node in g.nodes()}
+        self._pred: Dict[NodeID, List[NodeID]] = {node: [] for node in g.nodes()}
+        for u, neighbours in g.adj.items():
+            for v, data in neighbours.items():
+                if data.get(edge_attr) is True:
+                    self._succ[u].append(v)
+                    self._pred[v].append(u)
+
+    def add_edge(self, u: NodeID, v: NodeID) -> None:
+        self._succ[u].append(v)
+        self._pred[v].append(u)
+
+    def successors(self, node: NodeID) -> List[NodeID]:
+        return self._succ[node]
+
+    def predecessors(self, node: NodeID) -> List[NodeID]:
+        return self._pred[node]
+
+
+Flow = Union[nx.DiGraph, FlowView]
+
+
+def flow_adjacency(g: Flow, edge_attr: Optional[str] = None) -> Tuple[Adjacency, Adjacency]:
+    ''' Successors and predecessors of the control flow view of `g`.
+        With `edge_attr` only edges having this attribute set to True are followed '''
+    if edge_attr is not None:
+        g = FlowView(g, edge_attr)
+    return g.successors, g.predecessors
+
+
+def reverse_postorder(root: NodeID, successors: Adjacency) -> List[NodeID]:
+    order: List[NodeID] = []
+    visited = {root}
+    stack: List[Tuple[NodeID, Iterator[NodeID]]] = [(root, iter(successors(root)))]
+    while len(stack) > 0:
+        node, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            order.append(node)
+        elif child not in visited:
+            visited.add(child)
+            stack.append((child, iter(successors(child))))
+    order.reverse()
+    return order
+
+
+def _immediate_dominators(root: NodeID, successors: Adjacency, predecessors: Adjacency) -> IDom:
+    ''' Cooper, Harvey, Kennedy. "A Simple, Fast Dominance Algorithm" '''
+    order = reverse_postorder(root, successors)
+    index = {node: i for i, node in enumerate(order)}
+    idom = {root: root}
+
+    def intersect(a: NodeID, b: NodeID) -> NodeID:
+        while a != b:
+            while index[a] > index[b]:
+                a = idom[a]
+            while index[b] > index[a]:
+                b = idom[b]
+        return a
+
+    changed = True
+    while changed:
+        changed = False
+        for node in order[1:]:
+            new_idom: Optional[NodeID] = None
+            for p in predecessors(node):
+                if p not in idom:
+                    continue
+                new_idom = p if new_idom is None else intersect(p, new_idom)
+            if new_idom is not None and idom.get(node) != new_idom:
+                idom[node] = new_idom
+                changed = True
+    return idom
+
+
+def immediate_dominators(g: Flow, entry: NodeID, edge_attr: Optional[str] = None) -> IDom:
+    ''' Immediate dominator of every node reachable from `entry`, the entry maps to itself '''
+    successors, predecessors = flow_adjacency(g, edge_attr)
+    return _immediate_dominators(entry, successors, predecessors)
+
+
+def immediate_post_dominators(g: Flow, exit: NodeID, edge_attr: Optional[str] = None) -> IDom:
+    ''' Immediate post dominator of every node `exit` is reachable from '''
+    successors, predecessors = flow_adjacency(g, edge_attr)
+    return _immediate_dominators(exit, predecessors, successors)
+
+
+def dominance_frontiers(
+    g: Flow,
+    idom: IDom,
+    edge_attr: Optional[str] = None,
+    post: bool = False
+) -> Dict[NodeID, Set[NodeID]]:
+    ''' Dominance frontiers, or post dominance frontiers if `idom` are post dominators and `post` is set '''
+    successors, predecessors = flow_adjacency(g, edge_attr)
+    if post:
+        predecessors = successors
+    frontiers: Dict[NodeID, Set[NodeID]] = {node: set() for node in idom}
+    for node, parent in idom.items():
+        preds = [p for p in predecessors(node) if p in idom]
+        is_root = node == parent
+        if len(preds) < 2 and not is_root:
+            continue
+        for runner in preds:
+            while is_root or runner != parent:
+                frontiers[runner].add(node)
+                if idom[runner] == runner:
+                    break
+                runner = idom[runner]
+    return frontiers
+
+
+class DominatorTree:
+    ''' Tree of immediate (post) dominators answering dominance queries in O(1) '''
+
+    def __init__(self, idom: IDom) -> None:
+        self.idom = idom
+        self.root: Optional[NodeID] = next((node for node, parent in idom.items() if node == parent), None)
+        self.children: Dict[NodeID, List[NodeID]] = {node: [] for node in idom}
+        for node, parent in idom.items():
+            if node != parent:
+                self.children[parent].append(node)
+        self._pre: Dict[NodeID, int] = {}
+        self._post: Dict[NodeID, int] = {}
+        self.depth: Dict[NodeID, int] = {}
+        if self.root is not None:
+            self._number()
+
+    def _number(self) -> None:
+        counter = 0
+        self.depth[self.root] = 0  # type: ignore
+        stack: List[Tuple[NodeID, Iterator[NodeID]]] = [(self.root, iter(self.children[self.root]))]  # type: ignore
+        self._pre[self.root] = counter  # type: ignore
+        while len(stack) > 0:
+            node, children = stack[-1]
+            child = next(children, None)
+            counter += 1
+            if child is None:
+                stack.pop()
+                self._post[node] = counter
+                continue
+            self._pre[child] = counter
+            self.depth[child] = self.depth[node] + 1
+            stack.append((child, iter(self.children[child])))
+
+    def __contains__(self, node: object) -> bool:
+        return node in self.idom
+
+    def immediate(self, node: NodeID) -> Optional[NodeID]:
+        parent = self.idom.get(node)
+        return None if parent == node else parent
+
+    def dominates(self, a: NodeID, b: NodeID) -> bool:
+        ''' `a` dominates `b`, every node dominates itself '''
+        if a not in self._pre or b not in self._pre:
+            return False
+        return self._pre[a] <= self._pre[b] and self._post[b] <= self._post[a]
+
+    def strictly_dominates(self, a: NodeID, b: NodeID) -> bool:
+        return a != b and self.dominates(a, b)
+
+    def dominators(self, node: NodeID) -> List[NodeID]:
+        ''' Dominators of `node` from itself up to the root '''
+        result = [node]
+        while self.idom[result[-1]] != result[-1]:
+            result.append(self.idom[result[-1]])
+        return result
+
+
+def back_edges(g: Flow, tree: DominatorTree, edge_attr: Optional[str] = None) -> List[Edge]:
+    ''' Edges whose target dominates their source, i.e. the edges closing natural loops.
+        Retreating edges of irreducible loops are not reported '''
+    successors, _ = flow_adjacency(g, edge_attr)
+    return [(u, v) for u in tree.idom for v in successors(u) if tree.dominates(v, u)]
+
+
+class Loop:
+    ''' Natural loop: the header and all nodes reaching a back edge without passing the header '''
+
+    def __init__(self, header: NodeID, body: Set[NodeID]) -> None:
+        self.header = header
+        self.body = body
+        self.parent: Optional['Loop'] = None
+        self.children: List['Loop'] = []
+
+    @property
+    def depth(self) -> int:
+        depth, loop = 1, self.parent
+        while loop is not None:
+            depth, loop = depth + 1, loop.parent
+        return depth
+
+    def __repr__(self) -> str:
+        return f'Loop(header={self.header}, size={len(self.body)})'
+
+
+def natural_loops(g: Flow, tree: DominatorTree, edge_attr: Optional[str] = None) -> List[Loop]:
+    ''' Natural loops, back edges sharing a header are merged in one loop '''
+    _, predecessors = flow_adjacency(g, edge_attr)
+    bodies: Dict[NodeID, Set[NodeID]] = {}
+    for tail, header in back_edges(g, tree, edge_attr):
+        body = bodies.setdefault(header, {header})
+        stack = [tail]
+        while len(stack) > 0:
+            node = stack.pop()
+            if node in body:
+                continue
+            body.add(node)
+            stack.extend(p for p in predecessors(node) if p in tree)
+    return [Loop(header, body) for header, body in bodies.items()]
+
+
+def loop_nesting_forest(g: Flow, tree: DominatorTree, edge_attr: Optional[str] = None) -> List[Loop]:
+    ''' Natural loops linked by nesting, the outermost loops are returned '''
+    loops = sorted(natural_loops(g, tree, edge_attr), key=lambda loop: len(loop.body))
+    for i, loop in enumerate(loops):
+        loop.parent = next((outer for outer in loops[i + 1:] if loop.header in outer.body), None)
+        if loop.parent is not None:
+            loop.parent.children.append(loop)
+    return [loop for loop in loops if loop.parent is None]
+
+
+class ControlFlowAnalyses(AnalysisCache, abc.ABC):
+    ''' Dominance and loop analyses of the control flow view of a graph.
+
+        Results are computed on first use and kept until the graph structure changes.
+        Subclasses name the entry and exit nodes and, if the graph has edges of other kinds,
+        the attribute marking control flow edges.
+    '''
+
+    flow_edge_attr: Optional[str] = None
+
+    @abc.abstractmethod
+    def flow_entry(self) -> NodeID:
+        ...
+
+    @abc.abstractmethod
+    def flow_exit(self) -> NodeID:
+        ...
+
+    def flow_view(self) -> Flow:
+        if self.flow_edge_attr is None:
+            return self
+        return self.cached_analysis('flow_view', lambda: FlowView(self, self.flow_edge_attr))  # type: ignore
+
+    def dominator_tree(self) -> DominatorTree:
+        return self.cached_analysis('dominators', lambda: DominatorTree(
+            immediate_dominators(self.flow_view(), self.flow_entry())
+        ))
+
+    def post_dominator_tree(self) -> DominatorTree:
+        return self.cached_analysis('post_dominators', lambda: DominatorTree(
+            immediate_post_dominators(self.flow_view(), self.flow_exit())
+        ))
+
+    def dominance_frontiers(self) -> Dict[NodeID, Set[NodeID]]:
+        return self.cached_analysis('dominance_frontiers', lambda: dominance_frontiers(
+            self.flow_view(), self.dominator_tree().idom
+        ))
+
+    def post_dominance_frontiers(self) -> Dict[NodeID, Set[NodeID]]:
+        return self.cached_analysis('post_dominance_frontiers', lambda: dominance_frontiers(
+            self.flow_view(), self.post_dominator_tree().idom, post=True
+        ))
+
+    def back_edges(self) -> List[Edge]:
+        return self.cached_analysis('back_edges', lambda: back_edges(self.flow_view(), self.dominator_tree()))
+
+    def loops(self) -> List[Loop]:
+        ''' Outermost natural loops, inner loops are their `children` '''
+        return self.cached_analysis('loops', lambda: loop_nesting_forest(self.flow_view(), self.dominator_tree()))
@@ -1,14 +1,34 @@
-from typing import List
+from typing import Iterator, List, Optional
 from tree_sitter import Node as Statement  # type: ignore
-from itertools import chain
+
+
+def walk_nodes(node: Statement) -> Iterator[Statement]:
+    ''' Nodes of the subtree in document order, read with a single tree cursor.
+        Unlike `node.children` the cursor does not build a list of wrappers for every node visited.
+        The root is not read back from the cursor, which loses its alias (`type_identifier` is an `identifier`) '''
+    yield node
+    cursor = node.walk()
+    if not cursor.goto_first_child():
+        return
+    depth = 1
+    while True:
+        yield cursor.node
+        if cursor.goto_first_child():
+            depth += 1
+            continue
+        while not cursor.goto_next_sibling():
+            if depth == 0:
+                return
+            cursor.goto_parent()
+            depth -= 1
 
 
 def filter_nodes(node: Statement, node_types: List[str]) -> List[Statement]:
     if node is None:
         return []
-    nodes = list(chain.from_iterable(
-        [filter_nodes(ch, node_types) for ch in node.children]
-    ))
-    if node.type in node_types:
-        return [node] + nodes
-    return nodes
+    return [n for n in walk_nodes(node) if n.type in node_types]
+
+
+def first_node(node: Statement, node_types: List[str]) -> Optional[Statement]:
+    ''' `filter_nodes(node, node_types)[0]` without walking the rest of the subtree '''
+    return next((n for n in walk_nodes(node) if n.type in node_types), None)
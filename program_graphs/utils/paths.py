@@ -0,0 +1,144 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import networkx as nx  # type: ignore
+from program_graphs.types import NodeID
+
+Path = List[NodeID]
+
+VISIT_ONCE = 'global'
+SIMPLE_PATHS = 'path'
+
+_END = object()
+
+
+def _successors(g: nx.DiGraph, edge_attr: Optional[str]) -> Callable[[NodeID], Iterable[NodeID]]:
+    if edge_attr is None:
+        return g.successors  # type: ignore
+    return lambda node: [s for (_, s, value) in g.out_edges(node, data=edge_attr) if value is True]
+
+
+class _Walk:
+    ''' The current path of a depth first walk and the nodes it may continue with '''
+
+    def __init__(self, successors: Callable[[NodeID], Iterable[NodeID]], visited: str) -> None:
+        if visited not in (VISIT_ONCE, SIMPLE_PATHS):
+            raise ValueError(f'Unknown visited semantics: {visited}')
+        self.successors = successors
+        self.visit_once = visited == VISIT_ONCE
+        self.path: Path = []
+        self.seen: Set[NodeID] = set()
+        self.on_path: Dict[NodeID, int] = {}
+
+    def push(self, node: NodeID, expand: bool = True) -> List[NodeID]:
+        self.path.append(node)
+        self.on_path[node] = self.on_path.get(node, 0) + 1
+        if not expand:
+            return []
+        if self.visit_once:
+            nexts = [s for s in self.successors(node) if s not in self.seen]
+            self.seen.add(node)
+            return nexts
+        return [s for s in self.successors(node) if s not in self.on_path]
+
+    def pop(self) -> None:
+        node = self.path.pop()
+        self.on_path[node] -= 1
+        if self.on_path[node] == 0:
+            del self.on_path[node]
+
+
+def iter_paths(
+    g: nx.DiGraph,
+    source: NodeID,
+    visited: str = VISIT_ONCE,
+    max_paths: Optional[int] = None,
+    max_length: Optional[int] = None,
+    edge_attr: Optional[str] = None
+) -> Iterator[Path]:
+    ''' Lazily enumerate paths starting at `source`, depth first.
+
+        visited='global' expands every node at most once, paths end at nodes without
+        unvisited successors. This is the semantics of `all_paths_from` and the number
+        of paths is bounded by the number of edges.
+        visited='path' enumerates all simple paths ending at nodes without successors
+        outside of the path. There can be exponentially many of them.
+
+        `max_paths` stops the enumeration, `max_length` cuts paths to this number of nodes.
+        `edge_attr` follows only edges whose attribute is True, e.g. 'cflow' for an ADG.
+        Only the current path is kept in memory; every yielded path is a fresh list.
+    '''
+    walk = _Walk(_successors(g, edge_attr), visited)
+    nexts = walk.push(source)
+    if len(nexts) == 0:
+        return
+    stack: List[Iterator[NodeID]] = [iter(nexts)]
+    count = 0
+    while len(stack) > 0:
+        node = next(stack[-1], _END)
+        if node is _END:
+            stack.pop()
+            walk.pop()
+            continue
+        nexts = walk.push(node, max_length is None or len(walk.path) + 1 < max_length)  # type: ignore
+        if len(nexts) > 0:
+            stack.append(iter(nexts))
+            continue
+        yield list(walk.path)
+        walk.pop()
+        count += 1
+        if max_paths is not None and count >= max_paths:
+            return
+
+
+class PathTrie:
+    ''' Set of paths sharing common prefixes, each prefix is stored once '''
+
+    def __init__(self) -> None:
+        self.children: Dict[NodeID, 'PathTrie'] = {}
+        self.ends_here = False
+
+    def add(self, path: Iterable[NodeID]) -> None:
+        trie = self
+        for node in path:
+            trie = trie.children.setdefault(node, PathTrie())
+        trie.ends_here = True
+
+    def paths(self) -> Iterator[Path]:
+        stack: List[Tuple['PathTrie', Path]] = [(self, [])]
+        while len(stack) > 0:
+            trie, prefix = stack.pop()
+            if trie.ends_here:
+                yield prefix
+            for node, child in reversed(list(trie.children.items())):
+                stack.append((child, prefix + [node]))
+
+    def tries(self) -> Iterator['PathTrie']:
+        stack = [self]
+        while len(stack) > 0:
+            trie = stack.pop()
+            yield trie
+            stack.extend(trie.children.values())
+
+    def size(self) -> int:
+        ''' Number of stored nodes, i.e. the memory cost of the trie '''
+        return sum(1 for _ in self.tries()) - 1
+
+    def __len__(self) -> int:
+        return sum(1 for trie in self.tries() if trie.ends_here)
+
+    def __iter__(self) -> Iterator[Path]:
+        return self.paths()
+
+
+def path_trie(
+    g: nx.DiGraph,
+    source: NodeID,
+    visited: str = VISIT_ONCE,
+    max_paths: Optional[int] = None,
+    max_length: Optional[int] = None,
+    edge_attr: Optional[str] = None
+) -> PathTrie:
+    ''' All paths from `source` as a trie, see `iter_paths` for the arguments '''
+    trie = PathTrie()
+    for path in iter_paths(g, source, visited, max_paths, max_length, edge_attr):
+        trie.add(path)
+    return trie
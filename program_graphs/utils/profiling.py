@@ -0,0 +1,68 @@
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
+from tabulate import tabulate
+
+
+class ParseStats:
+    ''' Wall time per pipeline phase and size counters of built graphs.
+
+        Pass the same object to many `parse` calls to aggregate over a batch,
+        or combine separately collected objects with `ParseStats.aggregate`.
+    '''
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += perf_counter() - start
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.timings.values())
+
+    def merge(self, other: 'ParseStats') -> 'ParseStats':
+        for name, seconds in other.timings.items():
+            self.timings[name] += seconds
+        for name, value in other.counters.items():
+            self.counters[name] += value
+        return self
+
+    @staticmethod
+    def aggregate(stats: Iterable['ParseStats']) -> 'ParseStats':
+        total = ParseStats()
+        for s in stats:
+            total.merge(s)
+        return total
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {'timings': dict(self.timings), 'counters': dict(self.counters)}
+
+    def __str__(self) -> str:
+        total = self.total_time or 1.0
+        table: List[Tuple[str, Any, str]] = [
+            (name, f'{seconds * 1000:.2f}', f'{100 * seconds / total:.1f}')
+            for name, seconds in self.timings.items()
+        ]
+        table += [(name, value, '') for name, value in self.counters.items()]
+        return tabulate(table, headers=['Phase / Counter', 'ms / value', '%'])
+
+
+_DISABLED: ContextManager[None] = nullcontext()
+
+
+def phase(stats: Optional[ParseStats], name: str) -> ContextManager[None]:
+    ''' Time a phase if statistics are requested, otherwise do nothing '''
+    if stats is None:
+        return _DISABLED
+    return stats.phase(name)
@@ -0,0 +1,97 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from program_graphs.types import NodeID
+from program_graphs.utils.budget import BudgetExceeded, current_budget
+from program_graphs.utils.liveness import Successors, VarName, Variables, _post_order
+
+Definition = Tuple[NodeID, VarName]
+
+
+class ReachingProblem:
+    ''' Reaching definitions equations of one graph as bit vectors: bit `i` of a mask stands
+        for `definitions[i]`, a write of a variable by a node.
+
+        Nodes are numbered in reverse post order from `entry` (nodes it does not reach follow),
+        so a forward solver visiting them in this order sees most predecessors solved first.
+    '''
+
+    def __init__(self, nodes: Iterable[NodeID], entry: Optional[NodeID], successors: Successors,
+                 writes: Variables) -> None:
+        nodes = list(nodes)
+        self.nodes = list(reversed(_post_order(nodes, entry, successors)))
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        index = self.index
+        self.successors = [[index[s] for s in successors(node) if s in index] for node in self.nodes]
+        self.definitions: List[Definition] = []
+        self.variable_bits: Dict[VarName, int] = {}  # every definition of a variable
+        self.gen: List[int] = []
+        for node in self.nodes:
+            gen = 0
+            for var in writes(node):
+                bit = 1 << len(self.definitions)
+                self.definitions.append((node, var))
+                self.variable_bits[var] = self.variable_bits.get(var, 0) | bit
+                gen |= bit
+            self.gen.append(gen)
+        self.kill = [self._variables_of(gen) for gen in self.gen]
+
+    def _variables_of(self, gen: int) -> int:
+        ''' Every definition of the variables defined in `gen` '''
+        kill = 0
+        while gen:
+            low = gen & -gen
+            kill |= self.variable_bits[self.definitions[low.bit_length() - 1][1]]
+            gen ^= low
+        return kill
+
+    def definitions_of(self, bits: int) -> List[Definition]:
+        result = []
+        while bits:
+            low = bits & -bits
+            result.append(self.definitions[low.bit_length() - 1])
+            bits ^= low
+        return result
+
+
+class ReachingDefinitions:
+    ''' Definitions reaching the entry of every node, kept as the bit vectors of the solver '''
+
+    def __init__(self, problem: ReachingProblem, reach_in: List[int]) -> None:
+        self.problem = problem
+        self._in = reach_in
+
+    def reaching(self, node: NodeID, var: VarName) -> List[NodeID]:
+        ''' Nodes whose write of `var` may be the value read on entry to `node` '''
+        bits = self._in[self.problem.index[node]] & self.problem.variable_bits.get(var, 0)
+        return [writer for writer, _ in self.problem.definitions_of(bits)]
+
+
+def solve_reaching(problem: ReachingProblem) -> ReachingDefinitions:
+    ''' Worklist solver, nodes start in reverse post order. If the budget of the current parse
+        runs out, the definitions propagated so far are returned '''
+    budget = current_budget()
+    size = len(problem.nodes)
+    reach_in, reach_out = [0] * size, [0] * size
+    work = deque(range(size))
+    queued = bytearray(b'\x01' * size)
+    try:
+        while len(work) > 0:
+            if budget is not None:
+                budget.spend_iterations()
+            i = work.popleft()
+            queued[i] = 0
+            new_out = problem.gen[i] | (reach_in[i] & ~problem.kill[i])
+            if new_out == reach_out[i]:
+                continue
+            reach_out[i] = new_out
+            for j in problem.successors[i]:
+                new_in = reach_in[j] | new_out
+                if new_in != reach_in[j]:
+                    reach_in[j] = new_in
+                    if not queued[j]:
+                        queued[j] = 1
+                        work.append(j)
+    except BudgetExceeded as error:
+        assert budget is not None
+        budget.stop(error)
+    return ReachingDefinitions(problem, reach_in)
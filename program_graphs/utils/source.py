@@ -0,0 +1,43 @@
+import mmap
+import os
+import sys
+from functools import lru_cache
+from typing import Union
+from tree_sitter import Language, Parser  # type: ignore
+from program_graphs.types import ASTNode
+from program_graphs.utils import get_project_root
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+Source = Union[str, Buffer]  # what the parsers accept
+
+
+def as_buffer(source: Source) -> Buffer:
+    ''' The UTF-8 bytes of `source`. A `str` is encoded, buffers (`bytes`, `memoryview`,
+        an `mmap` of a file) are passed on as they are, without a copy '''
+    if isinstance(source, str):
+        return source.encode()
+    return source
+
+
+def extract_code(start_byte: int, end_byte: int, code: Buffer) -> str:
+    ''' Text of a byte range; only the range is copied out of a `memoryview` or an `mmap` '''
+    return str(code[start_byte: end_byte], 'utf-8')
+
+
+def extract_name(start_byte: int, end_byte: int, code: Buffer) -> str:
+    ''' `extract_code` for identifiers: every occurrence of a name shares one interned string '''
+    return sys.intern(str(code[start_byte: end_byte], 'utf-8'))
+
+
+@lru_cache(maxsize=None)
+def java_language() -> Language:
+    bin_storage_path = os.path.join(get_project_root(), 'build/my-languages.so')
+    Language.build_library(bin_storage_path, [os.path.join(get_project_root(), 'tree-sitter-java')])
+    return Language(bin_storage_path, 'java')
+
+
+def parse_java_tree(source: Buffer) -> ASTNode:
+    ''' Root of the tree-sitter syntax tree of `source`, read from the buffer in place '''
+    parser = Parser()
+    parser.set_language(java_language())
+    return parser.parse(source).root_node  # type: ignore
@@ -0,0 +1,35 @@
+from typing import Any, Callable, Generator, List, TypeVar, Union
+
+Request = TypeVar('Request')
+Result = TypeVar('Result')
+Steps = Generator[Request, Result, Result]
+
+
+def run_steps(
+    steps: Generator[Request, Result, Result],
+    dispatch: Callable[[Request], Union[Result, Generator[Request, Result, Result]]]
+) -> Result:
+    ''' Drive a generator based builder without recursion.
+
+        A builder yields a request whenever it needs a sub-result and receives
+        the sub-result back from `yield`. `dispatch` turns a request either into
+        a ready result or into another builder generator which is put on an explicit
+        stack, so the nesting depth of requests costs heap memory, not C stack.
+    '''
+    stack: List[Generator[Request, Result, Result]] = [steps]
+    value: Any = None
+    while True:
+        try:
+            request = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            if len(stack) == 0:
+                return value  # type: ignore
+            continue
+        sub = dispatch(request)
+        if isinstance(sub, Generator):
+            stack.append(sub)
+            value = None
+        else:
+            value = sub